@@ -4,20 +4,51 @@ LangGraph 기반 쇼핑 에이전트 - 멀티턴 대화 지원
 
 from typing import Dict, Any, List, Optional, Union
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage, AIMessage, BaseMessage, SystemMessage
+from langchain_core.messages import HumanMessage, AIMessage, BaseMessage, SystemMessage, ToolMessage
 from langchain_core.messages.utils import trim_messages
 from langgraph.graph import StateGraph, MessagesState, START, END
 from langgraph.prebuilt import ToolNode
-from langgraph.checkpoint.memory import InMemorySaver
-from langgraph.store.memory import InMemoryStore
 from langgraph.types import Command
 from langchain_core.runnables import RunnableConfig
 from config import settings
 from agent.tools import get_shopping_tools
+from agent.shared_state import create_checkpointer, create_store
+from agent.metrics import GRAPH_STEPS, metrics_callback
+from agent.tracing import current_trace, span, tracing_callback
+from agent.product_events import extract_products
+from agent.tool_router import TOOL_TOKENS_SAVED, ToolRouter, request_tokens_saved
+from agent.speculative import speculative_search
 import os
 import uuid
 import asyncio
+import contextvars
 from typing_extensions import TypedDict
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from agent.naver_realtime_search import get_naver_client
+    NAVER_SEARCH_AVAILABLE = True
+except ImportError:
+    NAVER_SEARCH_AVAILABLE = False
+
+
+async def _speculative_naver_search(query: str):
+    """추측 검색용 네이버 통합 검색"""
+    client = await get_naver_client()
+    return await client.unified_naver_search(query)
+
+
+def _unsent_products(products: List[Dict[str, Any]], sent: set) -> List[Dict[str, Any]]:
+    """이번 요청에서 아직 보내지 않은 상품만 선택 (sent 갱신)"""
+    unsent = []
+    for product in products:
+        key = product.get("url") or product.get("title")
+        if key not in sent:
+            sent.add(key)
+            unsent.append(product)
+    return unsent
 
 
 class CustomMessagesState(MessagesState):
@@ -32,9 +63,9 @@ class ShoppingAgent:
     
     def __init__(self):
         """에이전트 초기화"""
-        # 체크포인터와 스토어 초기화
-        self.checkpointer = InMemorySaver()
-        self.store = InMemoryStore()
+        # 체크포인터와 스토어 초기화 (멀티 워커 모드에서는 공유 SQLite 사용)
+        self.checkpointer = create_checkpointer()
+        self.store = create_store()
         
         # LLM 초기화
         self.llm = ChatGoogleGenerativeAI(
@@ -46,6 +77,8 @@ class ShoppingAgent:
         # 도구 설정 (async 초기화는 별도 메서드에서)
         self.tools = []
         self.tool_node = None
+        self.tool_router = None
+        self._bound_llms = {}
         self.graph = None
         self._initialized = False
     
@@ -56,6 +89,10 @@ class ShoppingAgent:
             self.tools = await get_shopping_tools()
             self.tool_node = ToolNode(self.tools)
             
+            # 턴별 도구 선택기 (ToolNode는 전체 도구를 유지하여 어떤 호출도 실행 가능)
+            if settings.tool_router_enabled:
+                self.tool_router = ToolRouter(self.tools)
+            
             # 그래프 구성
             self.graph = self._build_graph()
             self._initialized = True
@@ -94,8 +131,9 @@ class ShoppingAgent:
         # 시스템 메시지 추가
         full_messages = [SystemMessage(content=system_context)] + messages
         
-        # LLM 호출
-        response = self.llm.bind_tools(self.tools).invoke(full_messages)
+        # LLM 호출 (이번 턴에 필요한 도구만 바인딩)
+        tools = self._select_tools(state["messages"])
+        response = self._bind_tools(tools).invoke(full_messages, config=config)
         
         # 사용자 선호도 학습
         if state.get("user_id"):
@@ -103,6 +141,26 @@ class ShoppingAgent:
         
         return {"messages": [response]}
     
+    def _select_tools(self, messages: List[BaseMessage]) -> List:
+        """턴별 도구 선택 (선택기가 없으면 전체 도구)"""
+        if self.tool_router is None:
+            return self.tools
+        
+        with span("agent.tool_router") as current:
+            selected = self.tool_router.select(messages)
+            if current is not None:
+                current.attributes["tools"] = [tool.name for tool in selected]
+                current.attributes["tokens_saved"] = self.tool_router.tokens_saved(selected)
+        return selected
+    
+    def _bind_tools(self, tools: List):
+        """도구 조합별 바인딩 캐시"""
+        key = tuple(tool.name for tool in tools)
+        bound = self._bound_llms.get(key)
+        if bound is None:
+            bound = self._bound_llms[key] = self.llm.bind_tools(tools)
+        return bound
+    
     def _should_continue(self, state: CustomMessagesState) -> str:
         """도구 사용 여부 결정"""
         last_message = state["messages"][-1]
@@ -235,9 +293,14 @@ class ShoppingAgent:
         self, 
         message: str, 
         session_id: str, 
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        request_id: Optional[str] = None,
+        debug: bool = False
     ):
-        """스트리밍 방식으로 메시지 처리"""
+        """스트리밍 방식으로 메시지 처리
+        
+        debug가 True이면 완료(done) 이벤트에 구간별 시간 분석을 포함합니다.
+        """
         try:
             # 초기화 확인
             await self._ensure_initialized()
@@ -246,8 +309,10 @@ class ShoppingAgent:
             config = RunnableConfig(
                 configurable={
                     "thread_id": session_id,
-                    "user_id": user_id or "anonymous"
-                }
+                    "user_id": user_id or "anonymous",
+                    "request_id": request_id
+                },
+                callbacks=[metrics_callback, tracing_callback]
             )
             
             # 입력 상태 구성
@@ -258,9 +323,24 @@ class ShoppingAgent:
                 "search_history": []
             }
             
-            # 그래프 스트리밍 실행
-            async for event in self.graph.astream(input_state, config=config, stream_mode="updates"):
+            # 첫 턴이면 첫 LLM 호출과 동시에 추측 검색 시작
+            if settings.speculative_search_enabled and NAVER_SEARCH_AVAILABLE:
+                await self._start_speculative_search(session_id, message, config)
+            
+            # 그래프 스트리밍 실행 (custom: 도구가 실행 중에 보내는 부분 상품 목록)
+            graph_steps = 0
+            streamed_products = set()
+            async for mode, event in self.graph.astream(input_state, config=config, stream_mode=["updates", "custom"]):
+                if mode == "custom":
+                    if isinstance(event, dict) and event.get("type") == "products":
+                        products = _unsent_products(event.get("products", []), streamed_products)
+                        if products:
+                            yield {**event, "products": products}
+                    continue
+                
                 for node_name, data in event.items():
+                    graph_steps += 1
+                    
                     # 에이전트 노드에서 응답 처리
                     if node_name == "agent" and "messages" in data:
                         last_message = data["messages"][-1]
@@ -280,14 +360,15 @@ class ShoppingAgent:
                             if last_message.content:
                                 # 응답을 단어별로 분할하여 스트리밍
                                 words = last_message.content.split()
-                                for i, word in enumerate(words):
-                                    yield {
-                                        "type": "content",
-                                        "content": word + " ",
-                                        "index": i,
-                                        "total": len(words)
-                                    }
-                                    await asyncio.sleep(0.02)  # 스트리밍 효과
+                                with span("agent.stream_words", words=len(words)):
+                                    for i, word in enumerate(words):
+                                        yield {
+                                            "type": "content",
+                                            "content": word + " ",
+                                            "index": i,
+                                            "total": len(words)
+                                        }
+                                        await asyncio.sleep(0.02)  # 스트리밍 효과
                     
                     # 도구 실행 결과 처리
                     elif node_name == "tools" and "messages" in data:
@@ -298,13 +379,36 @@ class ShoppingAgent:
                                     "tool_name": tool_message.name,
                                     "result_preview": str(tool_message.content)[:100] + "..."
                                 }
+                                
+                                # 상품 정보는 LLM 응답을 기다리지 않고 바로 전송 (부분 전송분 제외)
+                                products = _unsent_products(extract_products(tool_message.content), streamed_products)
+                                if products:
+                                    yield {
+                                        "type": "products",
+                                        "tool_name": tool_message.name,
+                                        "products": products
+                                    }
+            
+            GRAPH_STEPS.observe(graph_steps)
             
             # 스트리밍 완료 신호
-            yield {
+            done_event = {
                 "type": "done",
                 "session_id": session_id
             }
             
+            trace = current_trace()
+            if request_id:
+                done_event["request_id"] = request_id
+            if trace is not None and self.tool_router is not None:
+                tokens_saved = request_tokens_saved(trace)
+                TOOL_TOKENS_SAVED.observe(tokens_saved)
+                done_event["tool_tokens_saved"] = tokens_saved
+            if debug and trace is not None:
+                done_event["timing"] = trace.breakdown()
+            
+            yield done_event
+            
         except Exception as e:
             # 오류 발생 시 에러 메시지 스트리밍
             yield {
@@ -312,6 +416,19 @@ class ShoppingAgent:
                 "error": str(e),
                 "session_id": session_id
             }
+        
+        finally:
+            speculative_search.finish(session_id)
+    
+    async def _start_speculative_search(self, session_id: str, message: str, config: RunnableConfig):
+        """대화의 첫 메시지이면 네이버 추측 검색 시작"""
+        try:
+            state = await self.graph.aget_state(config)
+            if state.values.get("messages"):
+                return
+            speculative_search.start(session_id, message, _speculative_naver_search)
+        except Exception as e:
+            logger.debug(f"추측 검색 시작 실패: {e}")
 
     async def process_message(
         self, 
@@ -320,6 +437,16 @@ class ShoppingAgent:
         user_id: Optional[str] = None
     ) -> str:
         """메시지 처리 및 응답 생성"""
+        result = await self.process_message_with_products(message, session_id, user_id)
+        return result["response"]
+    
+    async def process_message_with_products(
+        self, 
+        message: str, 
+        session_id: str, 
+        user_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """메시지 처리 후 응답과 이번 턴의 도구 결과 상품 목록 반환"""
         # 초기화 확인
         await self._ensure_initialized()
         
@@ -327,7 +454,8 @@ class ShoppingAgent:
         config = {
             "configurable": {
                 "thread_id": session_id
-            }
+            },
+            "callbacks": [metrics_callback, tracing_callback]
         }
         
         # 입력 메시지 구성
@@ -338,22 +466,38 @@ class ShoppingAgent:
             "search_history": []
         }
         
-        # 그래프 실행
+        # 그래프 실행 (트레이스 컨텍스트를 executor 스레드로 전파)
         try:
+            context = contextvars.copy_context()
             response = await asyncio.get_event_loop().run_in_executor(
                 None, 
-                lambda: self.graph.invoke(input_state, config)
+                lambda: context.run(self.graph.invoke, input_state, config)
             )
             
+            # 이번 턴에서 실행된 메시지 (마지막 사용자 메시지 이후)
+            turn_messages = []
+            for msg in reversed(response["messages"]):
+                if isinstance(msg, HumanMessage):
+                    break
+                turn_messages.append(msg)
+            GRAPH_STEPS.observe(len(turn_messages))
+            
+            trace = current_trace()
+            if trace is not None and self.tool_router is not None:
+                TOOL_TOKENS_SAVED.observe(request_tokens_saved(trace))
+            
+            products = []
+            for msg in reversed(turn_messages):
+                if isinstance(msg, ToolMessage):
+                    products.extend(extract_products(msg.content))
+            
             # 응답 메시지 추출
             last_message = response["messages"][-1]
-            if hasattr(last_message, 'content'):
-                return last_message.content
-            else:
-                return str(last_message)
+            content = last_message.content if hasattr(last_message, 'content') else str(last_message)
+            return {"response": content, "products": products}
         
         except Exception as e:
-            return f"죄송합니다. 처리 중 오류가 발생했습니다: {str(e)}"
+            return {"response": f"죄송합니다. 처리 중 오류가 발생했습니다: {str(e)}", "products": []}
     
     def get_conversation_history(self, session_id: str) -> List[Dict]:
         """대화 히스토리 조회"""
@@ -0,0 +1,209 @@
+"""
+네이버 쇼핑 다중 페이지 수집 모듈
+
+최저가 답변이 첫 페이지 표본에만 의존하지 않도록 start 파라미터로 여러 페이지를
+동시에 조회합니다. 페이지는 동시 실행 묶음 단위로 요청하고 도착 순서대로 전달하며,
+목표 개수에 도달하거나 묶음 사이 가격 분포(최저가, 하위 25%, 중앙값)가 거의 변하지
+않으면 조기 종료합니다. 추가 페이지 호출은 일일 할당량 안에서만 사용합니다.
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Sequence, Tuple
+from config import settings
+from agent.metrics import registry
+from agent.query_planner import MAX_DISPLAY
+from agent.ranking import ACCESSORY_PRICE_RATIO
+from agent.tracing import span
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 네이버 검색 API start 상한
+MAX_START = 1000
+
+# 첫 페이지 중앙값 대비 이 비율 미만 가격은 액세서리 등 다른 상품으로 보고 제외
+OUTLIER_RATIO = ACCESSORY_PRICE_RATIO
+
+DEEP_FETCH_STOPS = registry.counter(
+    "naver_deep_fetch_total", "쇼핑 다중 페이지 수집 종료 사유별 횟수", ["reason"]
+)
+DEEP_FETCH_PAGE_ERRORS = registry.counter(
+    "naver_deep_fetch_page_errors_total", "쇼핑 다중 페이지 수집 중 실패한 페이지 수"
+)
+
+# (start, display) → 상품 목록 (요청 실패 시 None 또는 예외, 빈 목록은 결과 소진)
+PageFetcher = Callable[[int, int], Awaitable[Optional[List[Any]]]]
+
+
+class CallQuota:
+    """일일 API 호출 할당량 (날짜가 바뀌면 초기화)"""
+
+    def __init__(self, daily_limit: int):
+        self.daily_limit = daily_limit
+        self.used = 0
+        self._day: Optional[str] = None
+
+    def _roll(self):
+        day = time.strftime("%Y-%m-%d")
+        if day != self._day:
+            self._day = day
+            self.used = 0
+
+    def take(self, calls: int) -> int:
+        """호출 수 예약 (남은 할당량만큼만 허용)"""
+        self._roll()
+        granted = max(0, min(calls, self.daily_limit - self.used))
+        self.used += granted
+        return granted
+
+    def remaining(self) -> int:
+        self._roll()
+        return max(0, self.daily_limit - self.used)
+
+
+def _price_of(product: Any) -> Optional[float]:
+    price = product.get("price") if isinstance(product, dict) else getattr(product, "price", None)
+    return price if price else None
+
+
+def price_summary(prices: Sequence[float]) -> Tuple[float, float, float]:
+    """가격 분포 요약 (최저가, 하위 25%, 중앙값)"""
+    ordered = sorted(prices)
+    return ordered[0], ordered[len(ordered) // 4], ordered[len(ordered) // 2]
+
+
+class PriceDistribution:
+    """수집 중인 가격 분포와 수렴 판정"""
+
+    def __init__(self, tolerance: float = 0.02):
+        """tolerance는 묶음 사이 요약값의 허용 상대 변화량"""
+        self.tolerance = tolerance
+        self.prices: List[float] = []
+        self._last: Optional[Tuple[float, float, float]] = None
+
+    def add(self, products: Sequence[Any]):
+        self.prices.extend(price for price in map(_price_of, products) if price)
+
+    def settled(self) -> bool:
+        """직전 확인 이후 분포 요약이 허용 범위 안에서만 변했는지"""
+        if not self.prices:
+            return False
+        summary = price_summary(self.prices)
+        previous, self._last = self._last, summary
+        if previous is None:
+            return False
+        return all(abs(now - before) <= self.tolerance * before for now, before in zip(summary, previous))
+
+
+async def iter_shopping_pages(
+    fetch_page: PageFetcher,
+    page_size: int = MAX_DISPLAY,
+    max_pages: Optional[int] = None,
+    target_count: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    tolerance: Optional[float] = None,
+    quota: Optional[CallQuota] = None
+) -> AsyncIterator[List[Any]]:
+    """쇼핑 검색 결과를 페이지 단위로 스트리밍
+
+    첫 페이지를 먼저 받아 기준 분포를 만들고(중앙값의 OUTLIER_RATIO배 미만 상품은
+    첫 페이지부터 제외), 이후 페이지는 concurrency개씩 동시에
+    요청합니다. 목표 개수 도달, 가격 분포 수렴, 결과 소진, 할당량 소진, 최대 깊이
+    중 먼저 만족하는 조건에서 멈춥니다. 실패한 페이지(None 또는 예외)는 건너뛰고 따로
+    집계하며, 덜 찬 페이지를 실제로 받았을 때만 결과 소진으로 봅니다. 첫 페이지나
+    한 묶음 전체가 실패하면 "error"로 멈춥니다.
+    """
+    page_size = min(page_size, MAX_DISPLAY)
+    max_pages = min(max_pages or settings.naver_deep_fetch_pages, MAX_START // page_size)
+    target_count = target_count or settings.naver_deep_fetch_target
+    concurrency = concurrency or settings.naver_deep_fetch_concurrency
+    quota = quota or deep_fetch_quota
+    distribution = PriceDistribution(settings.naver_deep_fetch_tolerance if tolerance is None else tolerance)
+
+    with span("naver.deep_fetch", max_pages=max_pages) as current:
+        errors = 0
+        try:
+            first = await fetch_page(1, page_size)
+        except Exception as e:
+            logger.error(f"쇼핑 첫 페이지 조회 실패: {e}")
+            first = None
+        if first is None:
+            errors += 1
+            DEEP_FETCH_PAGE_ERRORS.inc()
+            first, full_page = [], False
+        else:
+            full_page = len(first) >= page_size
+        prices = [price for price in map(_price_of, first) if price]
+        floor = price_summary(prices)[2] * OUTLIER_RATIO if prices else 0
+        # 액세서리는 첫 페이지에 가장 많으므로 첫 페이지부터 같은 기준으로 제외
+        first = [product for product in first if (_price_of(product) or floor) >= floor]
+        distribution.add(first)
+        if first:
+            yield first
+        collected, pages, reason = len(first), 1, "depth"
+
+        if errors:
+            reason = "error"
+        elif not full_page:
+            reason = "exhausted"
+        elif collected >= target_count:
+            reason = "target"
+        else:
+            distribution.settled()
+            while pages < max_pages:
+                wanted = min(concurrency, max_pages - pages)
+                granted = quota.take(wanted)
+                if not granted:
+                    reason = "quota"
+                    break
+
+                tasks = [
+                    asyncio.ensure_future(fetch_page(1 + (pages + i) * page_size, page_size))
+                    for i in range(granted)
+                ]
+                pages += granted
+                exhausted = False
+                failed = 0
+                try:
+                    for next_done in asyncio.as_completed(tasks):
+                        try:
+                            page = await next_done
+                        except Exception as e:
+                            logger.error(f"쇼핑 추가 페이지 조회 실패: {e}")
+                            page = None
+                        if page is None:
+                            failed += 1
+                            DEEP_FETCH_PAGE_ERRORS.inc()
+                            continue
+                        exhausted = exhausted or len(page) < page_size
+                        page = [product for product in page if (_price_of(product) or floor) >= floor]
+                        if page:
+                            distribution.add(page)
+                            collected += len(page)
+                            yield page
+                finally:
+                    for task in tasks:
+                        task.cancel()
+
+                errors += failed
+                if exhausted:
+                    reason = "exhausted"
+                    break
+                if failed == granted:
+                    reason = "error"
+                    break
+                if collected >= target_count:
+                    reason = "target"
+                    break
+                if distribution.settled():
+                    reason = "stable"
+                    break
+
+        DEEP_FETCH_STOPS.inc(1, reason)
+        if current is not None:
+            current.attributes.update(pages=pages, collected=collected, errors=errors, reason=reason)
+
+
+# 추가 페이지 호출 일일 할당량 (네이버 검색 API 일일 한도 중 다중 페이지 수집 몫)
+deep_fetch_quota = CallQuota(settings.naver_deep_fetch_daily_quota)
@@ -0,0 +1,269 @@
+"""
+로컬 검색 결과 카탈로그
+
+네이버/MCP 검색 결과를 파싱 직후 URL 단위로 로컬 SQLite FTS5 색인에 추가합니다.
+한국어는 조사와 복합어가 붙어도 찾을 수 있도록 어절과 함께 음절 바이그램을 색인하며,
+쓰기는 메모리 버퍼에 모았다가 백그라운드 스레드가 한 트랜잭션으로 저장합니다.
+후속/반복 질문은 외부 API 없이 1ms 안팎으로 답하고, 결과가 부족하거나 질의 의도에
+비해 오래되었으면 실시간 검색으로 넘어가도록 신선도를 판정합니다.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from config import settings
+from agent.metrics import registry
+from agent.models import Product, SearchHit
+from agent.query_planner import GENERAL, INTENT_KEYWORDS, NEWS, PRICE, REVIEW
+from agent.ranking import hangul_bigrams, split_words, tokenize
+from agent.speculative import normalize_query
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 질의 의도별 로컬 결과 유효 시간 (초): 가격과 뉴스는 짧게, 리뷰는 길게
+FRESHNESS_TTL: Dict[str, float] = {
+    PRICE: 3600.0,
+    NEWS: 900.0,
+    REVIEW: 7 * 86400.0,
+    GENERAL: 86400.0,
+}
+
+# 색인 내용이 아닌 의도 표현 (검색 조건에서 제외)
+_INTENT_WORDS = frozenset(keyword for keywords in INTENT_KEYWORDS.values() for keyword, _ in keywords)
+
+CATALOG_LOOKUPS = registry.counter(
+    "local_catalog_lookups_total", "로컬 카탈로그 조회 결과별 횟수", ["result"]
+)
+
+# (url, title, content, source, price, mall, extra, terms, seen_at)
+Row = Tuple[str, str, str, str, Optional[int], str, Optional[str], str, float]
+
+
+class CatalogLookup(NamedTuple):
+    """카탈로그 조회 결과와 신선도 판정"""
+    hits: List[SearchHit]
+    fresh: bool
+    reason: str  # fresh | empty | too_few | stale
+
+
+def _index_terms(hit: SearchHit) -> str:
+    """색인할 토큰 (제목은 두 번 넣어 가중치 부여)"""
+    mall = getattr(hit, "mall", "")
+    title = " ".join(tokenize(hit.title))
+    return " ".join((title, title, " ".join(tokenize(hit.content)), " ".join(tokenize(mall))))
+
+
+def match_expression(query: str) -> Optional[str]:
+    """FTS5 검색식 (어절마다 어절 자체 또는 음절 바이그램 전체와 일치, 어절 간 AND)"""
+    words = [word for word in normalize_query(query).split() if word not in _INTENT_WORDS]
+    clauses = []
+    for part in dict.fromkeys(part for word in words for part in split_words(word)):
+        bigrams = hangul_bigrams(part)
+        if bigrams:
+            clauses.append(f'("{part}" OR (' + " AND ".join(f'"{bigram}"' for bigram in bigrams) + "))")
+        else:
+            clauses.append(f'"{part}"')
+    return " AND ".join(clauses) or None
+
+
+class LocalCatalog:
+    """검색 결과 FTS5 카탈로그"""
+
+    def __init__(self, path: str, flush_interval: float = 2.0, retention_days: float = 30.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.retention = retention_days * 86400
+        self.indexed = 0
+
+        self._pending: Dict[str, Row] = {}
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._last_purge = 0.0
+        self._conn = self._open(path)
+
+        self._thread = threading.Thread(target=self._run, name="local-catalog-writer", daemon=True)
+        self._thread.start()
+
+    def _open(self, path: str) -> sqlite3.Connection:
+        """SQLite 연결 및 스키마 생성 (FTS5 외부 콘텐츠 테이블과 동기화 트리거)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(
+            "CREATE TABLE IF NOT EXISTS catalog_hits ("
+            "id INTEGER PRIMARY KEY, url TEXT NOT NULL UNIQUE, title TEXT NOT NULL, content TEXT NOT NULL, "
+            "source TEXT NOT NULL, price INTEGER, mall TEXT NOT NULL, extra TEXT, terms TEXT NOT NULL, "
+            "seen_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS idx_catalog_seen ON catalog_hits (seen_at);"
+            "CREATE VIRTUAL TABLE IF NOT EXISTS catalog_fts USING fts5("
+            "terms, content='catalog_hits', content_rowid='id', tokenize='unicode61');"
+            "CREATE TRIGGER IF NOT EXISTS catalog_ai AFTER INSERT ON catalog_hits BEGIN "
+            "INSERT INTO catalog_fts (rowid, terms) VALUES (new.id, new.terms); END;"
+            "CREATE TRIGGER IF NOT EXISTS catalog_ad AFTER DELETE ON catalog_hits BEGIN "
+            "INSERT INTO catalog_fts (catalog_fts, rowid, terms) VALUES ('delete', old.id, old.terms); END;"
+            "CREATE TRIGGER IF NOT EXISTS catalog_au AFTER UPDATE ON catalog_hits BEGIN "
+            "INSERT INTO catalog_fts (catalog_fts, rowid, terms) VALUES ('delete', old.id, old.terms); "
+            "INSERT INTO catalog_fts (rowid, terms) VALUES (new.id, new.terms); END;"
+        )
+        return conn
+
+    def index(self, hits: Iterable[SearchHit], seen_at: Optional[float] = None):
+        """검색 결과 색인 (버퍼에 추가, 저장은 백그라운드, URL이 같으면 최신 값으로 갱신)"""
+        now = seen_at or time.time()
+        rows = {}
+        for hit in hits:
+            if not hit.url or not hit.title:
+                continue
+            rows[hit.url] = (
+                hit.url, hit.title, hit.content, hit.source, getattr(hit, "price", None),
+                getattr(hit, "mall", ""), json.dumps(hit.extra, ensure_ascii=False) if hit.extra else None,
+                _index_terms(hit), now
+            )
+
+        if rows:
+            with self._lock:
+                self._pending.update(rows)
+
+    def _run(self):
+        """주기적으로 버퍼 일괄 저장 및 보관 기간이 지난 항목 정리"""
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+                if time.time() - self._last_purge >= 3600:
+                    self.purge()
+            except Exception as e:
+                logger.warning(f"로컬 카탈로그 저장 실패: {e}")
+
+    def flush(self):
+        """버퍼의 결과를 한 트랜잭션으로 저장"""
+        with self._lock:
+            rows, self._pending = list(self._pending.values()), {}
+
+        if not rows:
+            return
+
+        with self._db_lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO catalog_hits (url, title, content, source, price, mall, extra, terms, seen_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(url) DO UPDATE SET "
+                    "title = excluded.title, content = excluded.content, source = excluded.source, "
+                    "price = excluded.price, mall = excluded.mall, extra = excluded.extra, "
+                    "terms = excluded.terms, seen_at = excluded.seen_at",
+                    rows
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                with self._lock:
+                    for row in rows:
+                        self._pending.setdefault(row[0], row)
+                raise
+        self.indexed += len(rows)
+
+    def purge(self):
+        """보관 기간이 지난 결과 삭제"""
+        self._last_purge = time.time()
+        with self._db_lock:
+            self._conn.execute("DELETE FROM catalog_hits WHERE seen_at < ?", (self._last_purge - self.retention,))
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[SearchHit, float]]:
+        """관련도순 검색 (결과와 마지막 수집 시각)"""
+        expression = match_expression(query)
+        if expression is None:
+            return []
+
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT h.url, h.title, h.content, h.source, h.price, h.mall, h.extra, h.seen_at "
+                "FROM catalog_fts JOIN catalog_hits h ON h.id = catalog_fts.rowid "
+                "WHERE catalog_fts MATCH ? ORDER BY bm25(catalog_fts) LIMIT ?",
+                (expression, limit)
+            ).fetchall()
+
+        results = []
+        for url, title, content, source, price, mall, extra, seen_at in rows:
+            fields = dict(
+                content=content, url=url, source=source,
+                timestamp=datetime.fromtimestamp(seen_at).isoformat(),
+                extra=json.loads(extra) if extra else None
+            )
+            hit = Product(title, price, mall=mall, **fields) if price is not None else SearchHit(title, **fields)
+            results.append((hit, seen_at))
+        return results
+
+    def lookup(self, query: str, intent: str = GENERAL, limit: int = 20, now: Optional[float] = None) -> CatalogLookup:
+        """신선도 판정을 포함한 조회
+
+        의도별 유효 시간(가격 1시간, 뉴스 15분, 리뷰 7일, 일반 1일)이 지난 결과는 빼고,
+        남은 결과가 min_results개 미만이면 fresh=False입니다 (일치 결과는 충분하지만
+        오래된 경우 stale, 일치 결과 자체가 부족하면 too_few).
+        """
+        now = now or time.time()
+        found = self.search(query, limit)
+        ttl = FRESHNESS_TTL.get(intent, FRESHNESS_TTL[GENERAL])
+        hits = [hit for hit, seen_at in found if now - seen_at <= ttl]
+
+        if not found:
+            reason = "empty"
+        elif len(hits) >= settings.local_catalog_min_results:
+            reason = "fresh"
+        elif len(found) < settings.local_catalog_min_results:
+            reason = "too_few"
+        else:
+            reason = "stale"
+
+        CATALOG_LOOKUPS.inc(1, reason)
+        return CatalogLookup(hits, reason == "fresh", reason)
+
+    def stats(self) -> Dict[str, Any]:
+        """카탈로그 통계"""
+        with self._db_lock:
+            total = self._conn.execute("SELECT COUNT(*) FROM catalog_hits").fetchone()[0]
+        return {"path": self.path, "hits": total, "indexed": self.indexed, "pending": len(self._pending)}
+
+
+_catalog: Optional[LocalCatalog] = None
+_catalog_failed = False
+_catalog_lock = threading.Lock()
+
+
+def get_local_catalog() -> Optional[LocalCatalog]:
+    """로컬 카탈로그 싱글톤 접근 (비활성화되었거나 열 수 없으면 None)"""
+    global _catalog, _catalog_failed
+
+    if _catalog is None and settings.local_catalog_enabled and not _catalog_failed:
+        with _catalog_lock:
+            if _catalog is None and not _catalog_failed:
+                try:
+                    _catalog = LocalCatalog(
+                        settings.local_catalog_db_path,
+                        flush_interval=settings.price_history_flush_interval,
+                        retention_days=settings.local_catalog_retention_days
+                    )
+                except Exception as e:
+                    # FTS5가 없는 SQLite 등: 카탈로그 없이 실시간 검색만 사용
+                    logger.warning(f"로컬 카탈로그를 열 수 없음: {e}")
+                    _catalog_failed = True
+
+    return _catalog
+
+
+def index_hits(hits: Iterable[SearchHit]):
+    """파싱된 검색 결과 색인 (카탈로그를 사용할 수 없으면 무시)"""
+    catalog = get_local_catalog()
+    if catalog is not None:
+        catalog.index(hits)
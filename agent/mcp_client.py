@@ -4,10 +4,21 @@ MCP 기반 웹 검색 클라이언트
 
 import os
 import asyncio
+import time
 from typing import List, Dict, Any, Optional
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from langchain_mcp_adapters.tools import load_mcp_tools
 from config import settings
+from agent.search_cache import SearchCache, get_search_cache
+from agent.models import SearchHit, to_dicts
+from agent.product_matching import dedupe_hits
+from agent.ranking import rank_hits
+from agent.local_catalog import index_hits
+from agent.metrics import MCP_CALL_LATENCY
+from agent.prefetch import naver_rate_limiter, prefetcher
+from agent.resilience import OPEN, get_circuit_breaker, hedge
+from agent.tool_index import ToolIndex
+from agent.tracing import span
 import logging
 
 logger = logging.getLogger(__name__)
@@ -34,6 +45,9 @@ class MCPSearchClient:
         self.exa_connected = False
         self._naver_tools = []
         self._exa_tools = []
+        self.tool_index = ToolIndex()
+        self.cache = get_search_cache("mcp_search")
+        self._realtime_inflight: Dict[str, asyncio.Future] = {}
     
     async def initialize(self) -> bool:
         """클라이언트 초기화"""
@@ -69,34 +83,40 @@ class MCPSearchClient:
         """네이버 검색 MCP 연결"""
         try:
             if self.client:
-                async with self.client.session("naver_search_mcp") as session:
-                    await session.initialize()
-                    naver_tools = await load_mcp_tools(session)
-                    self._naver_tools = naver_tools
-                    self.naver_connected = True
-                    logger.info("네이버 검색 MCP 연결 성공")
-                    return True
+                with span("mcp.connect", server="naver_search_mcp"):
+                    async with self.client.session("naver_search_mcp") as session:
+                        await session.initialize()
+                        naver_tools = await load_mcp_tools(session)
+                        self._naver_tools = naver_tools
+                        self.tool_index.update("naver_search_mcp", naver_tools)
+                        self.naver_connected = True
+                        logger.info("네이버 검색 MCP 연결 성공")
+                        return True
             return False
         except Exception as e:
             logger.warning(f"네이버 검색 MCP 연결 실패: {e}")
             self.naver_connected = False
+            self.tool_index.clear("naver_search_mcp")
             return False
     
     async def connect_exa_search(self) -> bool:
         """Exa 검색 MCP 연결"""
         try:
             if self.client:
-                async with self.client.session("exa_search_mcp") as session:
-                    await session.initialize()
-                    exa_tools = await load_mcp_tools(session)
-                    self._exa_tools = exa_tools
-                    self.exa_connected = True
-                    logger.info("Exa 검색 MCP 연결 성공")
-                    return True
+                with span("mcp.connect", server="exa_search_mcp"):
+                    async with self.client.session("exa_search_mcp") as session:
+                        await session.initialize()
+                        exa_tools = await load_mcp_tools(session)
+                        self._exa_tools = exa_tools
+                        self.tool_index.update("exa_search_mcp", exa_tools)
+                        self.exa_connected = True
+                        logger.info("Exa 검색 MCP 연결 성공")
+                        return True
             return False
         except Exception as e:
             logger.warning(f"Exa 검색 MCP 연결 실패: {e}")
             self.exa_connected = False
+            self.tool_index.clear("exa_search_mcp")
             return False
     
     async def get_tools(self) -> List:
@@ -119,47 +139,190 @@ class MCPSearchClient:
             logger.error(f"내부 툴 로드 실패: {e}")
             return []
     
-    async def search_naver(self, query: str) -> Dict[str, Any]:
-        """네이버 검색 실행"""
+    async def search_naver(self, query: str, use_cache: bool = True) -> Dict[str, Any]:
+        """네이버 검색 실행 (use_cache=False는 캐시를 건너뛰고 갱신만 하는 백그라운드 호출)"""
         if not self.naver_connected or not self._naver_tools:
             return {"source": "naver", "results": [], "error": "네이버 검색 연결 안됨"}
         
-        try:
-            # 네이버 검색 툴 실행
-            for tool in self._naver_tools:
-                if "search" in tool.name.lower() or "naver" in tool.name.lower():
-                    result = await tool.ainvoke({"query": query})
-                    return {"source": "naver", "results": result}
+        cache_key = SearchCache.make_key("naver", query)
+        if use_cache:
+            refresh = lambda: self.search_naver(query, use_cache=False)
+            prefetcher.track(self.cache, cache_key, refresh, naver_rate_limiter)
+            
+            cached = await self.cache.aget(cache_key)
+            if cached is not None:
+                return {"source": "naver", "results": cached}
             
+            stale = await self.cache.aget_stale(cache_key)
+            if stale is not None:
+                prefetcher.revalidate(self.cache, cache_key, refresh, naver_rate_limiter)
+                return {"source": "naver", "results": stale}
+        
+        # 연결 시점에 해석해 둔 네이버 검색 툴
+        tool = self.tool_index.get("naver_search_mcp", "web_search")
+        if tool is None:
             return {"source": "naver", "results": [], "error": "검색 툴을 찾을 수 없음"}
+        
+        breaker = get_circuit_breaker("naver_search_mcp")
+        use_hedge = use_cache and NAVER_SEARCH_AVAILABLE
+        if breaker.state == OPEN and not use_hedge:
+            return await self._unhealthy_result("naver", cache_key, "네이버 검색 MCP 회로 차단 중")
+        
+        mcp_call = lambda: self._call_mcp("naver_search_mcp", tool, query)
+        
+        async def realtime_call():
+            # 네이버 API를 실제로 호출할 때만 토큰 사용, 도구 경계를 넘기 전에 딕셔너리로 변환
+            await naver_rate_limiter.acquire()
+            return to_dicts(await self._realtime_hits(query))
+        
+        try:
+            if use_hedge:
+                # MCP가 평소 p95보다 느리거나 회로가 열려 있으면 네이버 API 직접 호출로 헤징
+                delay = breaker.latency_percentile() or settings.mcp_hedge_delay
+                result, winner = await hedge(mcp_call, realtime_call, delay, site="naver_mcp")
+                if winner == "backup":
+                    return {"source": "naver_realtime", "results": result, "hedged": True}
+                if result is None:
+                    return await self._unhealthy_result("naver", cache_key, "네이버 검색 실패")
+            else:
+                # 백그라운드 갱신은 갱신기가 이미 토큰을 획득
+                if use_cache:
+                    await naver_rate_limiter.acquire()
+                result = await mcp_call()
+            
+            if result:
+                self.cache.set(cache_key, result)
+                self._index_fresh("naver", result)
+            return {"source": "naver", "results": result}
             
         except Exception as e:
             logger.error(f"네이버 검색 실패: {e}")
-            return {"source": "naver", "results": [], "error": str(e)}
+            return await self._unhealthy_result("naver", cache_key, str(e))
     
-    async def search_exa(self, query: str) -> Dict[str, Any]:
-        """Exa 검색 실행"""
+    async def search_exa(self, query: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Exa 검색 실행 (use_cache=False는 캐시를 건너뛰고 갱신만 하는 백그라운드 호출)"""
         if not self.exa_connected or not self._exa_tools:
             return {"source": "exa", "results": [], "error": "Exa 검색 연결 안됨"}
         
-        try:
-            # Exa 검색 툴 실행
-            for tool in self._exa_tools:
-                if "search" in tool.name.lower() or "exa" in tool.name.lower():
-                    result = await tool.ainvoke({"query": query})
-                    return {"source": "exa", "results": result}
+        cache_key = SearchCache.make_key("exa", query)
+        if use_cache:
+            refresh = lambda: self.search_exa(query, use_cache=False)
+            prefetcher.track(self.cache, cache_key, refresh, None)
             
+            cached = await self.cache.aget(cache_key)
+            if cached is not None:
+                return {"source": "exa", "results": cached}
+            
+            stale = await self.cache.aget_stale(cache_key)
+            if stale is not None:
+                prefetcher.revalidate(self.cache, cache_key, refresh, None)
+                return {"source": "exa", "results": stale}
+        
+        # 연결 시점에 해석해 둔 Exa 검색 툴
+        tool = self.tool_index.get("exa_search_mcp", "web_search")
+        if tool is None:
             return {"source": "exa", "results": [], "error": "검색 툴을 찾을 수 없음"}
+        
+        if get_circuit_breaker("exa_search_mcp").state == OPEN:
+            return await self._unhealthy_result("exa", cache_key, "Exa 검색 MCP 회로 차단 중")
+        
+        try:
+            result = await self._call_mcp("exa_search_mcp", tool, query)
+            if result:
+                self.cache.set(cache_key, result)
+                self._index_fresh("exa", result)
+            return {"source": "exa", "results": result}
             
         except Exception as e:
             logger.error(f"Exa 검색 실패: {e}")
-            return {"source": "exa", "results": [], "error": str(e)}
+            return await self._unhealthy_result("exa", cache_key, str(e))
+    
+    @staticmethod
+    def _index_fresh(source: str, result: Any):
+        """새로 받은 MCP 결과만 로컬 카탈로그에 색인 (캐시 값은 최근 확인 시각을 갱신하지 않음)"""
+        if isinstance(result, list):
+            index_hits(SearchHit.from_dict(item, source) for item in result if isinstance(item, dict))
+    
+    async def _call_mcp(self, server: str, tool, query: str) -> Any:
+        """MCP 툴 호출 (서버별 회로 차단기와 호출 제한 시간 적용)"""
+        started = time.perf_counter()
+        try:
+            with span(f"mcp.{server}", tool=tool.name):
+                result = await get_circuit_breaker(server).call(
+                    lambda: tool.ainvoke({"query": query}),
+                    timeout=settings.mcp_call_timeout
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            MCP_CALL_LATENCY.observe(time.perf_counter() - started, server, "error")
+            raise
+        MCP_CALL_LATENCY.observe(time.perf_counter() - started, server, "ok")
+        return result
+    
+    async def _realtime_hits(self, query: str) -> List[SearchHit]:
+        """네이버 API 직접 검색 (헤징 경로끼리 같은 질의를 동시에 요청하면 한 번만 실행)"""
+        task = self._realtime_inflight.get(query)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_realtime(query))
+            self._realtime_inflight[query] = task
+            task.add_done_callback(lambda done: self._realtime_done(query, done))
+        # 헤징에서 진 쪽이 취소되어도 공유 호출은 계속 진행
+        return await asyncio.shield(task)
+    
+    async def _fetch_realtime(self, query: str) -> List[SearchHit]:
+        naver_client = await get_naver_client()
+        return await naver_client.unified_naver_search(query)
+    
+    def _realtime_done(self, query: str, task: asyncio.Future):
+        self._realtime_inflight.pop(query, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"네이버 실시간 검색 실패: {task.exception()}")
+    
+    async def _unhealthy_result(self, source: str, cache_key: str, error: str) -> Dict[str, Any]:
+        """업스트림 장애 시 응답 (만료 유예 중인 캐시가 있으면 표시와 함께 반환)"""
+        stale = await self.cache.aget_stale(cache_key)
+        if stale is not None:
+            return {"source": source, "results": stale, "stale": True}
+        return {"source": source, "results": [], "error": error}
     
     async def unified_search(self, query: str, use_realtime_fallback: bool = True) -> List[Dict[str, Any]]:
-        """통합 검색 실행 (실시간 폴백 포함)"""
-        results = []
+        """통합 검색 실행 (실시간 검색 헤징 포함)
+        
+        MCP 검색을 시작하고 settings.realtime_hedge_delay 안에 유효한 결과가 없으면
+        네이버 실시간 검색도 시작하여 먼저 유효한 결과를 낸 경로를 채택합니다.
+        """
+        realtime = use_realtime_fallback and NAVER_SEARCH_AVAILABLE
         
-        # 병렬 검색 실행
+        try:
+            with span("search.unified") as current:
+                if not realtime:
+                    results = await self._search_mcp_servers(query)
+                    winner = "primary"
+                else:
+                    results, winner = await hedge(
+                        lambda: self._search_mcp_servers(query),
+                        lambda: self._search_realtime(query),
+                        settings.realtime_hedge_delay,
+                        accept=self._has_valid_results,
+                        site="unified_search"
+                    )
+                    results = results or []
+                
+                path = {"primary": "mcp", "backup": "naver_realtime"}.get(winner, "none")
+                if current is not None:
+                    current.attributes["winner"] = path
+                logger.info(f"통합 검색 채택 경로: {path} ({len(results)}개 소스)")
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"통합 검색 실패: {e}")
+            return []
+    
+    async def _search_mcp_servers(self, query: str) -> List[Dict[str, Any]]:
+        """연결된 MCP 서버 병렬 검색"""
+        results = []
         search_tasks = []
         
         if self.naver_connected:
@@ -168,53 +331,34 @@ class MCPSearchClient:
         if self.exa_connected:
             search_tasks.append(self.search_exa(query))
         
-        try:
-            if search_tasks:
-                search_results = await asyncio.gather(*search_tasks, return_exceptions=True)
-                
-                for result in search_results:
-                    if isinstance(result, dict) and not isinstance(result, Exception):
-                        results.append(result)
-                    elif isinstance(result, Exception):
-                        logger.error(f"검색 중 오류 발생: {result}")
+        if search_tasks:
+            search_results = await asyncio.gather(*search_tasks, return_exceptions=True)
             
-            # MCP 검색이 실패하거나 결과가 없을 때 실시간 검색 폴백 사용
-            if use_realtime_fallback:
-                has_valid_results = any(
-                    result.get("results") and len(result.get("results", [])) > 0 
-                    for result in results
-                )
-                
-                if not has_valid_results:
-                    logger.info("MCP 검색 결과가 없어 실시간 검색 폴백 사용")
-                    
-                    # 네이버 실시간 검색 시도
-                    if NAVER_SEARCH_AVAILABLE:
-                        try:
-                            naver_client = await get_naver_client()
-                            naver_results = await naver_client.unified_naver_search(query)
-                            
-                            if naver_results:
-                                results.append({
-                                    "source": "naver_realtime",
-                                    "results": naver_results
-                                })
-                                logger.info(f"네이버 실시간 검색 완료: {len(naver_results)}개 결과")
-                            
-                        except Exception as e:
-                            logger.error(f"네이버 실시간 검색 실패: {e}")
-                    
-                    # DuckDuckGo 폴백 제거됨 - 네이버 API가 충분히 효과적임
-            
-            return results
-            
-        except Exception as e:
-            logger.error(f"통합 검색 실패: {e}")
+            for result in search_results:
+                if isinstance(result, dict):
+                    results.append(result)
+                elif isinstance(result, Exception):
+                    logger.error(f"검색 중 오류 발생: {result}")
+        
+        return results
+    
+    async def _search_realtime(self, query: str) -> List[Dict[str, Any]]:
+        """네이버 실시간 검색 (API 직접 호출)"""
+        naver_results = await self._realtime_hits(query)
+        logger.info(f"네이버 실시간 검색 완료: {len(naver_results)}개 결과")
+        
+        if not naver_results:
             return []
+        return [{"source": "naver_realtime", "results": naver_results}]
+    
+    @staticmethod
+    def _has_valid_results(results: Optional[List[Dict[str, Any]]]) -> bool:
+        """결과가 하나라도 있는 소스가 있는지"""
+        return bool(results) and any(result.get("results") for result in results)
     
-    def format_search_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """검색 결과 포맷 통일화"""
-        formatted_results = []
+    def format_search_results(self, results: List[Dict[str, Any]], query: str = "") -> List[SearchHit]:
+        """검색 결과 포맷 통일화 (SearchHit/Product로 한 번만 변환, query가 있으면 관련도순)"""
+        formatted_results: List[SearchHit] = []
         
         for result in results:
             source = result.get("source", "unknown")
@@ -222,19 +366,18 @@ class MCPSearchClient:
             
             if isinstance(search_results, list):
                 for item in search_results:
-                    formatted_item = {
-                        "source": source,
-                        "title": item.get("title", ""),
-                        "content": item.get("content", ""),
-                        "url": item.get("url", ""),
-                        "score": item.get("score", 0.0)
-                    }
-                    formatted_results.append(formatted_item)
+                    if isinstance(item, SearchHit):
+                        formatted_results.append(item)
+                    elif isinstance(item, dict):
+                        formatted_results.append(SearchHit.from_dict(item, source))
         
-        # 점수 기준으로 정렬
-        formatted_results.sort(key=lambda x: x.get("score", 0.0), reverse=True)
+        # 관련도(질의가 없으면 기존 점수) 기준으로 정렬 후 네이버/Exa 간 중복 결과 병합
+        if query:
+            formatted_results = rank_hits(query, formatted_results)
+        else:
+            formatted_results.sort(key=lambda x: x.score, reverse=True)
         
-        return formatted_results
+        return dedupe_hits(formatted_results)
     
     async def close(self):
         """연결 종료"""
@@ -257,4 +400,11 @@ async def get_mcp_client() -> MCPSearchClient:
         _mcp_client = MCPSearchClient()
         await _mcp_client.initialize()
     
-    return _mcp_client 
\ No newline at end of file
+    return _mcp_client
+
+
+def get_mcp_tool_selection() -> Dict[str, Any]:
+    """MCP 서버별 툴 선택 결과 (클라이언트가 아직 없으면 빈 dict)"""
+    if _mcp_client is None:
+        return {}
+    return _mcp_client.tool_index.snapshot()
@@ -3,9 +3,12 @@ MCP 기반 통합 검색 툴
 """
 
 import asyncio
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 from agent.mcp_client import get_mcp_client
+from agent.models import to_dicts
+from agent.result_store import register_results
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,7 +20,8 @@ try:
     from agent.naver_realtime_search import (
         naver_realtime_search, 
         naver_latest_product_search, 
-        naver_news_search_tool
+        naver_news_search_tool,
+        local_catalog_search
     )
     NAVER_TOOLS_AVAILABLE = True
 except ImportError:
@@ -26,7 +30,7 @@ except ImportError:
 
 
 @tool
-async def unified_search_tool(query: str) -> List[Dict[str, Any]]:
+async def unified_search_tool(query: str, config: RunnableConfig = None) -> Union[Dict[str, Any], List]:
     """
     MCP 기반 통합 웹 검색 도구
     
@@ -36,7 +40,7 @@ async def unified_search_tool(query: str) -> List[Dict[str, Any]]:
         query: 검색할 키워드
     
     Returns:
-        통합 검색 결과 리스트
+        결과 핸들(result_id)과 통합 검색 결과 리스트 (결과가 없으면 빈 리스트)
     """
     try:
         # MCP 클라이언트 가져오기
@@ -46,9 +50,11 @@ async def unified_search_tool(query: str) -> List[Dict[str, Any]]:
         search_results = await mcp_client.unified_search(query)
         
         # 결과 포맷 통일화
-        formatted_results = mcp_client.format_search_results(search_results)
+        formatted_results = mcp_client.format_search_results(search_results, query)
         
-        return formatted_results
+        if not formatted_results:
+            return []
+        return register_results(config, to_dicts(formatted_results), query, "unified_search_tool")
         
     except Exception as e:
         logger.error(f"통합 검색 실패: {e}")
@@ -116,7 +122,8 @@ async def get_mcp_search_tools() -> List:
             basic_tools.extend([
                 naver_realtime_search,
                 naver_latest_product_search,
-                naver_news_search_tool
+                naver_news_search_tool,
+                local_catalog_search
             ])
         
         # MCP 도구와 기본 도구 결합
@@ -139,7 +146,8 @@ async def get_mcp_search_tools() -> List:
             fallback_tools.extend([
                 naver_realtime_search,
                 naver_latest_product_search,
-                naver_news_search_tool
+                naver_news_search_tool,
+                local_catalog_search
             ])
         
         return fallback_tools
@@ -184,5 +192,6 @@ if NAVER_TOOLS_AVAILABLE:
     AVAILABLE_MCP_TOOLS.extend([
         naver_realtime_search,
         naver_latest_product_search,
-        naver_news_search_tool
+        naver_news_search_tool,
+        local_catalog_search
     ]) 
\ No newline at end of file
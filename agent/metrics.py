@@ -0,0 +1,231 @@
+"""
+Prometheus 텍스트 형식 메트릭 모듈
+
+핫 패스에서 호출되므로 외부 의존성 없이 가벼운 카운터/히스토그램만 제공합니다.
+값은 워커 프로세스별로 집계됩니다.
+"""
+
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+
+# 기본 지연 시간 버킷 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+COUNT_BUCKETS = (1, 2, 3, 4, 5, 6, 8, 10, 15, 20)
+
+
+def _format_labels(names: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    """라벨 문자열 구성"""
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """단조 증가 카운터"""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, *labels: str):
+        """카운터 증가"""
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        """텍스트 형식 출력"""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    """고정 버킷 히스토그램"""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # 라벨별 [버킷 카운트..., +Inf 카운트], 합계
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, *labels: str):
+        """관측값 기록"""
+        counts = self._counts.get(labels)
+        if counts is None:
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+            self._sums[labels] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[labels] += value
+
+    def render(self) -> List[str]:
+        """텍스트 형식 출력 (누적 버킷)"""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = _format_labels(self.label_names, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            cumulative += counts[-1]
+            le = _format_labels(self.label_names, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {cumulative}")
+            plain = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{plain} {self._sums[labels]}")
+            lines.append(f"{self.name}_count{plain} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """메트릭 레지스트리"""
+
+    def __init__(self):
+        self._metrics: List[Any] = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, help_text, label_names)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        metric = Histogram(name, help_text, label_names, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], List[str]]):
+        """스크레이프 시점에 값을 수집하는 콜렉터 등록 (핫 패스 비용 없음)"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """전체 메트릭을 Prometheus 텍스트 형식으로 출력"""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            try:
+                lines.extend(collector())
+            except Exception:
+                continue
+        return "\n".join(lines) + "\n"
+
+
+# 전역 레지스트리와 메트릭
+registry = MetricsRegistry()
+
+TIME_TO_FIRST_TOKEN = registry.histogram(
+    "chat_time_to_first_token_seconds", "요청 수신부터 첫 콘텐츠 청크까지 걸린 시간", ["endpoint"]
+)
+RESPONSE_TIME = registry.histogram(
+    "chat_response_seconds", "요청 전체 처리 시간", ["endpoint"]
+)
+LLM_LATENCY = registry.histogram(
+    "llm_call_seconds", "LLM 호출 지연 시간", ["model"]
+)
+TOOL_LATENCY = registry.histogram(
+    "tool_call_seconds", "에이전트 도구 실행 시간", ["tool", "status"]
+)
+NAVER_API_LATENCY = registry.histogram(
+    "naver_api_seconds", "네이버 검색 API 호출 시간 (캐시 미스만)", ["endpoint", "status"]
+)
+MCP_CALL_LATENCY = registry.histogram(
+    "mcp_call_seconds", "MCP 서버 도구 호출 시간", ["server", "status"]
+)
+GRAPH_STEPS = registry.histogram(
+    "agent_graph_steps", "요청당 그래프 노드 실행 수", buckets=COUNT_BUCKETS
+)
+LLM_TOKENS = registry.counter(
+    "llm_tokens_total", "LLM 입력/출력 토큰 수", ["direction"]
+)
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """LLM/도구 호출 지연 시간과 토큰 사용량을 기록하는 콜백 핸들러"""
+
+    # 지연 시간 측정을 위해 executor가 아닌 호출 스레드에서 바로 실행
+    run_inline = True
+
+    def __init__(self):
+        self._llm_started: Dict[UUID, Tuple[float, str]] = {}
+        self._tool_started: Dict[UUID, Tuple[float, str]] = {}
+
+    @staticmethod
+    def _model_name(serialized: Optional[Dict[str, Any]], kwargs: Dict[str, Any]) -> str:
+        params = kwargs.get("invocation_params") or {}
+        return str(params.get("model") or params.get("model_name") or (serialized or {}).get("name") or "unknown")
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs: Any):
+        self._llm_started[run_id] = (time.perf_counter(), self._model_name(serialized, kwargs))
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs: Any):
+        self._llm_started[run_id] = (time.perf_counter(), self._model_name(serialized, kwargs))
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any):
+        started = self._llm_started.pop(run_id, None)
+        if started is not None:
+            LLM_LATENCY.observe(time.perf_counter() - started[0], started[1])
+
+        input_tokens, output_tokens = _extract_token_usage(response)
+        if input_tokens:
+            LLM_TOKENS.inc(input_tokens, "in")
+        if output_tokens:
+            LLM_TOKENS.inc(output_tokens, "out")
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs: Any):
+        self._llm_started.pop(run_id, None)
+
+    def on_tool_start(self, serialized, input_str, *, run_id: UUID, **kwargs: Any):
+        name = (serialized or {}).get("name") or kwargs.get("name") or "unknown"
+        self._tool_started[run_id] = (time.perf_counter(), name)
+
+    def on_tool_end(self, output, *, run_id: UUID, **kwargs: Any):
+        started = self._tool_started.pop(run_id, None)
+        if started is not None:
+            TOOL_LATENCY.observe(time.perf_counter() - started[0], started[1], "ok")
+
+    def on_tool_error(self, error, *, run_id: UUID, **kwargs: Any):
+        started = self._tool_started.pop(run_id, None)
+        if started is not None:
+            TOOL_LATENCY.observe(time.perf_counter() - started[0], started[1], "error")
+
+
+def _extract_token_usage(response) -> Tuple[int, int]:
+    """LLMResult에서 입력/출력 토큰 수 추출"""
+    try:
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    return int(usage.get("input_tokens", 0)), int(usage.get("output_tokens", 0))
+    except Exception:
+        pass
+    return 0, 0
+
+
+# 전역 콜백 핸들러 (상태는 run_id 단위라 요청 간 공유 가능)
+metrics_callback = MetricsCallbackHandler()
+
+
+def render_metrics() -> str:
+    """Prometheus 텍스트 형식 출력"""
+    return registry.render()
@@ -0,0 +1,140 @@
+"""
+검색 결과 모델
+
+검색 결과는 파싱 경계(NaverRealtimeSearchClient, MCPSearchClient.format_search_results)에서
+한 번만 SearchHit/Product로 만들어지고, 도구 메시지로 나갈 때 to_dict()로 직렬화됩니다.
+__slots__로 인스턴스 딕셔너리를 없애고 source/mall처럼 반복되는 문자열은 intern하여
+결과 한 건당 메모리를 줄입니다.
+"""
+
+import json
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+from agent.product_events import parse_price
+
+_intern = sys.intern
+
+# 기존 딕셔너리 키 → 속성 이름
+_KEY_ALIASES = {"name": "title", "link": "url", "description": "content", "lprice": "price", "mallName": "mall", "seller": "mall"}
+
+
+class SearchHit:
+    """일반 검색 결과 (웹/뉴스/블로그)"""
+
+    __slots__ = ("title", "content", "url", "source", "score", "timestamp", "extra")
+
+    def __init__(
+        self,
+        title: str,
+        content: str = "",
+        url: str = "",
+        source: str = "unknown",
+        score: float = 0.0,
+        timestamp: str = "",
+        extra: Optional[Dict[str, Any]] = None
+    ):
+        self.title = title
+        self.content = content
+        self.url = url
+        self.source = _intern(source)
+        self.score = score
+        self.timestamp = timestamp
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, item: Dict[str, Any], source: Optional[str] = None) -> "SearchHit":
+        """딕셔너리 결과 변환 (가격 정보가 있으면 Product)"""
+        if item.get("price", item.get("lprice")) not in (None, ""):
+            return Product.from_dict(item, source)
+
+        return cls(
+            title=item.get("title") or item.get("name") or "",
+            content=item.get("content") or item.get("description") or "",
+            url=item.get("url") or item.get("link") or "",
+            source=source or item.get("source") or "unknown",
+            score=float(item.get("score") or 0.0),
+            timestamp=item.get("timestamp", "")
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """도구 메시지용 딕셔너리 (기존 결과 딕셔너리와 같은 키)"""
+        data = {
+            "title": self.title,
+            "content": self.content,
+            "url": self.url,
+            "source": self.source,
+            "score": self.score,
+            "timestamp": self.timestamp
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """딕셔너리 방식 접근 (기존 소비 코드 호환용)"""
+        try:
+            return getattr(self, _KEY_ALIASES.get(key, key))
+        except AttributeError:
+            if self.extra and key in self.extra:
+                return self.extra[key]
+            return default
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(title={self.title!r}, source={self.source!r}, url={self.url!r})"
+
+
+class Product(SearchHit):
+    """쇼핑 검색 결과 (정규화된 정수 가격)"""
+
+    __slots__ = ("price", "mall", "brand", "category")
+
+    def __init__(
+        self,
+        title: str,
+        price: Optional[int],
+        mall: str = "",
+        brand: str = "",
+        category: str = "",
+        **kwargs: Any
+    ):
+        super().__init__(title, **kwargs)
+        self.price = price
+        self.mall = _intern(mall)
+        self.brand = brand
+        self.category = category
+
+    @classmethod
+    def from_dict(cls, item: Dict[str, Any], source: Optional[str] = None) -> "Product":
+        """딕셔너리 결과 변환 (price/lprice, mallName/seller 등 키 차이 흡수)"""
+        return cls(
+            title=item.get("title") or item.get("name") or "",
+            price=parse_price(item.get("price", item.get("lprice"))),
+            mall=item.get("mallName") or item.get("mall") or item.get("seller") or "",
+            brand=item.get("brand") or "",
+            category=item.get("category") or item.get("category1") or "",
+            content=item.get("content") or item.get("description") or "",
+            url=item.get("url") or item.get("link") or item.get("product_url") or "",
+            source=source or item.get("source") or "unknown",
+            score=float(item.get("score") or 0.0),
+            timestamp=item.get("timestamp", "")
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """도구 메시지용 딕셔너리"""
+        data = super().to_dict()
+        data["price"] = self.price
+        data["mallName"] = self.mall
+        data["brand"] = self.brand
+        if self.category:
+            data["category"] = self.category
+        return data
+
+
+def to_dicts(items: Iterable[Any]) -> List[Dict[str, Any]]:
+    """도구 반환용 딕셔너리 목록 (이미 딕셔너리인 항목은 그대로)"""
+    return [item.to_dict() if isinstance(item, SearchHit) else item for item in items]
+
+
+def dumps_hits(items: Iterable[Any]) -> str:
+    """도구 메시지 내용용 JSON 직렬화"""
+    return json.dumps(to_dicts(items), ensure_ascii=False)
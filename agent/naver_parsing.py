@@ -0,0 +1,189 @@
+"""
+네이버 검색 API 응답 파싱 모듈
+
+응답 본문은 orjson이 있으면 orjson으로, 없으면 표준 json으로 디코딩합니다.
+제목/설명의 강조 태그와 HTML 엔티티(&quot;, &amp;, &#39; 등)는 미리 컴파일한
+정규식 한 번으로 함께 제거하며, 대부분을 차지하는 <b> 태그만 있는 문자열과 태그나
+엔티티가 없는 문자열은 정규식 없이 처리합니다.
+수집 시각은 응답마다 한 번만 만들고, 뉴스 pubDate와 블로그 postdate는 epoch 초로
+변환해 extra["published"]에 담습니다.
+"""
+
+import calendar
+import html
+import json
+import re
+from datetime import datetime
+from email.utils import mktime_tz, parsedate_tz
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Union
+from agent.models import Product, SearchHit
+from agent.product_events import parse_price
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 태그 또는 엔티티 (한 번의 치환으로 함께 처리)
+_MARKUP_RE = re.compile(r"<[^>]*>|&(?:#[0-9]+|#[xX][0-9a-fA-F]+|[a-zA-Z][a-zA-Z0-9]*);")
+
+_MONTHS = {
+    name: number for number, name in enumerate(
+        ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), 1
+    )
+}
+
+# 네이버 postdate(YYYYMMDD)는 한국 시간 기준
+_KST_OFFSET = 9 * 3600
+
+Parser = Callable[[List[Dict[str, Any]], str], List[SearchHit]]
+
+
+def loads(body: Union[bytes, str]) -> Any:
+    """응답 본문 JSON 디코딩"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+_unescape = lru_cache(maxsize=512)(html.unescape)
+
+
+def _replace_markup(match: "re.Match[str]") -> str:
+    token = match.group(0)
+    return "" if token[0] == "<" else _unescape(token)
+
+
+def clean_text(text: Optional[str]) -> str:
+    """태그 제거와 엔티티 복원
+
+    검색어 강조 태그(<b>)는 str.replace로 먼저 지우고, 다른 태그나 엔티티가 남은
+    문자열만 정규식 한 번으로 처리합니다.
+    """
+    if not text:
+        return ""
+    if "<b>" in text:
+        text = text.replace("<b>", "").replace("</b>", "")
+    if "<" in text or "&" in text:
+        text = _MARKUP_RE.sub(_replace_markup, text)
+    return text
+
+
+def parse_pub_date(value: Optional[str]) -> Optional[float]:
+    """RFC 2822 날짜(뉴스 pubDate)를 epoch 초로 변환
+
+    네이버의 고정 형식("Mon, 19 Oct 2026 09:05:00 +0900")은 위치로 바로 읽고,
+    다른 형식만 email.utils로 파싱합니다.
+    """
+    if not value:
+        return None
+    month = _MONTHS.get(value[8:11]) if len(value) == 31 else None
+    if month is not None:
+        try:
+            offset = (int(value[27:29]) * 60 + int(value[29:31])) * 60
+            seconds = calendar.timegm((
+                int(value[12:16]), month, int(value[5:7]),
+                int(value[17:19]), int(value[20:22]), int(value[23:25])
+            ))
+            return float(seconds - offset if value[26] == "+" else seconds + offset)
+        except ValueError:
+            pass
+    parsed = parsedate_tz(value)
+    return float(mktime_tz(parsed)) if parsed else None
+
+
+@lru_cache(maxsize=4096)
+def parse_post_date(value: Optional[str]) -> Optional[float]:
+    """YYYYMMDD 날짜(블로그 postdate)를 epoch 초로 변환 (한국 시간 자정)"""
+    if not value or len(value) != 8 or not value.isdigit():
+        return None
+    try:
+        return float(calendar.timegm((int(value[:4]), int(value[4:6]), int(value[6:]), 0, 0, 0)) - _KST_OFFSET)
+    except (OverflowError, ValueError):
+        return None
+
+
+def response_timestamp() -> str:
+    """응답 단위 수집 시각"""
+    return datetime.now().isoformat()
+
+
+def parse_web(items: List[Dict[str, Any]], timestamp: str) -> List[SearchHit]:
+    """웹 검색 결과 변환"""
+    return [
+        SearchHit(
+            title=clean_text(item.get("title")),
+            content=clean_text(item.get("description")),
+            url=item.get("link", ""),
+            source="naver_web",
+            timestamp=timestamp
+        )
+        for item in items
+    ]
+
+
+def parse_news(items: List[Dict[str, Any]], timestamp: str) -> List[SearchHit]:
+    """뉴스 검색 결과 변환"""
+    return [
+        SearchHit(
+            title=clean_text(item.get("title")),
+            content=clean_text(item.get("description")),
+            url=item.get("link", ""),
+            source="naver_news",
+            timestamp=timestamp,
+            extra={"pubDate": item.get("pubDate", ""), "published": parse_pub_date(item.get("pubDate"))}
+        )
+        for item in items
+    ]
+
+
+def parse_blog(items: List[Dict[str, Any]], timestamp: str) -> List[SearchHit]:
+    """블로그 검색 결과 변환"""
+    return [
+        SearchHit(
+            title=clean_text(item.get("title")),
+            content=clean_text(item.get("description")),
+            url=item.get("link", ""),
+            source="naver_blog",
+            timestamp=timestamp,
+            extra={
+                "bloggerName": clean_text(item.get("bloggername")),
+                "postDate": item.get("postdate", ""),
+                "published": parse_post_date(item.get("postdate"))
+            }
+        )
+        for item in items
+    ]
+
+
+def parse_shopping(items: List[Dict[str, Any]], timestamp: str) -> List[Product]:
+    """쇼핑 검색 결과 변환"""
+    return [
+        Product(
+            title=clean_text(item.get("title")),
+            price=parse_price(item.get("lprice")),
+            mall=clean_text(item.get("mallName")),
+            brand=clean_text(item.get("brand")),
+            category=item.get("category1", ""),
+            content=clean_text(item.get("description")),
+            url=item.get("link", ""),
+            source="naver_shopping",
+            timestamp=timestamp
+        )
+        for item in items
+    ]
+
+
+PARSERS: Dict[str, Parser] = {
+    "webkr": parse_web,
+    "news": parse_news,
+    "blog": parse_blog,
+    "shop": parse_shopping,
+}
+
+
+def parse_items(endpoint: str, items: List[Dict[str, Any]], timestamp: Optional[str] = None) -> List[SearchHit]:
+    """엔드포인트 응답 항목을 SearchHit/Product로 변환 (수집 시각은 응답당 한 번)"""
+    return PARSERS[endpoint](items, timestamp or response_timestamp())
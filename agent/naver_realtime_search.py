@@ -6,14 +6,50 @@ import asyncio
 import aiohttp
 import json
 import os
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import time
+from typing import AsyncIterator, Callable, List, Dict, Any, Optional, Tuple, Union
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
+from langgraph.config import get_stream_writer
+from config import settings
+from agent.search_cache import SearchCache, get_search_cache
+from agent.models import Product, SearchHit, to_dicts
+from agent.product_events import extract_products
+from agent.naver_parsing import loads, parse_items
+from agent.product_matching import dedupe_hits
+from agent.ranking import drop_price_outliers, rank_hits
+from agent.price_history import get_price_history
+from agent.metrics import NAVER_API_LATENCY, registry
+from agent.prefetch import naver_rate_limiter, prefetcher
+from agent.result_store import register_results, thread_id_from
+from agent.speculative import speculative_search
+from agent.query_planner import PRICE, SearchPlan, classify_intent, default_plan, plan_query
+from agent.local_catalog import get_local_catalog, index_hits
+from agent.deep_fetch import iter_shopping_pages
+from agent.tracing import span
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+SEARCH_PLANS = registry.counter(
+    "naver_search_plans_total", "통합 네이버 검색 질의 의도별 횟수", ["intent"]
+)
+
+
+def _rank_hits(hits: List[SearchHit], query: str, intent: str) -> List[SearchHit]:
+    """관련도순 정렬 후 중복 제거
+
+    최저가 탐색은 액세서리처럼 중앙값보다 지나치게 싼 결과를 먼저 뺀 뒤 가격순으로
+    정렬합니다 (가격 없는 결과는 뒤로).
+    """
+    ranked = dedupe_hits(rank_hits(query, hits, intent=intent))
+    if intent == PRICE:
+        ranked = drop_price_outliers(ranked)
+        ranked.sort(key=lambda hit: (getattr(hit, "price", None) is None, getattr(hit, "price", None) or 0))
+    return ranked
+
+
 class NaverRealtimeSearchClient:
     """네이버 실시간 검색 클라이언트"""
     
@@ -21,6 +57,7 @@ class NaverRealtimeSearchClient:
         self.session = None
         self.client_id = os.getenv("NAVER_CLIENT_ID")
         self.client_secret = os.getenv("NAVER_CLIENT_SECRET")
+        self.cache = get_search_cache("naver_api")
         
         if not self.client_id or not self.client_secret:
             logger.warning("네이버 API 키가 설정되지 않음. 네이버 검색 기능이 제한됩니다.")
@@ -39,219 +76,257 @@ class NaverRealtimeSearchClient:
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
         }
     
-    async def search_web(self, query: str, display: int = 10, sort: str = "date") -> List[Dict[str, Any]]:
+    async def _fetch_items(self, endpoint: str, params: Dict[str, Any], label: str) -> Optional[List[Dict[str, Any]]]:
+        """네이버 검색 API 호출 (워커 간 공유 캐시 우선 조회, API 오류 시 None)
+        
+        조회 빈도는 사전 갱신기에 기록되며, 만료된 항목은 유예 시간 동안 이전 값을
+        바로 반환하고 백그라운드에서 갱신합니다.
+        """
+        cache_key = SearchCache.make_key(endpoint, params)
+        refresh = lambda: self._refresh_items(cache_key, endpoint, params, label)
+        prefetcher.track(self.cache, cache_key, refresh, naver_rate_limiter)
+        
+        cached = await self.cache.aget(cache_key)
+        if cached is not None:
+            return cached
+        
+        stale = await self.cache.aget_stale(cache_key)
+        if stale is not None:
+            prefetcher.revalidate(self.cache, cache_key, refresh, naver_rate_limiter)
+            return stale
+        
+        await naver_rate_limiter.acquire()
+        items = await self._request_items(endpoint, params, label)
+        if items is not None:
+            self._store(cache_key, endpoint, items)
+        return items
+    
+    async def _refresh_items(self, cache_key: str, endpoint: str, params: Dict[str, Any], label: str):
+        """백그라운드 캐시 갱신 (호출 한도 토큰은 갱신기가 미리 획득)"""
+        items = await self._request_items(endpoint, params, label)
+        if items is not None:
+            self._store(cache_key, endpoint, items)
+    
+    def _store(self, cache_key: str, endpoint: str, items: List[Dict[str, Any]]):
+        """새로 받은 응답을 캐시에 저장하고 로컬 카탈로그에 색인
+        
+        캐시나 만료 유예 중인 값은 다시 색인하지 않아야 카탈로그의 최근 확인 시각이
+        실제 조회 시각으로 유지됩니다.
+        """
+        self.cache.set(cache_key, items)
+        index_hits(parse_items(endpoint, items))
+    
+    async def _request_items(self, endpoint: str, params: Dict[str, Any], label: str) -> Optional[List[Dict[str, Any]]]:
+        """네이버 검색 API 요청 (실패 시 None)"""
+        session = await self._get_session()
+        url = f"https://openapi.naver.com/v1/search/{endpoint}.json"
+        started = time.perf_counter()
+        
+        with span(f"naver.{endpoint}", display=params.get("display")) as current:
+            async with session.get(url, params=params, headers=self._get_headers()) as response:
+                if current is not None:
+                    current.attributes["status"] = response.status
+                if response.status != 200:
+                    NAVER_API_LATENCY.observe(time.perf_counter() - started, endpoint, str(response.status))
+                    logger.error(f"네이버 {label} 검색 API 오류: {response.status}")
+                    return None
+                
+                data = loads(await response.read())
+                items = data.get("items", [])
+        
+        NAVER_API_LATENCY.observe(time.perf_counter() - started, endpoint, "200")
+        return items
+    
+    @staticmethod
+    def _parse(endpoint: str, items: List[Dict[str, Any]]) -> List[SearchHit]:
+        """응답 항목 파싱 (색인은 새 응답을 받을 때 _store에서)"""
+        return parse_items(endpoint, items)
+    
+    async def search_web(self, query: str, display: int = 10, sort: str = "date") -> List[SearchHit]:
         """네이버 웹 검색"""
         if not self.client_id or not self.client_secret:
             logger.warning("네이버 API 키가 없어 웹 검색을 건너뜁니다.")
             return []
         
         try:
-            session = await self._get_session()
-            url = "https://openapi.naver.com/v1/search/webkr.json"
-            
             params = {
                 "query": query,
                 "display": display,
                 "sort": sort
             }
-            
-            headers = self._get_headers()
-            
-            async with session.get(url, params=params, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    items = data.get("items", [])
-                    
-                    results = []
-                    for item in items:
-                        results.append({
-                            "title": item.get("title", "").replace("<b>", "").replace("</b>", ""),
-                            "content": item.get("description", "").replace("<b>", "").replace("</b>", ""),
-                            "url": item.get("link", ""),
-                            "source": "naver_web",
-                            "score": 0.8,
-                            "timestamp": datetime.now().isoformat()
-                        })
-                    
-                    return results
-                else:
-                    logger.error(f"네이버 웹 검색 API 오류: {response.status}")
-                    return []
+            items = await self._fetch_items("webkr", params, "웹")
+            return self._parse("webkr", items or [])
                     
         except Exception as e:
             logger.error(f"네이버 웹 검색 실패: {e}")
             return []
     
-    async def search_news(self, query: str, display: int = 10, sort: str = "date") -> List[Dict[str, Any]]:
+    async def search_news(self, query: str, display: int = 10, sort: str = "date") -> List[SearchHit]:
         """네이버 뉴스 검색"""
         if not self.client_id or not self.client_secret:
             logger.warning("네이버 API 키가 없어 뉴스 검색을 건너뜁니다.")
             return []
         
         try:
-            session = await self._get_session()
-            url = "https://openapi.naver.com/v1/search/news.json"
-            
             params = {
                 "query": query,
                 "display": display,
                 "sort": sort
             }
-            
-            headers = self._get_headers()
-            
-            async with session.get(url, params=params, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    items = data.get("items", [])
-                    
-                    results = []
-                    for item in items:
-                        results.append({
-                            "title": item.get("title", "").replace("<b>", "").replace("</b>", ""),
-                            "content": item.get("description", "").replace("<b>", "").replace("</b>", ""),
-                            "url": item.get("link", ""),
-                            "source": "naver_news",
-                            "score": 0.9,  # 뉴스는 신뢰도가 높음
-                            "timestamp": datetime.now().isoformat(),
-                            "pubDate": item.get("pubDate", "")
-                        })
-                    
-                    return results
-                else:
-                    logger.error(f"네이버 뉴스 검색 API 오류: {response.status}")
-                    return []
+            items = await self._fetch_items("news", params, "뉴스")
+            return self._parse("news", items or [])
                     
         except Exception as e:
             logger.error(f"네이버 뉴스 검색 실패: {e}")
             return []
     
-    async def search_blog(self, query: str, display: int = 10, sort: str = "date") -> List[Dict[str, Any]]:
+    async def search_blog(self, query: str, display: int = 10, sort: str = "date") -> List[SearchHit]:
         """네이버 블로그 검색"""
         if not self.client_id or not self.client_secret:
             logger.warning("네이버 API 키가 없어 블로그 검색을 건너뜁니다.")
             return []
         
         try:
-            session = await self._get_session()
-            url = "https://openapi.naver.com/v1/search/blog.json"
-            
             params = {
                 "query": query,
                 "display": display,
                 "sort": sort
             }
-            
-            headers = self._get_headers()
-            
-            async with session.get(url, params=params, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    items = data.get("items", [])
-                    
-                    results = []
-                    for item in items:
-                        results.append({
-                            "title": item.get("title", "").replace("<b>", "").replace("</b>", ""),
-                            "content": item.get("description", "").replace("<b>", "").replace("</b>", ""),
-                            "url": item.get("link", ""),
-                            "source": "naver_blog",
-                            "score": 0.7,
-                            "timestamp": datetime.now().isoformat(),
-                            "bloggerName": item.get("bloggername", ""),
-                            "postDate": item.get("postdate", "")
-                        })
-                    
-                    return results
-                else:
-                    logger.error(f"네이버 블로그 검색 API 오류: {response.status}")
-                    return []
+            items = await self._fetch_items("blog", params, "블로그")
+            return self._parse("blog", items or [])
                     
         except Exception as e:
             logger.error(f"네이버 블로그 검색 실패: {e}")
             return []
     
-    async def search_shopping(self, query: str, display: int = 10, sort: str = "date") -> List[Dict[str, Any]]:
-        """네이버 쇼핑 검색"""
+    async def search_shopping(self, query: str, display: int = 10, sort: str = "date", start: int = 1) -> List[Product]:
+        """네이버 쇼핑 검색 (start: 결과 시작 위치)"""
         if not self.client_id or not self.client_secret:
             logger.warning("네이버 API 키가 없어 쇼핑 검색을 건너뜁니다.")
             return []
         
         try:
-            session = await self._get_session()
-            url = "https://openapi.naver.com/v1/search/shop.json"
-            
-            params = {
-                "query": query,
-                "display": display,
-                "sort": sort
-            }
-            
-            headers = self._get_headers()
-            
-            async with session.get(url, params=params, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    items = data.get("items", [])
-                    
-                    results = []
-                    for item in items:
-                        results.append({
-                            "title": item.get("title", "").replace("<b>", "").replace("</b>", ""),
-                            "content": item.get("description", "").replace("<b>", "").replace("</b>", ""),
-                            "url": item.get("link", ""),
-                            "source": "naver_shopping",
-                            "score": 0.85,
-                            "timestamp": datetime.now().isoformat(),
-                            "price": item.get("lprice", ""),
-                            "mallName": item.get("mallName", ""),
-                            "brand": item.get("brand", "")
-                        })
-                    
-                    return results
-                else:
-                    logger.error(f"네이버 쇼핑 검색 API 오류: {response.status}")
-                    return []
+            return await self._shopping_page(query, display, sort, start=start) or []
                     
         except Exception as e:
             logger.error(f"네이버 쇼핑 검색 실패: {e}")
             return []
     
-    async def unified_naver_search(self, query: str, max_results: int = 20) -> List[Dict[str, Any]]:
-        """통합 네이버 검색"""
-        all_results = []
+    async def _shopping_page(self, query: str, display: int, sort: str, start: int = 1) -> Optional[List[Product]]:
+        """쇼핑 검색 한 페이지 (API 오류 시 None, 예외는 호출자에게 전달)"""
+        params = {
+            "query": query,
+            "display": display,
+            "sort": sort
+        }
+        if start > 1:
+            params["start"] = start
+        items = await self._fetch_items("shop", params, "쇼핑")
+        if items is None:
+            return None
         
-        # 각 검색 타입별 결과 수 분배
-        results_per_type = max_results // 4
+        products = self._parse("shop", items)
         
-        # 병렬로 모든 네이버 검색 실행
-        search_tasks = [
-            self.search_web(query, results_per_type, "date"),
-            self.search_news(query, results_per_type, "date"),
-            self.search_blog(query, results_per_type, "date"),
-            self.search_shopping(query, results_per_type, "date")
-        ]
+        # 가격 이력 기록 (일괄 저장은 백그라운드)
+        history = get_price_history()
+        if history is not None:
+            history.record(products)
         
-        try:
-            search_results = await asyncio.gather(*search_tasks, return_exceptions=True)
-            
-            for result in search_results:
-                if isinstance(result, list) and not isinstance(result, Exception):
-                    all_results.extend(result)
-                elif isinstance(result, Exception):
-                    logger.error(f"네이버 검색 중 오류: {result}")
-            
-            # 점수 기준으로 정렬하고 중복 제거
-            unique_results = []
+        return products
+    
+    async def iter_deep_search_shopping(self, query: str, sort: str = "sim", **limits: Any) -> AsyncIterator[List[Product]]:
+        """쇼핑 다중 페이지 검색 스트리밍 (limits: iter_shopping_pages의 깊이/목표/동시성 설정)"""
+        if not self.client_id or not self.client_secret:
+            logger.warning("네이버 API 키가 없어 쇼핑 검색을 건너뜁니다.")
+            return
+        
+        # 실패한 페이지를 결과 소진과 구분하도록 오류를 삼키지 않는 페이지 조회 사용
+        fetch_page = lambda start, display: self._shopping_page(query, display, sort, start=start)
+        async for page in iter_shopping_pages(fetch_page, **limits):
+            yield page
+    
+    def _plan(self, query: str, max_results: int) -> SearchPlan:
+        """질의 의도에 맞는 검색 계획"""
+        plan = plan_query(query, max_results) if settings.query_planner_enabled else default_plan(max_results)
+        SEARCH_PLANS.inc(1, plan.intent)
+        return plan
+    
+    async def iter_unified_naver_search(
+        self,
+        query: str,
+        max_results: int = 20,
+        plan: Optional[SearchPlan] = None
+    ) -> AsyncIterator[Tuple[str, List[SearchHit]]]:
+        """통합 네이버 검색 스트리밍
+        
+        계획된 엔드포인트를 병렬로 호출하고, 끝나는 순서대로 (엔드포인트, 새 결과 묶음)을
+        반환합니다. 묶음은 중복 제거와 정렬을 마친 결과이며 앞서 반환한 URL은 제외합니다.
+        최저가 탐색은 쇼핑 결과를 여러 페이지 수집하여 페이지마다 묶음으로 반환합니다.
+        """
+        plan = plan or self._plan(query, max_results)
+        if settings.naver_deep_fetch_enabled and plan.intent == PRICE and [step.endpoint for step in plan.endpoints] == ["shop"]:
+            # 최저가 탐색은 쇼핑 결과를 여러 페이지 수집하여 페이지 단위로 반환
             seen_urls = set()
+            async for page in self.iter_deep_search_shopping(query, plan.endpoints[0].sort):
+                batch = _rank_hits([hit for hit in page if hit.url and hit.url not in seen_urls], query, plan.intent)
+                seen_urls.update(hit.url for hit in batch)
+                if batch:
+                    yield "shop", batch
+            return
+        
+        endpoint_search = {
+            "webkr": self.search_web,
+            "news": self.search_news,
+            "blog": self.search_blog,
+            "shop": self.search_shopping
+        }
+        pending = {
+            asyncio.ensure_future(endpoint_search[step.endpoint](query, step.display, step.sort)): step.endpoint
+            for step in plan.endpoints
+        }
+        labels = dict(pending)
+        seen_urls = set()
+        
+        try:
+            with span("naver.unified", intent=plan.intent, endpoints=len(pending)):
+                while pending:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        del pending[task]
+                        if task.exception() is not None:
+                            logger.error(f"네이버 검색 중 오류: {task.exception()}")
+                            continue
+                        
+                        fresh = [hit for hit in task.result() if hit.url and hit.url not in seen_urls]
+                        batch = _rank_hits(fresh, query, plan.intent)
+                        seen_urls.update(hit.url for hit in batch)
+                        if batch:
+                            yield labels[task], batch
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def unified_naver_search(
+        self,
+        query: str,
+        max_results: int = 20,
+        on_batch: Optional[Callable[[str, List[SearchHit]], None]] = None
+    ) -> List[SearchHit]:
+        """통합 네이버 검색 (질의 의도에 맞는 엔드포인트만 호출)
+        
+        on_batch를 주면 엔드포인트 결과가 도착할 때마다 먼저 전달합니다.
+        """
+        all_results = []
+        plan = self._plan(query, max_results)
+        
+        try:
+            async for endpoint, batch in self.iter_unified_naver_search(query, max_results, plan):
+                all_results.extend(batch)
+                if on_batch is not None:
+                    on_batch(endpoint, batch)
             
-            for result in sorted(all_results, key=lambda x: x.get("score", 0), reverse=True):
-                url = result.get("url", "")
-                if url and url not in seen_urls:
-                    seen_urls.add(url)
-                    unique_results.append(result)
-            
-            return unique_results[:max_results]
+            # 전체 결과를 관련도로 다시 정렬하고 중복 제거 (같은 상품은 최저가 제안만 유지)
+            return _rank_hits(all_results, query, plan.intent)[:max_results]
             
         except Exception as e:
             logger.error(f"통합 네이버 검색 실패: {e}")
@@ -286,8 +361,23 @@ async def close_naver_client():
         _naver_client = None
 
 
+def _product_streamer(tool_name: str) -> Optional[Callable[[str, List[SearchHit]], None]]:
+    """그래프 custom 스트림으로 부분 상품 목록을 보내는 콜백 (그래프 밖이면 None)"""
+    try:
+        writer = get_stream_writer()
+    except Exception:
+        return None
+    
+    def stream(endpoint: str, batch: List[SearchHit]):
+        products = extract_products(to_dicts(batch))
+        if products:
+            writer({"type": "products", "tool_name": tool_name, "endpoint": endpoint, "products": products})
+    
+    return stream
+
+
 @tool
-async def naver_realtime_search(query: str) -> List[Dict[str, Any]]:
+async def naver_realtime_search(query: str, config: RunnableConfig = None) -> Union[Dict[str, Any], List]:
     """
     네이버 실시간 검색 도구
     
@@ -298,14 +388,20 @@ async def naver_realtime_search(query: str) -> List[Dict[str, Any]]:
         query: 검색할 키워드
     
     Returns:
-        네이버 통합 검색 결과 리스트
+        결과 핸들(result_id)과 네이버 통합 검색 결과 리스트 (결과가 없으면 빈 리스트)
     """
     try:
-        client = await get_naver_client()
-        results = await client.unified_naver_search(query)
+        # 첫 LLM 호출과 동시에 시작한 추측 검색 결과가 있으면 사용
+        results = await speculative_search.take(thread_id_from(config), query)
+        if results is None:
+            client = await get_naver_client()
+            # 먼저 끝난 엔드포인트의 상품은 느린 엔드포인트를 기다리지 않고 스트림으로 전송
+            results = await client.unified_naver_search(query, on_batch=_product_streamer("naver_realtime_search"))
         
         logger.info(f"네이버 실시간 검색 완료: {len(results)}개 결과")
-        return results
+        if not results:
+            return []
+        return register_results(config, to_dicts(results), query, "naver_realtime_search")
         
     except Exception as e:
         logger.error(f"네이버 실시간 검색 실패: {e}")
@@ -313,7 +409,46 @@ async def naver_realtime_search(query: str) -> List[Dict[str, Any]]:
 
 
 @tool
-async def naver_latest_product_search(query: str) -> List[Dict[str, Any]]:
+async def local_catalog_search(query: str, config: RunnableConfig = None) -> Union[Dict[str, Any], List]:
+    """
+    이전 검색 결과 카탈로그 검색 도구
+    
+    지금까지 검색한 상품/문서를 외부 API 호출 없이 바로 찾습니다. 후속 질문이나
+    반복 질문에 먼저 사용하세요. 로컬 결과가 부족하거나 오래되었으면 자동으로
+    네이버 실시간 검색 결과를 반환합니다.
+    
+    Args:
+        query: 검색할 키워드
+    
+    Returns:
+        결과 핸들(result_id), 출처(source: local_catalog 또는 naver_realtime)와 검색 결과 리스트
+        (결과가 없으면 빈 리스트)
+    """
+    try:
+        intent = classify_intent(query)
+        catalog = get_local_catalog()
+        lookup = catalog.lookup(query, intent) if catalog is not None else None
+        
+        if lookup is not None and lookup.fresh:
+            results, source = _rank_hits(lookup.hits, query, intent), "local_catalog"
+        else:
+            # 로컬 결과가 부족하거나 오래되면 실시간 검색
+            client = await get_naver_client()
+            results = await client.unified_naver_search(query, on_batch=_product_streamer("local_catalog_search"))
+            source = "naver_realtime"
+        
+        logger.info(f"카탈로그 검색 완료 ({source}, 로컬 판정: {lookup.reason if lookup else 'disabled'}): {len(results)}개 결과")
+        if not results:
+            return []
+        return {**register_results(config, to_dicts(results), query, "local_catalog_search"), "source": source}
+        
+    except Exception as e:
+        logger.error(f"카탈로그 검색 실패: {e}")
+        return []
+
+
+@tool
+async def naver_latest_product_search(query: str, config: RunnableConfig = None) -> Union[Dict[str, Any], List]:
     """
     네이버 최신 제품 정보 검색 도구
     
@@ -323,7 +458,7 @@ async def naver_latest_product_search(query: str) -> List[Dict[str, Any]]:
         query: 제품명 (예: "맥북 프로 M4", "아이폰 15 프로")
     
     Returns:
-        네이버 최신 제품 정보 검색 결과
+        결과 핸들(result_id)과 네이버 최신 제품 정보 검색 결과 (결과가 없으면 빈 리스트)
     """
     try:
         # 제품 검색에 최적화된 쿼리 추가
@@ -335,8 +470,8 @@ async def naver_latest_product_search(query: str) -> List[Dict[str, Any]]:
         # 제품 정보에 특화된 필터링
         product_results = []
         for result in results:
-            title = result.get("title", "").lower()
-            content = result.get("content", "").lower()
+            title = result.title.lower()
+            content = result.content.lower()
             
             # 제품 정보 관련 키워드 확인
             if any(keyword in title or keyword in content for keyword in 
@@ -344,7 +479,10 @@ async def naver_latest_product_search(query: str) -> List[Dict[str, Any]]:
                 product_results.append(result)
         
         logger.info(f"네이버 최신 제품 검색 완료: {len(product_results)}개 결과")
-        return product_results[:10]  # 상위 10개 결과만 반환
+        if not product_results:
+            return []
+        # 상위 10개 결과만 반환
+        return register_results(config, to_dicts(product_results[:10]), query, "naver_latest_product_search")
         
     except Exception as e:
         logger.error(f"네이버 최신 제품 검색 실패: {e}")
@@ -369,7 +507,7 @@ async def naver_news_search_tool(query: str) -> List[Dict[str, Any]]:
         results = await client.search_news(query, display=10, sort="date")
         
         logger.info(f"네이버 뉴스 검색 완료: {len(results)}개 결과")
-        return results
+        return to_dicts(results)
         
     except Exception as e:
         logger.error(f"네이버 뉴스 검색 실패: {e}")
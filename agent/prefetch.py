@@ -0,0 +1,268 @@
+"""
+인기 검색어 캐시 사전 갱신 모듈
+
+검색 계층이 캐시 키마다 조회 빈도를 기록하면, 백그라운드 asyncio 작업이 주기적으로
+인기 상위 항목 중 곧 만료될 항목을 미리 갱신합니다. 만료된 항목은 유예 시간 동안
+이전 값을 바로 반환하고 백그라운드에서 갱신합니다(stale-while-revalidate).
+갱신 호출은 네이버 호출 한도를 대화형 요청과 같은 토큰 버킷으로 공유하되,
+버킷에 여유가 있고 대화형 요청이 대기 중이 아닐 때만 토큰을 사용합니다.
+"""
+
+import asyncio
+import math
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from config import settings
+from agent.metrics import registry
+from agent.search_cache import SearchCache
+import logging
+
+logger = logging.getLogger(__name__)
+
+Refresher = Callable[[], Awaitable[Any]]
+
+
+class RateLimiter:
+    """토큰 버킷 호출 한도"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """초당 rate회, 최대 burst회까지 몰아서 호출 가능"""
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.waiting = 0
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """대화형 호출용 토큰 획득 (부족하면 대기)"""
+        self.waiting += 1
+        try:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+        finally:
+            self.waiting -= 1
+
+    def try_acquire(self, reserve: float = 0.0) -> bool:
+        """백그라운드 호출용 토큰 획득 (reserve 비율만큼은 대화형 요청 몫으로 남김)"""
+        if self.waiting:
+            return False
+        self._refill()
+        if self._tokens - 1 >= self.burst * reserve:
+            self._tokens -= 1
+            return True
+        return False
+
+
+class PopularityTracker:
+    """지수 감쇠 조회 빈도"""
+
+    def __init__(self, half_life: float = 3600.0, max_entries: int = 1000):
+        self.half_life = half_life
+        self.max_entries = max_entries
+        self._scores: Dict[Any, Tuple[float, float]] = {}
+
+    def _decayed(self, score: float, updated: float, now: float) -> float:
+        return score * math.exp(-math.log(2) * (now - updated) / self.half_life)
+
+    def hit(self, key: Any, now: Optional[float] = None):
+        """조회 기록"""
+        now = now or time.time()
+        score, updated = self._scores.get(key, (0.0, now))
+        self._scores[key] = (self._decayed(score, updated, now) + 1.0, now)
+
+        if len(self._scores) > self.max_entries:
+            self._prune(now)
+
+    def _prune(self, now: float):
+        """점수가 낮은 절반 제거"""
+        ranked = self.top(self.max_entries // 2, now)
+        self._scores = {key: self._scores[key] for key, _ in ranked}
+
+    def top(self, n: int, now: Optional[float] = None) -> List[Tuple[Any, float]]:
+        """인기 상위 n개 (키, 현재 점수)"""
+        now = now or time.time()
+        scored = [(key, self._decayed(score, updated, now)) for key, (score, updated) in self._scores.items()]
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:n]
+
+    def discard(self, key: Any):
+        self._scores.pop(key, None)
+
+
+class CachePrefetcher:
+    """인기 캐시 항목 백그라운드 갱신기"""
+
+    def __init__(
+        self,
+        interval: float,
+        top_n: int,
+        refresh_ahead: float,
+        reserve: float = 0.5,
+        min_score: float = 2.0,
+        enabled: bool = True
+    ):
+        """갱신기 초기화
+
+        min_score 미만(한 번만 조회된) 항목은 갱신하지 않으며, reserve는
+        토큰 버킷에서 대화형 요청 몫으로 남겨 둘 비율입니다.
+        """
+        self.interval = interval
+        self.top_n = top_n
+        self.refresh_ahead = refresh_ahead
+        self.reserve = reserve
+        self.min_score = min_score
+        self.enabled = enabled
+
+        self.popularity = PopularityTracker()
+        self._targets: Dict[Tuple[str, str], Tuple[SearchCache, Refresher, Optional[RateLimiter]]] = {}
+        self._in_flight: set = set()
+        self._background: set = set()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.refreshed = 0
+        self.revalidated = 0
+        self.skipped_rate_limit = 0
+        self.failed = 0
+
+    def track(self, cache: SearchCache, key: str, refresh: Refresher, limiter: Optional[RateLimiter] = None):
+        """검색 계층의 캐시 조회 기록 (갱신 함수와 적용할 호출 한도 등록)"""
+        if not self.enabled:
+            return
+
+        target = (cache.namespace, key)
+        self._targets[target] = (cache, refresh, limiter)
+        self.popularity.hit(target)
+        if len(self._targets) > self.popularity.max_entries * 2:
+            self._targets = {t: self._targets[t] for t, _ in self.popularity.top(self.popularity.max_entries)}
+        self._ensure_started()
+
+    def revalidate(self, cache: SearchCache, key: str, refresh: Refresher, limiter: Optional[RateLimiter] = None):
+        """만료된 항목을 백그라운드에서 즉시 갱신 (stale-while-revalidate)"""
+        if not self.enabled or self._loop_running() is None:
+            return
+        target = (cache.namespace, key)
+        if target in self._in_flight:
+            return
+        if limiter is not None and not limiter.try_acquire(self.reserve):
+            self.skipped_rate_limit += 1
+            return
+        self.revalidated += 1
+        self._in_flight.add(target)
+        task = asyncio.get_running_loop().create_task(self._refresh(target, refresh))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    @staticmethod
+    def _loop_running() -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    def _ensure_started(self):
+        """현재 이벤트 루프에서 갱신 작업 시작 (루프가 바뀌면 재시작)"""
+        loop = self._loop_running()
+        if loop is None:
+            return
+        if self._task is not None and not self._task.done() and self._loop is loop:
+            return
+        self._loop = loop
+        self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.tick()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"캐시 사전 갱신 실패: {e}")
+
+    async def tick(self, now: Optional[float] = None):
+        """인기 상위 항목 중 곧 만료될 항목 갱신"""
+        now = now or time.time()
+
+        for target, score in self.popularity.top(self.top_n, now):
+            if score < self.min_score:
+                break
+
+            entry = self._targets.get(target)
+            if entry is None or target in self._in_flight:
+                continue
+
+            cache, refresh, limiter = entry
+            expires_at = cache.expires_at(target[1])
+            if expires_at is not None and expires_at - now > self.refresh_ahead:
+                continue
+
+            if limiter is not None and not limiter.try_acquire(self.reserve):
+                # 대화형 요청에 양보하고 다음 주기에 재시도
+                self.skipped_rate_limit += 1
+                break
+
+            await self._refresh(target, refresh)
+
+    async def _refresh(self, target: Tuple[str, str], refresh: Refresher):
+        self._in_flight.add(target)
+        try:
+            await refresh()
+            self.refreshed += 1
+        except Exception as e:
+            self.failed += 1
+            logger.debug(f"캐시 항목 갱신 실패 {target}: {e}")
+        finally:
+            self._in_flight.discard(target)
+
+    def stop(self):
+        """갱신 작업 중지"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """갱신기 통계"""
+        return {
+            "enabled": self.enabled,
+            "tracked": len(self._targets),
+            "refreshed": self.refreshed,
+            "revalidated": self.revalidated,
+            "skipped_rate_limit": self.skipped_rate_limit,
+            "failed": self.failed,
+            "top": [{"namespace": ns, "score": round(score, 2)} for (ns, _), score in self.popularity.top(5)]
+        }
+
+
+# 네이버 API 공용 호출 한도와 전역 갱신기
+naver_rate_limiter = RateLimiter(settings.naver_rate_limit)
+
+prefetcher = CachePrefetcher(
+    interval=settings.prefetch_interval,
+    top_n=settings.prefetch_top_n,
+    refresh_ahead=settings.prefetch_refresh_ahead,
+    enabled=settings.prefetch_enabled
+)
+
+
+def _render_prefetch_metrics() -> List[str]:
+    """사전 갱신 메트릭 (스크레이프 시점 수집)"""
+    return [
+        "# TYPE cache_prefetch_total counter",
+        f'cache_prefetch_total{{result="refreshed"}} {prefetcher.refreshed}',
+        f'cache_prefetch_total{{result="revalidated"}} {prefetcher.revalidated}',
+        f'cache_prefetch_total{{result="rate_limited"}} {prefetcher.skipped_rate_limit}',
+        f'cache_prefetch_total{{result="failed"}} {prefetcher.failed}'
+    ]
+
+
+registry.register_collector(_render_prefetch_metrics)
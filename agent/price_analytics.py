@@ -0,0 +1,257 @@
+"""
+컬럼 기반 상품 가격 분석 모듈
+
+검색 결과(딕셔너리 리스트)를 한 번만 순회하여 가격/평점/리뷰 수를 NumPy 배열로,
+카테고리를 정수 코드로 변환한 ProductBatch를 만들고, 통계와 다중 조건 필터링을
+벡터 연산으로 처리합니다. 같은 검색 결과에 대해 compare_prices와 filter_products가
+연달아 호출되므로 변환된 배치는 결과 핸들(또는 같은 목록 객체) 단위로 작은 LRU
+캐시에 보관해 재사용합니다. 캐시 키는 상품 내용을 순회하지 않고 만듭니다.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+import numpy as np
+from agent.product_events import parse_price
+
+# 캐시할 배치 수
+BATCH_CACHE_SIZE = 32
+
+PERCENTILES = (25, 50, 75, 90)
+
+
+def _parse_float(value: Any) -> float:
+    """평점 등 실수 값 변환 (없거나 잘못된 값은 NaN)"""
+    if value is None or value == "":
+        return np.nan
+    if isinstance(value, float):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class ProductBatch:
+    """상품 목록의 컬럼 기반 표현"""
+
+    __slots__ = ("products", "price", "rating", "review_count", "category_codes", "categories", "_category_index")
+
+    def __init__(
+        self,
+        products: Sequence[Dict[str, Any]],
+        price: np.ndarray,
+        rating: np.ndarray,
+        review_count: np.ndarray,
+        category_codes: np.ndarray,
+        categories: List[str]
+    ):
+        self.products = products
+        self.price = price
+        self.rating = rating
+        self.review_count = review_count
+        self.category_codes = category_codes
+        self.categories = categories
+        self._category_index = {name: code for code, name in enumerate(categories)}
+
+    @classmethod
+    def from_products(cls, products: Sequence[Dict[str, Any]]) -> "ProductBatch":
+        """딕셔너리 리스트를 한 번 순회하여 배치 생성
+
+        가격은 price(정수) 또는 네이버 lprice(문자열) 중 있는 값을 사용하며,
+        가격이 없으면 NaN으로 표시합니다. 카테고리는 대소문자 구분 없이 코드화합니다.
+        """
+        prices: List[float] = []
+        ratings: List[float] = []
+        reviews: List[int] = []
+        codes: List[int] = []
+        categories: List[str] = []
+        category_index: Dict[str, int] = {}
+        nan = np.nan
+
+        for product in products:
+            parsed = parse_price(product.get("price", product.get("lprice")))
+            prices.append(nan if parsed is None else parsed)
+            ratings.append(_parse_float(product.get("rating")))
+            reviews.append(parse_price(product.get("review_count")) or 0)
+
+            category = str(product.get("category") or "").lower()
+            code = category_index.get(category)
+            if code is None:
+                code = category_index[category] = len(categories)
+                categories.append(category)
+            codes.append(code)
+
+        price = np.array(prices, dtype=np.float64)
+        rating = np.array(ratings, dtype=np.float64)
+        review_count = np.array(reviews, dtype=np.int64)
+        category_codes = np.array(codes, dtype=np.int32)
+
+        return cls(products, price, rating, review_count, category_codes, categories)
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def take(self, indices: np.ndarray) -> List[Dict[str, Any]]:
+        """인덱스 배열에 해당하는 원본 상품 목록"""
+        products = self.products
+        return [products[i] for i in indices.tolist()]
+
+    def price_stats(self) -> Optional[Dict[str, Any]]:
+        """가격 통계 (가격이 있는 상품이 없으면 None)"""
+        prices = self.price[~np.isnan(self.price)]
+        if prices.size == 0:
+            return None
+
+        low, high = prices.min(), prices.max()
+        percentiles = np.percentile(prices, PERCENTILES)
+        return {
+            "priced_products": int(prices.size),
+            "min_price": int(low),
+            "max_price": int(high),
+            "avg_price": int(prices.sum() // prices.size),
+            "price_range": int(high - low),
+            "price_percentiles": {f"p{q}": int(value) for q, value in zip(PERCENTILES, percentiles)}
+        }
+
+    def cheapest_index(self) -> int:
+        """최저가 상품 인덱스"""
+        return int(np.nanargmin(self.price))
+
+    def best_value_index(self) -> int:
+        """가격 대비 평점이 가장 높은 상품 인덱스 (평점이 없으면 0으로 취급)"""
+        rating = np.nan_to_num(self.rating, nan=0.0)
+        score = rating * 100 / np.maximum(self.price, 1)
+        score[np.isnan(score)] = -np.inf
+        return int(np.argmax(score))
+
+    def filter_mask(
+        self,
+        max_price: Optional[float] = None,
+        min_price: Optional[float] = None,
+        min_rating: Optional[float] = None,
+        min_reviews: Optional[int] = None,
+        category: Optional[str] = None
+    ) -> np.ndarray:
+        """다중 조건 필터 마스크 (가격 조건이 있으면 가격 정보가 없는 상품은 제외)"""
+        mask = np.ones(len(self.products), dtype=bool)
+
+        # NaN 비교는 False이므로 가격 없는 상품은 가격 조건을 통과하지 않음
+        if max_price:
+            mask &= self.price <= max_price
+        if min_price:
+            mask &= self.price >= min_price
+        if min_rating:
+            mask &= self.rating >= min_rating
+        if min_reviews:
+            mask &= self.review_count >= min_reviews
+        if category:
+            code = self._category_index.get(category.lower())
+            if code is None:
+                mask[:] = False
+            else:
+                mask &= self.category_codes == code
+
+        return mask
+
+    def filter(self, **conditions: Any) -> List[Dict[str, Any]]:
+        """조건에 맞는 원본 상품 목록"""
+        return self.take(np.flatnonzero(self.filter_mask(**conditions)))
+
+    def sort_indices(self, indices: np.ndarray, sort_by: Optional[str]) -> np.ndarray:
+        """인덱스 정렬 (price | -price | rating | reviews, 값이 없는 상품은 뒤로)"""
+        if sort_by == "price":
+            key = np.where(np.isnan(self.price), np.inf, self.price)
+        elif sort_by == "-price":
+            key = np.where(np.isnan(self.price), np.inf, -self.price)
+        elif sort_by == "rating":
+            key = np.where(np.isnan(self.rating), np.inf, -self.rating)
+        elif sort_by == "reviews":
+            key = -self.review_count
+        else:
+            return indices
+        return indices[np.argsort(key[indices], kind="stable")]
+
+
+class _BatchCache:
+    """최근 생성한 ProductBatch LRU 캐시
+
+    key(결과 핸들 등)가 주어지면 그 키로, 없으면 목록 객체의 id로 찾습니다. id로 찾은
+    배치는 원본 목록과 같은 객체인지 확인하므로 해제된 목록의 id가 재사용되어도
+    다른 목록의 배치를 반환하지 않습니다.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, ProductBatch]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, products: Sequence[Dict[str, Any]], key: Optional[Hashable] = None) -> ProductBatch:
+        cache_key = ("key", key) if key is not None else ("id", id(products))
+        with self._lock:
+            batch = self._entries.get(cache_key)
+            if batch is not None and len(batch) == len(products) and (key is not None or batch.products is products):
+                self._entries.move_to_end(cache_key)
+                return batch
+
+        batch = ProductBatch.from_products(products)
+        with self._lock:
+            self._entries[cache_key] = batch
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return batch
+
+
+_batch_cache = _BatchCache(BATCH_CACHE_SIZE)
+
+
+def get_product_batch(products: Sequence[Dict[str, Any]], key: Optional[Hashable] = None) -> ProductBatch:
+    """상품 목록의 배치 (같은 결과 핸들 key나 같은 목록 객체는 캐시된 배치 재사용)"""
+    return _batch_cache.get_or_build(products, key)
+
+
+def analyze_prices(products: Sequence[Dict[str, Any]], key: Optional[Hashable] = None) -> Dict[str, Any]:
+    """가격 비교 분석 결과 (compare_prices 도구 본문, key는 배치 캐시 키)"""
+    if not products:
+        return {"error": "비교할 상품이 없습니다."}
+
+    batch = get_product_batch(products, key)
+    stats = batch.price_stats()
+    if stats is None:
+        return {"error": "가격 정보가 있는 상품이 없습니다.", "total_products": len(batch)}
+
+    return {
+        "total_products": len(batch),
+        **stats,
+        "recommended_product": batch.products[batch.cheapest_index()],
+        "best_value": batch.products[batch.best_value_index()]
+    }
+
+
+def filter_product_list(
+    products: Sequence[Dict[str, Any]],
+    max_price: Optional[int] = None,
+    min_rating: Optional[float] = None,
+    category: Optional[str] = None,
+    min_price: Optional[int] = None,
+    min_reviews: Optional[int] = None,
+    sort_by: Optional[str] = None,
+    limit: Optional[int] = None,
+    key: Optional[Hashable] = None
+) -> List[Dict[str, Any]]:
+    """상품 필터링/정렬 결과 (filter_products 도구 본문, key는 배치 캐시 키)"""
+    if not products:
+        return []
+
+    batch = get_product_batch(products, key)
+    indices = np.flatnonzero(batch.filter_mask(
+        max_price=max_price,
+        min_price=min_price,
+        min_rating=min_rating,
+        min_reviews=min_reviews,
+        category=category
+    ))
+    indices = batch.sort_indices(indices, sort_by)
+    if limit:
+        indices = indices[:limit]
+    return batch.take(indices)
@@ -0,0 +1,242 @@
+"""
+상품 가격 이력 저장소
+
+search_shopping 결과를 상품 묶음 키(cluster_key) 단위로 로컬 SQLite에 추가 전용으로
+기록합니다. 쓰기는 메모리 버퍼에 모았다가 백그라운드 스레드가 한 트랜잭션으로
+일괄 저장하고, 조회는 (cluster_key, observed_at) 인덱스 범위 안에서 SQL로 집계하므로
+"지금 가격이 싼가"를 외부 검색 없이 수 밀리초 안에 답할 수 있습니다.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from config import settings
+from agent.models import Product
+from agent.product_matching import cluster_key
+import logging
+
+logger = logging.getLogger(__name__)
+
+DAY_SECONDS = 86400
+
+# (cluster_key, price, mall, title, observed_at)
+Row = Tuple[str, int, str, str, float]
+
+
+class PriceHistoryStore:
+    """추가 전용 가격 이력 저장소"""
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = 2.0,
+        batch_size: int = 500,
+        dedupe_window: float = 3600.0
+    ):
+        """저장소 초기화
+
+        같은 상품/판매처/가격 관측은 dedupe_window 안에서 한 번만 기록하여,
+        캐시된 검색 결과가 반복 기록되어 통계가 왜곡되지 않게 합니다.
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.dedupe_window = dedupe_window
+        self.written = 0
+
+        self._pending: List[Row] = []
+        self._last_seen: Dict[Tuple[str, str, int], float] = {}
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._conn = self._open(path)
+
+        self._thread = threading.Thread(target=self._run, name="price-history-writer", daemon=True)
+        self._thread.start()
+
+    def _open(self, path: str) -> sqlite3.Connection:
+        """SQLite 연결 및 스키마 생성"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS price_history ("
+            "cluster_key TEXT NOT NULL, "
+            "price INTEGER NOT NULL, "
+            "mall TEXT NOT NULL, "
+            "title TEXT NOT NULL, "
+            "observed_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_price_history_cluster "
+            "ON price_history (cluster_key, observed_at)"
+        )
+        return conn
+
+    def record(self, products: Iterable[Product], observed_at: Optional[float] = None):
+        """검색 결과 가격 기록 (버퍼에 추가, 저장은 백그라운드)"""
+        now = observed_at or time.time()
+        rows = []
+
+        with self._lock:
+            for product in products:
+                if product.price is None:
+                    continue
+                key = cluster_key(product.title)
+                dedupe_key = (key, product.mall, product.price)
+                last = self._last_seen.get(dedupe_key)
+                if last is not None and now - last < self.dedupe_window:
+                    continue
+                self._last_seen[dedupe_key] = now
+                rows.append((key, product.price, product.mall, product.title, now))
+
+            self._pending.extend(rows)
+            full = len(self._pending) >= self.batch_size
+
+        if full:
+            self._wakeup.set()
+
+    def _run(self):
+        """주기적으로 버퍼 일괄 저장"""
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"가격 이력 저장 실패: {e}")
+
+    def flush(self):
+        """버퍼의 관측값을 한 트랜잭션으로 저장"""
+        with self._lock:
+            rows, self._pending = self._pending, []
+            self._prune_dedupe(time.time())
+
+        if not rows:
+            return
+
+        with self._db_lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO price_history (cluster_key, price, mall, title, observed_at) VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                with self._lock:
+                    self._pending[:0] = rows
+                raise
+        self.written += len(rows)
+
+    def _prune_dedupe(self, now: float):
+        """오래된 중복 방지 항목 정리 (호출자가 _lock 보유)"""
+        if len(self._last_seen) > 10000:
+            self._last_seen = {
+                key: seen for key, seen in self._last_seen.items()
+                if now - seen < self.dedupe_window
+            }
+
+    def lookup(self, title: str, days: int = 30) -> Dict[str, Any]:
+        """최근 days일 상품 가격 통계 (최저/중앙값/기간 최저가/최근 가격)
+
+        아직 저장되지 않은 관측값은 먼저 저장한 뒤, (cluster_key, observed_at) 인덱스
+        범위 안에서 SQL로 집계하므로 이력이 쌓여도 행 전체를 읽지 않습니다.
+        """
+        key = cluster_key(title)
+        since = time.time() - days * DAY_SECONDS
+        window = (key, since)
+        self.flush()
+
+        with self._db_lock:
+            count, first_seen, last_seen = self._conn.execute(
+                "SELECT COUNT(*), MIN(observed_at), MAX(observed_at) FROM price_history "
+                "WHERE cluster_key = ? AND observed_at >= ?",
+                window
+            ).fetchone()
+            if not count:
+                return {"cluster_key": key, "count": 0}
+
+            low_price, low_mall = self._conn.execute(
+                "SELECT price, mall FROM price_history WHERE cluster_key = ? AND observed_at >= ? "
+                "ORDER BY price, observed_at DESC LIMIT 1",
+                window
+            ).fetchone()
+            latest_price = self._conn.execute(
+                "SELECT price FROM price_history WHERE cluster_key = ? AND observed_at >= ? "
+                "ORDER BY observed_at DESC LIMIT 1",
+                window
+            ).fetchone()[0]
+            median_price = self._conn.execute(
+                "SELECT AVG(price) FROM (SELECT price FROM price_history WHERE cluster_key = ? AND observed_at >= ? "
+                "ORDER BY price LIMIT ? OFFSET ?)",
+                (*window, 2 - count % 2, (count - 1) // 2)
+            ).fetchone()[0]
+
+        return {
+            "cluster_key": key,
+            "count": count,
+            "min_price": low_price,
+            "median_price": int(median_price),
+            f"low_{days}d": low_price,
+            f"low_{days}d_mall": low_mall,
+            "latest_price": latest_price,
+            "first_seen": first_seen,
+            "last_seen": last_seen
+        }
+
+    def assess(self, title: str, current_price: Optional[int] = None, days: int = 30) -> Dict[str, Any]:
+        """현재 가격이 이력 대비 좋은 가격인지 평가"""
+        stats = self.lookup(title, days)
+        if not stats["count"]:
+            stats["assessment"] = "가격 이력이 없습니다"
+            return stats
+
+        price = current_price if current_price is not None else stats["latest_price"]
+        low = stats[f"low_{days}d"] or stats["min_price"]
+        median = stats["median_price"]
+
+        if price <= low:
+            verdict = f"최근 {days}일 최저가 수준입니다"
+        elif price <= median:
+            verdict = "이력 중앙값보다 저렴한 편입니다"
+        else:
+            verdict = f"이력 중앙값({median:,}원)보다 비쌉니다"
+
+        stats["current_price"] = price
+        stats["assessment"] = verdict
+        return stats
+
+    def stats(self) -> Dict[str, Any]:
+        """저장소 통계"""
+        return {"path": self.path, "written": self.written, "pending": len(self._pending)}
+
+
+_store: Optional[PriceHistoryStore] = None
+_store_lock = threading.Lock()
+
+
+def get_price_history() -> Optional[PriceHistoryStore]:
+    """가격 이력 저장소 싱글톤 접근 (열 수 없으면 None)"""
+    global _store
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                try:
+                    _store = PriceHistoryStore(
+                        settings.price_history_db_path,
+                        flush_interval=settings.price_history_flush_interval
+                    )
+                except Exception as e:
+                    logger.warning(f"가격 이력 저장소를 열 수 없음: {e}")
+                    return None
+
+    return _store
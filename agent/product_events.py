@@ -0,0 +1,71 @@
+"""
+도구 결과에서 상품 정보 추출
+
+쇼핑 검색 도구의 결과(ToolMessage)를 LLM 응답과 별개로 클라이언트에 바로 보낼 수 있도록
+간결한 상품 스키마(title, price, mall, brand, url)로 변환합니다.
+"""
+
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+# 상품 이벤트 하나에 담을 최대 상품 수
+MAX_PRODUCTS_PER_EVENT = 10
+
+
+def parse_price(value: Any) -> Optional[int]:
+    """가격 값을 정수로 변환 (네이버 lprice는 문자열)"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        pass
+
+    digits = "".join(ch for ch in str(value) if ch.isdigit())
+    return int(digits) if digits else None
+
+
+def to_compact_product(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """상품 딕셔너리를 간결한 스키마로 변환 (가격 정보가 없으면 None)"""
+    price = parse_price(item.get("price", item.get("lprice")))
+    if price is None:
+        return None
+
+    return {
+        "title": item.get("title") or item.get("name") or "",
+        "price": price,
+        "mall": item.get("mallName") or item.get("mall") or item.get("seller") or "",
+        "brand": item.get("brand") or "",
+        "url": item.get("url") or item.get("product_url") or item.get("link") or ""
+    }
+
+
+def _iter_items(payload: Any) -> Iterable[Dict[str, Any]]:
+    """도구 결과에서 상품 후보 딕셔너리 반복 (리스트 또는 {"results": [...]} 형태)"""
+    if isinstance(payload, dict):
+        payload = payload.get("results", [])
+    if isinstance(payload, list):
+        for item in payload:
+            if isinstance(item, dict):
+                yield item
+
+
+def extract_products(content: Any, limit: int = MAX_PRODUCTS_PER_EVENT) -> List[Dict[str, Any]]:
+    """ToolMessage 내용에서 상품 목록 추출"""
+    if isinstance(content, str):
+        try:
+            content = json.loads(content)
+        except (json.JSONDecodeError, ValueError):
+            return []
+
+    products = []
+    for item in _iter_items(content):
+        product = to_compact_product(item)
+        if product is not None:
+            products.append(product)
+            if len(products) >= limit:
+                break
+    return products
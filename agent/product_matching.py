@@ -0,0 +1,297 @@
+"""
+상품 매칭(엔티티 해석) 모듈
+
+여러 쇼핑몰이 올린 같은 상품, 네이버와 Exa가 함께 찾은 같은 결과를 하나로 묶습니다.
+제목을 정규화(강조 태그 제거, 한/영 표기 통일, 모델 번호 분리)한 뒤 블로킹 키
+(모델 번호와 희귀 토큰 접두사)를 공유하는 후보끼리만 비교하므로 전체 비교 없이
+거의 선형 시간에 동작합니다. 상품 묶음에서는 최저가 제안을 대표로 남깁니다.
+"""
+
+import copy
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+from agent.models import Product, SearchHit
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_RAW_TOKEN_RE = re.compile(r"[0-9a-z가-힣]+(?:[-/][0-9a-z]+)*")
+_ALNUM_BOUNDARY_RE = re.compile(r"(?<=[a-z가-힣])(?=\d)|(?<=\d)(?=[a-z가-힣])")
+_UNIT_RE = re.compile(r"^\d+(?:gb|tb|mb|mm|cm|ml|kg|g|w|hz|mah|인치|형|세대)$")
+
+# 한글 표기 → 영문 표기 통일
+_VARIANTS = {
+    "애플": "apple", "삼성": "samsung", "삼성전자": "samsung", "엘지": "lg", "소니": "sony",
+    "아이폰": "iphone", "아이패드": "ipad", "맥북": "macbook", "에어팟": "airpods", "애플워치": "applewatch",
+    "갤럭시": "galaxy", "버즈": "buds", "탭": "tab", "워치": "watch", "노트북": "laptop",
+    "프로": "pro", "맥스": "max", "미니": "mini", "울트라": "ultra", "플러스": "plus", "에어": "air",
+    "블랙": "black", "화이트": "white", "실버": "silver", "그레이": "gray", "스페이스그레이": "spacegray",
+    "블루": "blue", "핑크": "pink", "그린": "green", "퍼플": "purple", "골드": "gold",
+    "기가": "gb", "테라": "tb"
+}
+
+# 제목에 붙었다 빠졌다 하는 브랜드명 (묶음 키에서 제외)
+_BRAND_TOKENS = frozenset({"apple", "samsung", "lg", "sony"})
+
+# 매칭에 의미 없는 판매 문구
+_STOPWORDS = frozenset({
+    "정품", "새상품", "공식", "공식판매처", "무료배송", "당일발송", "당일출고", "국내", "국내정품",
+    "병행수입", "자급제", "특가", "할인", "최신형", "신제품", "정식", "발송", "배송", "the", "and", "new"
+})
+
+
+def _is_model_code(token: str) -> bool:
+    """모델 번호 여부 (예: sm-s928n, mtjv3kh/a, wh-1000xm5, a2894)"""
+    if len(token) < 5 or _UNIT_RE.match(token):
+        return False
+    has_alpha = any("a" <= ch <= "z" for ch in token)
+    digits = sum(ch.isdigit() for ch in token)
+    if not has_alpha or not digits:
+        return False
+    return digits >= 3 or "-" in token or "/" in token
+
+
+class NormalizedTitle:
+    """정규화된 제목 (이름 토큰, 숫자 사양 토큰, 모델 번호)"""
+
+    __slots__ = ("tokens", "specs", "models")
+
+    def __init__(self, tokens: FrozenSet[str], specs: FrozenSet[str], models: FrozenSet[str]):
+        self.tokens = tokens
+        self.specs = specs
+        self.models = models
+
+    def key(self) -> str:
+        """검색 간에 안정적인 묶음 키"""
+        if self.models:
+            return "m:" + min(self.models)
+        tokens = sorted(self.tokens - _BRAND_TOKENS) or sorted(self.tokens)
+        return "t:" + " ".join(tokens) + "|" + " ".join(sorted(self.specs))
+
+
+def normalize_title(title: str) -> NormalizedTitle:
+    """제목 정규화"""
+    text = unicodedata.normalize("NFKC", _TAG_RE.sub(" ", title)).lower()
+
+    tokens: Set[str] = set()
+    specs: Set[str] = set()
+    models: Set[str] = set()
+
+    for raw in _RAW_TOKEN_RE.findall(text):
+        if _is_model_code(raw):
+            models.add(raw.replace("-", "").replace("/", ""))
+            continue
+
+        for part in _ALNUM_BOUNDARY_RE.sub(" ", raw.replace("-", " ").replace("/", " ")).split():
+            part = _VARIANTS.get(part, part)
+            if part in _STOPWORDS:
+                continue
+            if part[0].isdigit():
+                specs.add(part)
+            else:
+                tokens.add(part)
+
+    # 용량 단위는 숫자 사양 토큰으로 이미 구분되므로 이름 토큰에서 제외
+    for unit in ("gb", "tb"):
+        if unit in tokens:
+            tokens.discard(unit)
+
+    return NormalizedTitle(frozenset(tokens), frozenset(specs), frozenset(models))
+
+
+class _UnionFind:
+    """묶음 병합용 Union-Find"""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, a: int, b: int):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            # 앞선(점수가 높은) 항목을 루트로 유지
+            if root_a < root_b:
+                self.parent[root_b] = root_a
+            else:
+                self.parent[root_a] = root_b
+
+
+class ProductMatcher:
+    """블로킹 기반 상품 매칭 인덱스"""
+
+    def __init__(self, threshold: float = 0.6, max_block_size: int = 64, window: int = 16):
+        """매처 초기화
+
+        threshold는 이름 토큰 Jaccard 유사도 하한입니다. max_block_size보다 큰 블록
+        (여러 쇼핑몰의 같은 상품, 너무 흔한 토큰)은 묶음 키로 정렬한 뒤 앞뒤 window개
+        이웃끼리만 비교하므로 최악의 경우에도 제곱 시간으로 커지지 않습니다.
+        """
+        self.threshold = threshold
+        self.max_block_size = max_block_size
+        self.window = window
+
+    def _prefix_size(self, token_count: int) -> int:
+        """Jaccard >= threshold인 쌍이 반드시 하나 이상 공유하는 희귀 토큰 접두사 길이"""
+        return token_count - math.ceil(self.threshold * token_count) + 1
+
+    def _blocking_keys(self, titles: Sequence[NormalizedTitle]) -> Dict[Tuple[str, str], List[int]]:
+        """블로킹 키 → 항목 인덱스 목록"""
+        frequency: Dict[str, int] = defaultdict(int)
+        for title in titles:
+            for token in title.tokens:
+                frequency[token] += 1
+
+        blocks: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        for i, title in enumerate(titles):
+            for model in title.models:
+                blocks[("m", model)].append(i)
+
+            ordered = sorted(title.tokens, key=lambda token: (frequency[token], token))
+            for token in ordered[:self._prefix_size(len(ordered))]:
+                blocks[("t", token)].append(i)
+
+        return blocks
+
+    def is_match(self, a: NormalizedTitle, b: NormalizedTitle, brand_a: str = "", brand_b: str = "") -> bool:
+        """두 제목이 같은 상품인지 판정"""
+        if brand_a and brand_b and brand_a != brand_b:
+            return False
+        if a.models and b.models:
+            return not a.models.isdisjoint(b.models)
+        if a.specs != b.specs:
+            # 용량/세대 등 숫자 사양이 다르면 다른 상품
+            return False
+        if not a.tokens or not b.tokens:
+            return False
+        intersection = len(a.tokens & b.tokens)
+        return intersection / (len(a.tokens) + len(b.tokens) - intersection) >= self.threshold
+
+    def cluster(self, titles: Sequence[NormalizedTitle], brands: Optional[Sequence[str]] = None) -> List[List[int]]:
+        """항목을 같은 상품끼리 묶은 인덱스 목록 (입력 순서 유지)"""
+        brands = brands or [""] * len(titles)
+        union_find = _UnionFind(len(titles))
+        sort_keys: Optional[List[Tuple[str, str]]] = None
+
+        for members in self._blocking_keys(titles).values():
+            if len(members) < 2:
+                continue
+            if len(members) > self.max_block_size:
+                # 큰 블록은 정렬 이웃 방식으로 분할 (같은 키의 항목은 인접하게 모임)
+                if sort_keys is None:
+                    sort_keys = [(brand, title.key()) for brand, title in zip(brands, titles)]
+                members = sorted(members, key=sort_keys.__getitem__)
+                width = self.window
+            else:
+                width = len(members)
+            for pos, i in enumerate(members):
+                for j in members[pos + 1:pos + 1 + width]:
+                    if union_find.find(i) != union_find.find(j) and self.is_match(titles[i], titles[j], brands[i], brands[j]):
+                        union_find.union(i, j)
+
+        groups: Dict[int, List[int]] = {}
+        for i in range(len(titles)):
+            groups.setdefault(union_find.find(i), []).append(i)
+        return list(groups.values())
+
+
+_default_matcher = ProductMatcher()
+
+
+def normalize_brand(brand: str) -> str:
+    """브랜드 표기 통일"""
+    brand = unicodedata.normalize("NFKC", brand or "").strip().lower()
+    return _VARIANTS.get(brand, brand)
+
+
+def cluster_key(title: str) -> str:
+    """상품 묶음 키 (가격 이력 등 검색 간 식별용)"""
+    return normalize_title(title).key()
+
+
+def _merge_products(members: List[Product]) -> Product:
+    """상품 묶음을 최저가 대표 하나로 병합
+
+    입력 상품은 수정하지 않고 대표의 복사본을 반환합니다. 이미 병합된 대표를 다시
+    병합하면 제안 수, 판매처, 최고가를 누적합니다.
+    """
+    priced = [product for product in members if product.price is not None]
+    best = min(priced, key=lambda product: product.price) if priced else members[0]
+
+    if len(members) == 1:
+        return best
+
+    malls: List[str] = []
+    offer_count = 0
+    max_price = None
+    for product in members:
+        extra = product.extra or {}
+        offer_count += extra.get("offer_count", 1)
+        for mall in extra.get("malls") or [product.mall]:
+            if mall and mall not in malls:
+                malls.append(mall)
+        for price in (product.price, extra.get("max_price")):
+            if price is not None and (max_price is None or price > max_price):
+                max_price = price
+
+    merged = copy.copy(best)
+    merged.extra = dict(best.extra or {}, offer_count=offer_count, malls=malls)
+    if max_price is not None:
+        merged.extra["max_price"] = max_price
+    merged.score = max(product.score for product in members)
+    return merged
+
+
+def dedupe_hits(hits: Iterable[SearchHit], matcher: Optional[ProductMatcher] = None) -> List[SearchHit]:
+    """검색 결과 중복 제거
+
+    상품은 같은 상품끼리 묶어 최저가 제안만 남기고, 일반 결과는 URL 또는
+    정규화된 제목(비어 있지 않을 때)이 같으면 먼저 나온(점수가 높은) 결과만 남깁니다.
+    """
+    matcher = matcher or _default_matcher
+
+    products: List[Product] = []
+    others: List[SearchHit] = []
+    order: List[Tuple[str, int]] = []
+    seen_urls: Set[str] = set()
+    seen_titles: Set[str] = set()
+
+    for hit in hits:
+        if hit.url:
+            if hit.url in seen_urls:
+                continue
+            seen_urls.add(hit.url)
+
+        if isinstance(hit, Product):
+            order.append(("p", len(products)))
+            products.append(hit)
+        else:
+            title = normalize_title(hit.title)
+            # 제목이 비었거나 문장 부호뿐이면 모두 같은 키가 되므로 URL 중복 제거만 적용
+            if title.tokens or title.specs or title.models:
+                title_key = title.key()
+                if title_key in seen_titles:
+                    continue
+                seen_titles.add(title_key)
+            order.append(("o", len(others)))
+            others.append(hit)
+
+    titles = [normalize_title(product.title) for product in products]
+    brands = [normalize_brand(product.brand) for product in products]
+    representative: Dict[int, Product] = {}
+    for members in matcher.cluster(titles, brands):
+        representative[members[0]] = _merge_products([products[i] for i in members])
+
+    results: List[SearchHit] = []
+    for kind, index in order:
+        if kind == "o":
+            results.append(others[index])
+        elif index in representative:
+            results.append(representative[index])
+    return results
@@ -0,0 +1,113 @@
+"""
+네이버 통합 검색 질의 계획 모듈
+
+질의 의도(최저가 탐색, 리뷰 조사, 출시 소식)를 로컬 키워드 분류기로 판별하고,
+의도에 맞는 엔드포인트와 엔드포인트별 결과 수(display), 정렬 기준만 호출하도록
+검색 계획을 세웁니다. 가격 질문은 쇼핑 한 곳만 호출하므로 API 호출이 최대 75% 줄어듭니다.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Tuple
+
+PRICE = "price"
+REVIEW = "review"
+NEWS = "news"
+GENERAL = "general"
+
+# 의도별 키워드 (부분 문자열 일치, 가중치)
+INTENT_KEYWORDS: Dict[str, Tuple[Tuple[str, float], ...]] = {
+    PRICE: (
+        ("최저가", 3.0), ("가격", 2.0), ("얼마", 2.0), ("싸게", 2.0), ("저렴", 2.0), ("할인", 2.0),
+        ("특가", 2.0), ("가성비", 1.5), ("싼", 1.5), ("구매", 1.0), ("구입", 1.0), ("딜", 1.0), ("쿠폰", 1.0)
+    ),
+    REVIEW: (
+        ("후기", 3.0), ("리뷰", 3.0), ("사용기", 3.0), ("장단점", 3.0), ("실사용", 2.0), ("평가", 2.0),
+        ("비교", 1.5), ("추천", 1.5), ("어때", 1.5), ("vs", 1.5), ("단점", 1.5)
+    ),
+    NEWS: (
+        ("출시일", 3.0), ("출시", 2.5), ("뉴스", 3.0), ("발표", 2.5), ("루머", 2.5), ("공개", 2.0),
+        ("사전예약", 2.5), ("신제품", 2.0), ("언제 나와", 3.0), ("소식", 2.0)
+    ),
+}
+
+_PRICE_AMOUNT_RE = re.compile(r"\d+\s*(?:만\s*원|만원|천원|원)")
+
+# 분류에 필요한 최소 점수 (미만이면 일반 질의)
+MIN_INTENT_SCORE = 1.5
+
+# 네이버 검색 API display 상한
+MAX_DISPLAY = 100
+
+
+class EndpointPlan(NamedTuple):
+    """엔드포인트별 호출 계획"""
+    endpoint: str  # webkr | news | blog | shop
+    display: int
+    sort: str
+
+
+class SearchPlan(NamedTuple):
+    """통합 검색 계획"""
+    intent: str
+    endpoints: List[EndpointPlan]
+
+
+def classify_intent(query: str) -> str:
+    """질의 의도 분류"""
+    text = query.lower()
+    scores = {
+        intent: sum(weight for keyword, weight in keywords if keyword in text)
+        for intent, keywords in INTENT_KEYWORDS.items()
+    }
+    if _PRICE_AMOUNT_RE.search(text):
+        scores[PRICE] += 2.0
+
+    intent, score = max(scores.items(), key=lambda item: item[1])
+    return intent if score >= MIN_INTENT_SCORE else GENERAL
+
+
+def _split(total: int, weights: Tuple[float, ...]) -> List[int]:
+    """결과 수를 가중치로 분배 (엔드포인트마다 최소 1개)"""
+    return [max(1, min(MAX_DISPLAY, round(total * weight))) for weight in weights]
+
+
+def plan_query(query: str, max_results: int = 20) -> SearchPlan:
+    """질의 의도에 따른 검색 계획
+
+    최저가 탐색은 쇼핑만 관련도순으로 넉넉히 조회하고 결과는 가격순으로 정렬합니다
+    (네이버 asc 정렬은 모델명 질의에서 케이스 등 액세서리가 먼저 나오므로 사용하지 않음).
+    리뷰 조사는 블로그/웹 중심, 출시 소식은 뉴스/웹 최신순 중심으로 조회합니다.
+    """
+    intent = classify_intent(query)
+
+    if intent == PRICE:
+        (shop,) = _split(max_results, (1.0,))
+        return SearchPlan(intent, [EndpointPlan("shop", shop, "sim")])
+
+    if intent == REVIEW:
+        blog, web, shop = _split(max_results, (0.5, 0.3, 0.2))
+        return SearchPlan(intent, [
+            EndpointPlan("blog", blog, "sim"),
+            EndpointPlan("webkr", web, "sim"),
+            EndpointPlan("shop", shop, "sim")
+        ])
+
+    if intent == NEWS:
+        news, web = _split(max_results, (0.6, 0.4))
+        return SearchPlan(intent, [
+            EndpointPlan("news", news, "date"),
+            EndpointPlan("webkr", web, "date")
+        ])
+
+    return default_plan(max_results)
+
+
+def default_plan(max_results: int = 20) -> SearchPlan:
+    """일반 질의 계획: 네 엔드포인트 균등 분배, 최신순"""
+    per_type = max(1, max_results // 4)
+    return SearchPlan(GENERAL, [
+        EndpointPlan("webkr", per_type, "date"),
+        EndpointPlan("news", per_type, "date"),
+        EndpointPlan("blog", per_type, "date"),
+        EndpointPlan("shop", per_type, "date")
+    ])
@@ -0,0 +1,177 @@
+"""
+검색 결과 관련도 순위 모듈
+
+출처별 고정 점수 대신 질의에 대한 관련도로 결과를 정렬합니다. 제목(가중치 2배)과
+본문에 대한 BM25 텍스트 점수, pubDate/postdate 기반 최신성, 가격(저렴할수록 높음),
+출처 사전 점수를 배치 전체에 대해 numpy로 한 번에 계산해 가중합하고, 상위 k개만
+힙으로 선택합니다. 한국어는 조사가 붙어도 일치하도록 어절과 함께 음절 바이그램을
+색인하며, 문서별 토큰 빈도는 캐시하여 같은 결과를 다시 토큰화하지 않습니다.
+"""
+
+import heapq
+import re
+import unicodedata
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from agent.models import SearchHit
+from agent.query_planner import GENERAL, NEWS, PRICE, REVIEW
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_TOKEN_RE = re.compile(r"[0-9a-z가-힣]+")
+_ALNUM_BOUNDARY_RE = re.compile(r"(?<=[a-z가-힣])(?=\d)|(?<=\d)(?=[a-z가-힣])|(?<=[a-z])(?=[가-힣])|(?<=[가-힣])(?=[a-z])")
+_HANGUL_RE = re.compile(r"^[가-힣]+$")
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 2
+
+# 최신성 반감기 (일)
+RECENCY_HALF_LIFE_DAYS = 30.0
+
+# 출처 사전 점수 (기존 출처별 고정 점수)
+SOURCE_PRIORS: Dict[str, float] = {
+    "naver_news": 0.9,
+    "naver_shopping": 0.85,
+    "naver_web": 0.8,
+    "naver_blog": 0.7,
+    "naver_realtime": 0.8,
+    "naver": 0.8,
+    "exa": 0.8,
+}
+DEFAULT_SOURCE_PRIOR = 0.5
+
+# 의도별 특징 가중치 (텍스트, 최신성, 가격, 출처)
+FEATURE_WEIGHTS: Dict[str, Tuple[float, float, float, float]] = {
+    GENERAL: (0.6, 0.15, 0.1, 0.15),
+    PRICE: (0.5, 0.05, 0.35, 0.1),
+    REVIEW: (0.7, 0.1, 0.05, 0.15),
+    NEWS: (0.5, 0.35, 0.0, 0.15),
+}
+
+# 최저가 탐색에서 배치 중앙값 대비 이 비율 미만 가격은 액세서리 등 다른 상품으로 보고 제외
+ACCESSORY_PRICE_RATIO = 0.3
+
+
+def split_words(text: str) -> List[str]:
+    """정규화한 어절/영숫자 토큰 (한글과 숫자, 영문 경계에서 분리)"""
+    text = unicodedata.normalize("NFKC", _TAG_RE.sub(" ", text)).lower()
+    return [part for raw in _TOKEN_RE.findall(text) for part in _ALNUM_BOUNDARY_RE.sub(" ", raw).split()]
+
+
+def hangul_bigrams(word: str) -> List[str]:
+    """세 음절 이상 한글 어절의 음절 바이그램 (그 외에는 빈 목록)"""
+    if len(word) > 2 and _HANGUL_RE.match(word):
+        return [word[i:i + 2] for i in range(len(word) - 1)]
+    return []
+
+
+def tokenize(text: str) -> List[str]:
+    """한국어 인식 토큰화 (어절/영숫자 토큰과 한글 음절 바이그램)"""
+    tokens: List[str] = []
+    for part in split_words(text):
+        tokens.append(part)
+        tokens.extend(hangul_bigrams(part))
+    return tokens
+
+
+@lru_cache(maxsize=8192)
+def _document_terms(title: str, content: str) -> Tuple[Dict[str, int], int]:
+    """문서 토큰 빈도와 길이 (캐시, 반환값은 수정하지 않음)"""
+    counts = Counter(tokenize(content))
+    for token in tokenize(title):
+        counts[token] += TITLE_WEIGHT
+    return dict(counts), sum(counts.values())
+
+
+def _published_at(hit: SearchHit) -> Optional[datetime]:
+    """게시 시각 (파싱 단계의 epoch 초, 없으면 뉴스 pubDate/블로그 postdate)"""
+    extra = hit.extra or {}
+    if extra.get("published"):
+        return datetime.fromtimestamp(extra["published"], timezone.utc)
+    try:
+        if extra.get("pubDate"):
+            published = parsedate_to_datetime(extra["pubDate"])
+            return published if published.tzinfo else published.replace(tzinfo=timezone.utc)
+        if extra.get("postDate"):
+            return datetime.strptime(extra["postDate"], "%Y%m%d").replace(tzinfo=timezone.utc)
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+def bm25_scores(query_terms: Sequence[str], hits: Sequence[SearchHit]) -> np.ndarray:
+    """배치 내 BM25 점수 (배치를 말뭉치로 IDF 계산)"""
+    terms = list(dict.fromkeys(query_terms))
+    documents = [_document_terms(hit.title, hit.content) for hit in hits]
+    tf = np.array([[counts.get(term, 0) for term in terms] for counts, _ in documents], dtype=float)
+    lengths = np.array([length for _, length in documents], dtype=float)
+
+    n = len(hits)
+    df = (tf > 0).sum(axis=0)
+    idf = np.log1p((n - df + 0.5) / (df + 0.5))
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(lengths.mean(), 1.0))
+    return (tf * (BM25_K1 + 1) / (tf + norm[:, None]) * idf).sum(axis=1)
+
+
+def recency_scores(hits: Sequence[SearchHit], now: Optional[datetime] = None) -> np.ndarray:
+    """최신성 점수 (반감기 감쇠, 게시 시각이 없으면 0)"""
+    now = now or datetime.now(timezone.utc)
+    ages = np.array([
+        (now - published).total_seconds() / 86400 if (published := _published_at(hit)) else np.inf
+        for hit in hits
+    ], dtype=float)
+    return np.power(0.5, np.maximum(ages, 0) / RECENCY_HALF_LIFE_DAYS)
+
+
+def price_scores(hits: Sequence[SearchHit]) -> np.ndarray:
+    """가격 점수 (배치 내 최저가 1, 최고가 0, 가격이 없으면 0)"""
+    prices = np.array([getattr(hit, "price", None) or np.nan for hit in hits], dtype=float)
+    priced = ~np.isnan(prices)
+    scores = np.zeros(len(hits))
+    if priced.any():
+        low, high = prices[priced].min(), prices[priced].max()
+        scores[priced] = 1.0 if high == low else (high - prices[priced]) / (high - low)
+    return scores
+
+
+def drop_price_outliers(hits: Sequence[SearchHit], ratio: float = ACCESSORY_PRICE_RATIO) -> List[SearchHit]:
+    """가격이 배치 중앙값의 ratio배 미만인 결과 제외 (가격 없는 결과는 유지)"""
+    prices = [price for price in (getattr(hit, "price", None) for hit in hits) if price]
+    if not prices:
+        return list(hits)
+    floor = float(np.median(prices)) * ratio
+    return [hit for hit in hits if (getattr(hit, "price", None) or floor) >= floor]
+
+
+def rank_hits(
+    query: str,
+    hits: Sequence[SearchHit],
+    k: Optional[int] = None,
+    intent: str = GENERAL
+) -> List[SearchHit]:
+    """질의 관련도 순 상위 k개 (각 결과의 score를 관련도 점수로 갱신)"""
+    hits = list(hits)
+    if not hits:
+        return []
+
+    text = bm25_scores(tokenize(query), hits)
+    if text.max() > 0:
+        text = text / text.max()
+    features = np.stack([
+        text,
+        recency_scores(hits),
+        price_scores(hits),
+        np.array([SOURCE_PRIORS.get(hit.source, DEFAULT_SOURCE_PRIOR) for hit in hits])
+    ])
+    scores = np.asarray(FEATURE_WEIGHTS.get(intent, FEATURE_WEIGHTS[GENERAL])) @ features
+
+    for hit, score in zip(hits, scores.tolist()):
+        hit.score = round(score, 4)
+
+    k = len(hits) if k is None else k
+    return heapq.nlargest(k, hits, key=lambda hit: hit.score)
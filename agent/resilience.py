@@ -0,0 +1,213 @@
+"""
+외부 검색 호출 복원력 모듈
+
+MCP 서버별 회로 차단기(연속 실패 시 차단, 일정 시간 후 반열림 상태에서 시험 호출)와
+느린 호출을 대체 경로로 헤징하는 유틸리티를 제공합니다.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from config import settings
+from agent.metrics import registry
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 호출하지 않은 경우"""
+
+
+class CircuitBreaker:
+    """연속 실패 기반 회로 차단기"""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        sample_size: int = 200
+    ):
+        """차단기 초기화
+
+        failure_threshold번 연속 실패하면 열리고, recovery_timeout 후 반열림 상태에서
+        half_open_max_calls개의 시험 호출만 허용합니다. 시험 호출이 성공하면 닫힙니다.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._latencies = deque(maxlen=sample_size)
+
+        self.total_failures = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """현재 상태 (열린 뒤 복구 시간이 지나면 반열림)"""
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    def allow_request(self) -> bool:
+        """호출 허용 여부 (반열림 상태에서는 시험 호출 수만큼만 허용)"""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+            self._half_open_calls += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self, latency: Optional[float] = None):
+        """성공 기록"""
+        if latency is not None:
+            self._latencies.append(latency)
+        self._consecutive_failures = 0
+        self._state = CLOSED
+
+    def record_failure(self):
+        """실패 기록"""
+        self.total_failures += 1
+        self._consecutive_failures += 1
+        if self._state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            self._state = OPEN
+            self._opened_at = time.monotonic()
+
+    def latency_percentile(self, q: float = 0.95, min_samples: int = 20) -> Optional[float]:
+        """최근 성공 호출 지연 시간 백분위수 (표본이 부족하면 None)"""
+        if len(self._latencies) < min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    async def call(self, func: Callable[[], Awaitable[Any]], timeout: Optional[float] = None) -> Any:
+        """차단기를 거쳐 호출 (열려 있으면 CircuitOpenError, 시간 초과는 실패로 기록)"""
+        if not self.allow_request():
+            raise CircuitOpenError(f"{self.name} 회로 차단기 열림")
+
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(func(), timeout=timeout)
+        except asyncio.CancelledError:
+            # 헤징으로 취소된 호출은 실패로 보지 않음
+            if self._state == HALF_OPEN:
+                self._half_open_calls = max(0, self._half_open_calls - 1)
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+
+        self.record_success(time.perf_counter() - started)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """차단기 통계"""
+        p95 = self.latency_percentile(min_samples=1)
+        return {
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "total_failures": self.total_failures,
+            "rejected": self.rejected,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None
+        }
+
+
+# 서버별 전역 차단기
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """서버별 회로 차단기 싱글톤 접근"""
+    breaker = _breakers.get(name)
+
+    if breaker is None:
+        breaker = CircuitBreaker(
+            name,
+            failure_threshold=settings.circuit_failure_threshold,
+            recovery_timeout=settings.circuit_recovery_timeout
+        )
+        _breakers[name] = breaker
+
+    return breaker
+
+
+def get_breaker_stats() -> Dict[str, Dict[str, Any]]:
+    """전체 차단기 통계"""
+    return {name: breaker.stats() for name, breaker in _breakers.items()}
+
+
+HEDGE_RESULTS = registry.counter(
+    "search_hedge_total", "헤징 검색에서 결과를 채택한 경로", ["site", "winner"]
+)
+
+
+async def hedge(
+    primary: Callable[[], Awaitable[Any]],
+    backup: Callable[[], Awaitable[Any]],
+    delay: float,
+    accept: Callable[[Any], bool] = bool,
+    site: str = "search"
+) -> Tuple[Any, str]:
+    """헤징 호출
+
+    primary를 시작하고 delay 안에 좋은 결과(accept)가 나오지 않으면 backup도 시작하여
+    먼저 좋은 결과를 낸 쪽을 채택하고 나머지는 취소합니다. primary가 일찍 실패하거나
+    빈 결과를 내면 delay를 기다리지 않고 바로 backup을 시작합니다.
+    반환값은 (결과, "primary" | "backup" | "none")입니다.
+    """
+    labels: Dict[asyncio.Future, str] = {asyncio.ensure_future(primary()): "primary"}
+    pending = set(labels)
+    backup_started = False
+    fallback_result = None
+
+    try:
+        while pending:
+            timeout = None if backup_started else max(0.0, delay)
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                if task.exception() is None:
+                    result = task.result()
+                    if accept(result):
+                        HEDGE_RESULTS.inc(1, site, labels[task])
+                        return result, labels[task]
+                    if fallback_result is None:
+                        fallback_result = result
+
+            if not backup_started:
+                # 지연 시간 경과 또는 primary 실패/빈 결과
+                task = asyncio.ensure_future(backup())
+                labels[task] = "backup"
+                pending.add(task)
+                backup_started = True
+    finally:
+        for task in pending:
+            task.cancel()
+
+    HEDGE_RESULTS.inc(1, site, "none")
+    return fallback_result, "none"
+
+
+def _render_breaker_metrics() -> List[str]:
+    """차단기 상태 메트릭 (0=closed, 1=half_open, 2=open)"""
+    lines = ["# TYPE circuit_breaker_state gauge"]
+    for name, breaker in _breakers.items():
+        lines.append(f'circuit_breaker_state{{server="{name}"}} {_STATE_VALUES[breaker.state]}')
+    return lines
+
+
+registry.register_collector(_render_breaker_metrics)
@@ -0,0 +1,242 @@
+"""
+대화별 검색 결과 저장소
+
+검색 도구가 결과를 대화(thread_id)별로 저장하고 짧은 핸들(res_1, res_2, ...)을
+함께 반환합니다. 분석 도구는 상품 목록 전체 대신 핸들만 인자로 받아 서버에 저장된
+결과로 계산하므로, 모델이 이전 검색 결과를 JSON으로 다시 생성할 필요가 없습니다.
+멀티 워커 모드에서는 후속 턴이 다른 워커로 갈 수 있으므로 결과와 핸들 번호를
+공유 상태 SQLite에 저장합니다.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Union
+from config import settings
+
+DEFAULT_THREAD = "default"
+
+
+class StoredResult:
+    """저장된 검색 결과"""
+
+    __slots__ = ("items", "query", "tool", "created_at")
+
+    def __init__(self, items: List[Dict[str, Any]], query: str, tool: str):
+        self.items = items
+        self.query = query
+        self.tool = tool
+        self.created_at = time.time()
+
+
+class ResultStore:
+    """대화별 검색 결과 핸들 저장소 (메모리 LRU)"""
+
+    def __init__(self, max_results_per_thread: int = 20, max_threads: int = 1000):
+        """저장소 초기화
+
+        대화마다 최근 max_results_per_thread개 결과만 보관하고, 대화 수가
+        max_threads를 넘으면 가장 오래 사용하지 않은 대화부터 제거합니다.
+        """
+        self.max_results_per_thread = max_results_per_thread
+        self.max_threads = max_threads
+        self._threads: "OrderedDict[str, OrderedDict[str, StoredResult]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def put(self, thread_id: str, items: Sequence[Dict[str, Any]], query: str = "", tool: str = "") -> str:
+        """결과 저장 후 핸들 반환"""
+        with self._lock:
+            results = self._threads.get(thread_id)
+            if results is None:
+                results = self._threads[thread_id] = OrderedDict()
+                if len(self._threads) > self.max_threads:
+                    evicted, _ = self._threads.popitem(last=False)
+                    self._counters.pop(evicted, None)
+            else:
+                self._threads.move_to_end(thread_id)
+
+            number = self._counters.get(thread_id, 0) + 1
+            self._counters[thread_id] = number
+            handle = f"res_{number}"
+
+            results[handle] = StoredResult(list(items), query, tool)
+            while len(results) > self.max_results_per_thread:
+                results.popitem(last=False)
+
+            return handle
+
+    def get(self, thread_id: str, handle: str) -> Optional[StoredResult]:
+        """핸들에 해당하는 결과 (없거나 만료되었으면 None)"""
+        with self._lock:
+            results = self._threads.get(thread_id)
+            if results is None:
+                return None
+            self._threads.move_to_end(thread_id)
+            return results.get(handle.strip())
+
+    def handles(self, thread_id: str) -> List[Dict[str, Any]]:
+        """대화에 저장된 핸들 목록"""
+        with self._lock:
+            results = self._threads.get(thread_id, {})
+            return [
+                {"result_id": handle, "query": stored.query, "tool": stored.tool, "count": len(stored.items)}
+                for handle, stored in results.items()
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        """저장소 통계"""
+        with self._lock:
+            return {
+                "threads": len(self._threads),
+                "results": sum(len(results) for results in self._threads.values())
+            }
+
+
+class SharedResultStore:
+    """워커 간 공유 검색 결과 핸들 저장소 (SQLite)
+
+    핸들 번호는 쓰기 트랜잭션 안에서 대화별 최대 번호 다음 값으로 매기므로, 여러
+    워커가 같은 대화에 결과를 저장해도 번호가 겹치지 않고 어느 워커에서든 같은
+    결과로 해석됩니다. retention보다 오래된 결과는 주기적으로 삭제합니다.
+    """
+
+    def __init__(self, path: str, max_results_per_thread: int = 20, retention: float = 86400.0):
+        self.path = path
+        self.max_results_per_thread = max_results_per_thread
+        self.retention = retention
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        self._conn = self._open(path)
+
+    def _open(self, path: str) -> sqlite3.Connection:
+        """SQLite 연결 및 스키마 생성"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(path, timeout=10.0, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS search_results ("
+            "thread_id TEXT NOT NULL, "
+            "seq INTEGER NOT NULL, "
+            "query TEXT NOT NULL, "
+            "tool TEXT NOT NULL, "
+            "items TEXT NOT NULL, "
+            "created_at REAL NOT NULL, "
+            "PRIMARY KEY (thread_id, seq))"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_search_results_created ON search_results (created_at)")
+        return conn
+
+    def put(self, thread_id: str, items: Sequence[Dict[str, Any]], query: str = "", tool: str = "") -> str:
+        """결과 저장 후 핸들 반환"""
+        payload = json.dumps(list(items), ensure_ascii=False, default=str)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                number = self._conn.execute(
+                    "SELECT COALESCE(MAX(seq), 0) + 1 FROM search_results WHERE thread_id = ?", (thread_id,)
+                ).fetchone()[0]
+                self._conn.execute(
+                    "INSERT INTO search_results (thread_id, seq, query, tool, items, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (thread_id, number, query, tool, payload, now)
+                )
+                self._conn.execute(
+                    "DELETE FROM search_results WHERE thread_id = ? AND seq <= ?",
+                    (thread_id, number - self.max_results_per_thread)
+                )
+                if now - self._last_purge >= 3600:
+                    self._last_purge = now
+                    self._conn.execute("DELETE FROM search_results WHERE created_at < ?", (now - self.retention,))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return f"res_{number}"
+
+    def get(self, thread_id: str, handle: str) -> Optional[StoredResult]:
+        """핸들에 해당하는 결과 (없거나 만료되었으면 None)"""
+        handle = handle.strip()
+        if not handle.startswith("res_") or not handle[4:].isdigit():
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT items, query, tool, created_at FROM search_results WHERE thread_id = ? AND seq = ?",
+                (thread_id, int(handle[4:]))
+            ).fetchone()
+        if row is None:
+            return None
+
+        stored = StoredResult(json.loads(row[0]), row[1], row[2])
+        stored.created_at = row[3]
+        return stored
+
+    def handles(self, thread_id: str) -> List[Dict[str, Any]]:
+        """대화에 저장된 핸들 목록"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, query, tool, json_array_length(items) FROM search_results WHERE thread_id = ? ORDER BY seq",
+                (thread_id,)
+            ).fetchall()
+        return [
+            {"result_id": f"res_{seq}", "query": query, "tool": tool, "count": count}
+            for seq, query, tool, count in rows
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """저장소 통계"""
+        with self._lock:
+            threads, results = self._conn.execute(
+                "SELECT COUNT(DISTINCT thread_id), COUNT(*) FROM search_results"
+            ).fetchone()
+        return {"threads": threads, "results": results, "path": self.path}
+
+
+def thread_id_from(config: Optional[Dict[str, Any]]) -> str:
+    """도구 실행 설정에서 대화 ID 추출"""
+    if not config:
+        return DEFAULT_THREAD
+    return str(config.get("configurable", {}).get("thread_id") or DEFAULT_THREAD)
+
+
+_store: Optional[Union[ResultStore, SharedResultStore]] = None
+
+
+def get_result_store() -> Union[ResultStore, SharedResultStore]:
+    """검색 결과 저장소 싱글톤 접근 (멀티 워커 모드에서는 공유 상태 DB 사용)"""
+    global _store
+
+    if _store is None:
+        if settings.use_shared_state():
+            _store = SharedResultStore(settings.state_db_path, max_results_per_thread=settings.result_store_max_per_thread)
+        else:
+            _store = ResultStore(max_results_per_thread=settings.result_store_max_per_thread)
+
+    return _store
+
+
+def register_results(
+    config: Optional[Dict[str, Any]],
+    items: Sequence[Dict[str, Any]],
+    query: str = "",
+    tool: str = ""
+) -> Dict[str, Any]:
+    """검색 도구 결과 저장 후 도구 응답 생성 ({"result_id", "count", "results"})"""
+    handle = get_result_store().put(thread_id_from(config), items, query, tool)
+    return {"result_id": handle, "count": len(items), "results": list(items)}
+
+
+def resolve_results(config: Optional[Dict[str, Any]], handle: str) -> Optional[List[Dict[str, Any]]]:
+    """핸들로 저장된 결과 조회 (없으면 None)"""
+    stored = get_result_store().get(thread_id_from(config), handle)
+    return stored.items if stored is not None else None
@@ -0,0 +1,429 @@
+"""
+검색 결과 캐시 모듈
+
+프로세스 메모리 계층(LRU + TTL)과, 그 아래에서 재시작 후에도 유지되고 워커 간에
+공유되는 SQLite 디스크 계층으로 구성됩니다. 디스크 계층의 값은 zlib으로 압축하고
+만료 시각 인덱스로 오래된 항목을 정리합니다. 쓰기와 삭제는 직렬화/압축까지
+백그라운드 스레드가 모아서 처리(write-behind)하고, 비동기 호출자는 aget/aget_stale로
+메모리 계층에 없을 때만 디스크 조회를 스레드에서 실행하므로 이벤트 루프가 디스크
+입출력을 기다리지 않습니다.
+"""
+
+import asyncio
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+from config import settings
+from agent.metrics import registry
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# 디스크 계층 압축 수준 (속도 우선)
+COMPRESS_LEVEL = 3
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    """디스크 계층 연결 (테이블과 만료 시각 인덱스 생성)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS search_cache ("
+        "namespace TEXT NOT NULL, "
+        "key TEXT NOT NULL, "
+        "value TEXT NOT NULL, "
+        "expires_at REAL NOT NULL, "
+        "PRIMARY KEY (namespace, key))"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS search_cache_expires ON search_cache (expires_at)")
+    return conn
+
+
+def _decode(value: Any) -> Any:
+    """디스크 값 복원 (압축 BLOB, 이전 형식의 JSON 문자열 모두 지원)"""
+    if isinstance(value, bytes):
+        value = zlib.decompress(value)
+    return json.loads(value)
+
+
+class _WriteBehind:
+    """디스크 계층 지연 쓰기 스레드 (DB 경로별 하나)
+
+    저장 요청은 값 그대로 대기 목록에 모아 두었다가 flush_interval마다 JSON 직렬화와
+    압축을 거쳐 한 트랜잭션으로 기록하고, purge_interval마다 유예 시간까지 지난 항목을
+    만료 시각 인덱스로 삭제합니다. 기록 전 값과 네임스페이스 삭제 요청은 pending()과
+    is_cleared()로 확인할 수 있어 같은 프로세스에서는 요청 직후에도 반영됩니다.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 0.5, purge_interval: float = 60.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.purge_interval = purge_interval
+        self.retention = settings.search_cache_stale_ttl
+        self.written = 0
+        self.failed = 0
+
+        self._pending: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+        self._cleared: Set[str] = set()
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._last_purge = 0.0
+        self._conn = _connect(path)
+        self._thread = threading.Thread(target=self._run, name="search-cache-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, namespace: str, key: str, value: Any, expires_at: float):
+        """저장 요청 (즉시 반환, 직렬화는 기록 스레드에서)"""
+        with self._lock:
+            self._pending[(namespace, key)] = (value, expires_at)
+        self._wake.set()
+
+    def pending(self, namespace: str, key: str) -> Optional[Tuple[Any, float]]:
+        """아직 기록되지 않은 값 (value, expires_at)"""
+        with self._lock:
+            return self._pending.get((namespace, key))
+
+    def clear(self, namespace: str):
+        """네임스페이스 삭제 요청 (대기 중인 쓰기는 취소하고 삭제는 기록 스레드에서)"""
+        with self._lock:
+            for entry in [entry for entry in self._pending if entry[0] == namespace]:
+                del self._pending[entry]
+            self._cleared.add(namespace)
+        self._wake.set()
+
+    def is_cleared(self, namespace: str) -> bool:
+        """아직 디스크에 반영되지 않은 삭제 요청이 있는지"""
+        with self._lock:
+            return namespace in self._cleared
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+            if time.time() - self._last_purge >= self.purge_interval:
+                self.purge()
+
+    def flush(self):
+        """대기 중인 쓰기를 한 트랜잭션으로 기록"""
+        with self._lock:
+            batch = dict(self._pending)
+            cleared = set(self._cleared)
+        if not batch and not cleared:
+            return
+
+        rows = []
+        for (namespace, key), (value, expires_at) in batch.items():
+            try:
+                payload = json.dumps(value, ensure_ascii=False)
+            except (TypeError, ValueError):
+                # 직렬화할 수 없는 값은 메모리 계층에만 보관
+                continue
+            rows.append((namespace, key, zlib.compress(payload.encode("utf-8"), COMPRESS_LEVEL), expires_at))
+
+        try:
+            with self._io_lock, self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany("DELETE FROM search_cache WHERE namespace = ?", [(ns,) for ns in cleared])
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO search_cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+            self.written += len(rows)
+        except Exception as e:
+            self.failed += len(rows)
+            logger.warning(f"검색 캐시 디스크 기록 실패: {e}")
+
+        # 기록하는 동안 새 값으로 바뀌지 않은 항목만 대기 목록에서 제거
+        with self._lock:
+            self._cleared -= cleared
+            for entry, value in batch.items():
+                if self._pending.get(entry) is value:
+                    del self._pending[entry]
+
+    def purge(self):
+        """유예 시간까지 지난 항목 삭제"""
+        self._last_purge = time.time()
+        try:
+            with self._io_lock:
+                self._conn.execute("DELETE FROM search_cache WHERE expires_at < ?", (self._last_purge - self.retention,))
+        except Exception as e:
+            logger.warning(f"검색 캐시 만료 항목 정리 실패: {e}")
+
+    def close(self):
+        """남은 쓰기를 기록하고 스레드 종료"""
+        self._stopped = True
+        self._wake.set()
+        self._thread.join(timeout=5.0)
+        self.flush()
+
+
+_writers: Dict[str, _WriteBehind] = {}
+_writers_lock = threading.Lock()
+
+
+def _get_writer(path: str) -> _WriteBehind:
+    """DB 경로별 지연 쓰기 스레드"""
+    with _writers_lock:
+        writer = _writers.get(path)
+        if writer is None:
+            writer = _writers[path] = _WriteBehind(path)
+        return writer
+
+
+@atexit.register
+def flush_search_caches():
+    """종료 시 대기 중인 디스크 쓰기 기록"""
+    for writer in list(_writers.values()):
+        writer.close()
+
+
+class SearchCache:
+    """TTL 기반 검색 결과 캐시"""
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: float,
+        max_entries: int = 1024,
+        shared_path: Optional[str] = None,
+        stale_ttl: float = 0.0
+    ):
+        """캐시 초기화
+
+        stale_ttl은 만료 후에도 항목을 보관하는 유예 시간으로, 이 동안은
+        get_stale()로 이전 값을 즉시 반환하고 백그라운드에서 갱신할 수 있습니다
+        (stale-while-revalidate).
+        """
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.shared_path = shared_path
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn = None
+        self._writer: Optional[_WriteBehind] = None
+
+        if shared_path:
+            self._conn = self._open_shared(shared_path)
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """캐시 키 생성"""
+        return json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+
+    def _open_shared(self, path: str) -> Optional[sqlite3.Connection]:
+        """디스크 계층 연결 (쓰기는 경로별 지연 쓰기 스레드가 담당)"""
+        try:
+            conn = _connect(path)
+            self._writer = _get_writer(path)
+            return conn
+        except Exception as e:
+            logger.warning(f"디스크 검색 캐시 연결 실패, 메모리 캐시만 사용: {e}")
+            return None
+
+    def _get_local(self, key: str, now: float) -> Optional[Any]:
+        """메모리 계층 조회 (만료되었거나 없으면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                if expires_at + self.stale_ttl <= now:
+                    del self._entries[key]
+        return None
+
+    def _count(self, value: Optional[Any]) -> Optional[Any]:
+        """디스크 계층 조회 결과 적중/실패 집계"""
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def get(self, key: str) -> Optional[Any]:
+        """캐시 조회 (만료되었거나 없으면 None)"""
+        now = time.time()
+        value = self._get_local(key, now)
+        if value is not None:
+            return value
+        return self._count(self._get_shared(key, now))
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """비동기 캐시 조회 (메모리 계층에 없을 때만 디스크 조회를 스레드에서 실행)"""
+        now = time.time()
+        value = self._get_local(key, now)
+        if value is not None or self._conn is None:
+            return value if value is not None else self._count(None)
+        return self._count(await asyncio.to_thread(self._get_shared, key, now))
+
+    def _get_stale_local(self, key: str, now: float) -> Tuple[Optional[Any], bool]:
+        """메모리 계층의 유예 중인 값과, 디스크 계층을 조회해야 하는지 여부"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None, True
+        return (entry[1] if entry[0] + self.stale_ttl > now else None), False
+
+    def _count_stale(self, value: Optional[Any]) -> Optional[Any]:
+        if value is not None:
+            with self._lock:
+                self.stale_hits += 1
+        return value
+
+    def get_stale(self, key: str) -> Optional[Any]:
+        """만료되었지만 유예 시간 안에 있는 값 조회 (재시작 직후에는 디스크 계층에서)"""
+        now = time.time()
+        value, from_disk = self._get_stale_local(key, now)
+        if from_disk:
+            value = self._get_shared(key, now, allow_stale=True)
+        return self._count_stale(value)
+
+    async def aget_stale(self, key: str) -> Optional[Any]:
+        """get_stale의 비동기 버전 (디스크 조회는 스레드에서 실행)"""
+        now = time.time()
+        value, from_disk = self._get_stale_local(key, now)
+        if from_disk and self._conn is not None:
+            value = await asyncio.to_thread(self._get_shared, key, now, True)
+        return self._count_stale(value)
+
+    def expires_at(self, key: str) -> Optional[float]:
+        """메모리 계층 항목의 만료 시각 (없으면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry is not None else None
+
+    def _get_shared(self, key: str, now: float, allow_stale: bool = False) -> Optional[Any]:
+        """디스크 계층(기록 대기 중인 값 포함) 조회 후 메모리 계층에 적재"""
+        if self._conn is None:
+            return None
+
+        try:
+            pending = self._writer.pending(self.namespace, key) if self._writer is not None else None
+            if pending is not None:
+                value, expires_at = pending
+            elif self._writer is not None and self._writer.is_cleared(self.namespace):
+                return None
+            else:
+                with self._db_lock:
+                    row = self._conn.execute(
+                        "SELECT value, expires_at FROM search_cache WHERE namespace = ? AND key = ?",
+                        (self.namespace, key)
+                    ).fetchone()
+                if row is None:
+                    return None
+                value, expires_at = row
+
+            if expires_at <= now and not (allow_stale and expires_at + self.stale_ttl > now):
+                return None
+
+            if pending is None:
+                value = _decode(value)
+            self._put_local(key, value, expires_at)
+            return value
+        except Exception as e:
+            logger.warning(f"디스크 검색 캐시 조회 실패: {e}")
+            return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """캐시 저장 (디스크 기록과 직렬화는 백그라운드)"""
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        self._put_local(key, value, expires_at)
+
+        if self._writer is not None:
+            self._writer.put(self.namespace, key, value, expires_at)
+
+    def _put_local(self, key: str, value: Any, expires_at: float):
+        """메모리 계층 저장 (LRU 제한)"""
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """캐시 비우기 (디스크 계층 삭제는 백그라운드)"""
+        with self._lock:
+            self._entries.clear()
+        if self._writer is not None:
+            self._writer.clear(self.namespace)
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        total = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "shared": self._conn is not None,
+            "disk_writes": self._writer.written if self._writer is not None else 0
+        }
+
+
+# 네임스페이스별 전역 캐시
+_caches: Dict[str, SearchCache] = {}
+
+
+def get_search_cache(namespace: str) -> SearchCache:
+    """네임스페이스별 검색 캐시 싱글톤 접근"""
+    cache = _caches.get(namespace)
+
+    if cache is None:
+        cache = SearchCache(
+            namespace=namespace,
+            ttl=settings.search_cache_ttl,
+            max_entries=settings.search_cache_max_entries,
+            shared_path=settings.search_cache_db_path if settings.search_cache_persistent or settings.use_shared_state() else None,
+            stale_ttl=settings.search_cache_stale_ttl
+        )
+        _caches[namespace] = cache
+
+    return cache
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """전체 캐시 통계"""
+    return {namespace: cache.stats() for namespace, cache in _caches.items()}
+
+
+def _render_cache_metrics() -> List[str]:
+    """캐시 적중률 메트릭 (스크레이프 시점 수집)"""
+    lines = [
+        "# HELP search_cache_requests_total 검색 캐시 조회 수",
+        "# TYPE search_cache_requests_total counter"
+    ]
+    for namespace, cache in _caches.items():
+        lines.append(f'search_cache_requests_total{{namespace="{namespace}",result="hit"}} {cache.hits}')
+        lines.append(f'search_cache_requests_total{{namespace="{namespace}",result="miss"}} {cache.misses}')
+        lines.append(f'search_cache_requests_total{{namespace="{namespace}",result="stale"}} {cache.stale_hits}')
+    return lines
+
+
+registry.register_collector(_render_cache_metrics)
@@ -0,0 +1,91 @@
+"""
+멀티 워커 배포용 공유 상태 저장소
+
+`uvicorn --workers N`으로 실행하면 워커마다 별도 프로세스가 생성되므로
+InMemorySaver/InMemoryStore로는 세션과 사용자 메모리를 공유할 수 없습니다.
+공유 모드에서는 로컬 SQLite 파일을 체크포인터와 스토어로 사용합니다.
+"""
+
+import asyncio
+import os
+import sqlite3
+from typing import Any, AsyncIterator
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.store.memory import InMemoryStore
+from config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from langgraph.checkpoint.sqlite import SqliteSaver
+    from langgraph.store.sqlite import SqliteStore
+    SQLITE_STATE_AVAILABLE = True
+except ImportError:
+    logger.warning("langgraph-checkpoint-sqlite를 가져올 수 없음. 공유 상태 저장소를 사용할 수 없습니다.")
+    SQLITE_STATE_AVAILABLE = False
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    """워커 간 동시 접근을 고려한 SQLite 연결 생성"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(path, timeout=10.0, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+if SQLITE_STATE_AVAILABLE:
+
+    class SharedSqliteSaver(SqliteSaver):
+        """비동기 그래프 실행을 지원하는 SQLite 체크포인터
+
+        SqliteSaver는 동기 메서드만 구현하므로, 비동기 메서드는 스레드에서
+        동기 메서드를 실행해 이벤트 루프를 막지 않도록 위임합니다.
+        """
+
+        async def aget_tuple(self, config):
+            return await asyncio.to_thread(self.get_tuple, config)
+
+        async def alist(self, config, **kwargs: Any) -> AsyncIterator:
+            items = await asyncio.to_thread(lambda: list(self.list(config, **kwargs)))
+            for item in items:
+                yield item
+
+        async def aput(self, config, checkpoint, metadata, new_versions):
+            return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+        async def aput_writes(self, config, writes, task_id, *args: Any, **kwargs: Any):
+            return await asyncio.to_thread(self.put_writes, config, writes, task_id, *args, **kwargs)
+
+        async def adelete_thread(self, thread_id: str):
+            return await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+def create_checkpointer():
+    """설정에 맞는 체크포인터 생성"""
+    if settings.use_shared_state():
+        if SQLITE_STATE_AVAILABLE:
+            saver = SharedSqliteSaver(_connect(settings.state_db_path))
+            saver.setup()
+            logger.info(f"공유 체크포인터 사용: {settings.state_db_path}")
+            return saver
+        logger.warning("공유 상태가 요청되었지만 SQLite 체크포인터가 없어 InMemorySaver를 사용합니다.")
+
+    return InMemorySaver()
+
+
+def create_store():
+    """설정에 맞는 장기 메모리 스토어 생성"""
+    if settings.use_shared_state():
+        if SQLITE_STATE_AVAILABLE:
+            store = SqliteStore(_connect(settings.state_db_path))
+            store.setup()
+            logger.info(f"공유 메모리 스토어 사용: {settings.state_db_path}")
+            return store
+        logger.warning("공유 상태가 요청되었지만 SQLite 스토어가 없어 InMemoryStore를 사용합니다.")
+
+    return InMemoryStore()
@@ -0,0 +1,145 @@
+"""
+추측 검색(speculative search) 모듈
+
+첫 턴 쇼핑 질문에서 모델의 첫 행동은 대부분 사용자 문장과 거의 같은 질의로
+naver_realtime_search를 호출하는 것이므로, 메시지가 도착하면 첫 LLM 호출과 동시에
+정규화한 메시지로 네이버 검색을 미리 시작합니다. 모델이 비슷한 질의로 검색을
+요청하면 도구가 미리 받은 결과를 그대로 사용하고, 그렇지 않으면 버립니다.
+"""
+
+import asyncio
+import re
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, Tuple
+from config import settings
+from agent.metrics import registry
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 검색 질의에 포함되지 않는 요청 문구
+_REQUEST_WORDS = frozenset({
+    "찾아줘", "찾아주세요", "추천해줘", "추천해주세요", "알려줘", "알려주세요", "검색해줘", "검색해주세요",
+    "보여줘", "보여주세요", "좀", "주세요", "해줘", "부탁해", "있어", "있나요", "뭐야", "어디"
+})
+_PUNCT_RE = re.compile(r"[^\w\s]")
+
+Searcher = Callable[[str], Awaitable[Any]]
+
+
+def normalize_query(text: str) -> str:
+    """메시지/검색 질의 정규화 (요청 문구와 문장 부호 제거)"""
+    text = _PUNCT_RE.sub(" ", unicodedata.normalize("NFKC", text).lower())
+    return " ".join(token for token in text.split() if token not in _REQUEST_WORDS)
+
+
+def _tokens(query: str) -> FrozenSet[str]:
+    return frozenset(query.split())
+
+
+class SpeculativeSearch:
+    """대화별 추측 검색 관리자"""
+
+    def __init__(self, threshold: float = 0.7, max_length: int = 80):
+        """관리자 초기화
+
+        threshold는 모델 질의와 추측 질의의 토큰 Jaccard 유사도 하한이며,
+        max_length보다 긴 메시지는 검색 질의가 아닐 가능성이 높아 추측하지 않습니다.
+        """
+        self.threshold = threshold
+        self.max_length = max_length
+        self._pending: Dict[str, Tuple[str, asyncio.Task]] = {}
+
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self.unused = 0
+
+    def start(self, thread_id: str, message: str, searcher: Searcher) -> bool:
+        """메시지로 추측 검색 시작 (검색할 만한 메시지가 아니면 False)"""
+        query = normalize_query(message)
+        if not query or len(message) > self.max_length:
+            return False
+
+        self.finish(thread_id)
+        task = asyncio.get_running_loop().create_task(searcher(query))
+        task.add_done_callback(_consume_exception)
+        self._pending[thread_id] = (query, task)
+        self.started += 1
+        return True
+
+    def matches(self, speculated: str, query: str) -> bool:
+        """모델 질의가 추측 질의와 같은 검색인지"""
+        a, b = _tokens(speculated), _tokens(normalize_query(query))
+        if not a or not b:
+            return False
+        return len(a & b) / len(a | b) >= self.threshold
+
+    async def take(self, thread_id: str, query: str) -> Optional[Any]:
+        """모델 질의와 일치하는 추측 결과 (없거나 다른 질의면 None)"""
+        entry = self._pending.get(thread_id)
+        if entry is None:
+            return None
+
+        speculated, task = entry
+        if task.get_loop() is not asyncio.get_running_loop():
+            # 다른 이벤트 루프(동기 실행 경로)에서는 사용할 수 없음
+            return None
+        if not self.matches(speculated, query):
+            self.misses += 1
+            self._drop(thread_id)
+            return None
+
+        del self._pending[thread_id]
+        try:
+            result = await task
+        except Exception as e:
+            logger.debug(f"추측 검색 실패, 직접 검색으로 진행: {e}")
+            return None
+
+        self.hits += 1
+        return result
+
+    def finish(self, thread_id: str):
+        """요청 종료 시 사용되지 않은 추측 검색 제거"""
+        if thread_id in self._pending:
+            self.unused += 1
+            self._drop(thread_id)
+
+    def _drop(self, thread_id: str):
+        _, task = self._pending.pop(thread_id)
+        if not task.done():
+            task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """추측 검색 통계"""
+        resolved = self.hits + self.misses + self.unused
+        return {
+            "started": self.started,
+            "hits": self.hits,
+            "misses": self.misses,
+            "unused": self.unused,
+            "hit_rate": round(self.hits / resolved, 3) if resolved else None
+        }
+
+
+def _consume_exception(task: asyncio.Task):
+    """버려진 추측 검색의 예외가 경고로 남지 않도록 처리"""
+    if not task.cancelled():
+        task.exception()
+
+
+speculative_search = SpeculativeSearch(threshold=settings.speculative_match_threshold)
+
+
+def _render_speculative_metrics() -> List[str]:
+    """추측 검색 메트릭"""
+    return [
+        "# TYPE speculative_search_total counter",
+        f'speculative_search_total{{result="hit"}} {speculative_search.hits}',
+        f'speculative_search_total{{result="miss"}} {speculative_search.misses}',
+        f'speculative_search_total{{result="unused"}} {speculative_search.unused}'
+    ]
+
+
+registry.register_collector(_render_speculative_metrics)
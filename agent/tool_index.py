@@ -0,0 +1,87 @@
+"""
+MCP 툴 기능 인덱스
+
+서버가 노출하는 툴 목록을 연결 시점에 한 번 해석하여 기능(capability) → 툴
+매핑을 만듭니다. 검색 호출은 매번 툴 이름을 훑는 대신 dict 조회 한 번으로 툴을
+찾고, 서버가 재연결되면 해당 서버의 매핑만 다시 만듭니다.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 서버별 기능 → 툴 이름 후보 (앞에 있을수록 우선, 정확히 일치하는 이름을 먼저 찾고 없으면 부분 일치)
+CAPABILITY_CANDIDATES: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "naver_search_mcp": {
+        "web_search": ("search_webkr", "naver_web_search", "web_search", "search_web", "naver_search", "search"),
+        "shopping_search": ("search_shop", "naver_shopping_search", "shopping_search", "search_shopping", "shop"),
+        "news_search": ("search_news", "naver_news_search", "news_search", "news"),
+        "blog_search": ("search_blog", "naver_blog_search", "blog_search", "blog"),
+    },
+    "exa_search_mcp": {
+        "web_search": ("web_search_exa", "exa_search", "web_search", "search", "exa"),
+    },
+}
+
+
+def _tool_name(tool: Any) -> str:
+    return str(getattr(tool, "name", "")).lower()
+
+
+def resolve_capabilities(tools: Sequence[Any], candidates: Dict[str, Tuple[str, ...]]) -> Dict[str, Any]:
+    """툴 목록에서 기능별 툴 선택"""
+    by_name = {_tool_name(tool): tool for tool in tools}
+    resolved: Dict[str, Any] = {}
+
+    for capability, names in candidates.items():
+        tool = next((by_name[name] for name in names if name in by_name), None)
+        if tool is None:
+            tool = next(
+                (t for name in names for t in tools if name in _tool_name(t)),
+                None
+            )
+        if tool is not None:
+            resolved[capability] = tool
+
+    return resolved
+
+
+class ToolIndex:
+    """서버별 기능 → 툴 인덱스"""
+
+    def __init__(self, candidates: Optional[Dict[str, Dict[str, Tuple[str, ...]]]] = None):
+        self.candidates = candidates or CAPABILITY_CANDIDATES
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._tool_names: Dict[str, List[str]] = {}
+
+    def update(self, server: str, tools: Sequence[Any]) -> Dict[str, Any]:
+        """서버 연결 시 해당 서버 매핑 재구성"""
+        resolved = resolve_capabilities(tools, self.candidates.get(server, {}))
+        self._index[server] = resolved
+        self._tool_names[server] = [_tool_name(tool) for tool in tools]
+
+        missing = set(self.candidates.get(server, {})) - set(resolved)
+        if missing:
+            logger.debug(f"{server} 서버에서 찾지 못한 기능: {sorted(missing)}")
+        logger.info(f"{server} 툴 선택: { {cap: tool.name for cap, tool in resolved.items()} }")
+        return resolved
+
+    def clear(self, server: str):
+        """서버 연결 해제 시 매핑 제거"""
+        self._index.pop(server, None)
+        self._tool_names.pop(server, None)
+
+    def get(self, server: str, capability: str) -> Optional[Any]:
+        """기능에 해당하는 툴 (없으면 None)"""
+        return self._index.get(server, {}).get(capability)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """서버별 선택 결과 (상태 조회용)"""
+        return {
+            server: {
+                "selected": {capability: tool.name for capability, tool in resolved.items()},
+                "available": self._tool_names.get(server, [])
+            }
+            for server, resolved in self._index.items()
+        }
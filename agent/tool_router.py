@@ -0,0 +1,222 @@
+"""
+턴별 도구 선택 모듈
+
+에이전트가 매 단계 모든 도구(검색 도구, 두 MCP 서버의 원본 도구, 분석 도구)를
+바인딩하면 긴 docstring이 프롬프트를 채우고, 기능이 겹치는 도구 때문에 중복 호출이
+생깁니다. ToolRegistry는 같은 기능의 도구를 대표 도구 하나로 묶고, ToolRouter는
+사용자 메시지의 키워드로 이번 턴에 필요한 기능만 골라 바인딩할 도구를 정합니다.
+선택 결과는 메시지별로 캐시하며, 도구 스키마 토큰 수를 추정하여 절약량을 기록합니다.
+"""
+
+import json
+import re
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from agent.metrics import registry
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 기능 → 도구 이름 (앞에 있을수록 대표 도구로 우선)
+CAPABILITY_TOOLS: Dict[str, Tuple[str, ...]] = {
+    "product_search": ("naver_realtime_search", "search_shop", "naver_shopping_search", "search_naver_shopping"),
+    "web_search": (
+        "unified_search_tool", "naver_search_mcp", "exa_search_mcp",
+        "search_webkr", "web_search_exa", "search_exa", "search_blog"
+    ),
+    "product_info": ("naver_latest_product_search",),
+    "news": ("naver_news_search_tool", "search_news"),
+    "compare": ("compare_prices",),
+    "filter": ("filter_products",),
+    "price_history": ("check_price_history",),
+    "local_catalog": ("local_catalog_search",),
+}
+
+# 목록에 없는 도구 이름의 부분 문자열 → 기능
+_NAME_HINTS: Tuple[Tuple[str, str], ...] = (
+    ("shop", "product_search"),
+    ("news", "news"),
+    ("blog", "web_search"),
+    ("web", "web_search"),
+    ("search", "web_search"),
+)
+
+# 기능별 메시지 키워드
+CAPABILITY_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "web_search": ("리뷰", "후기", "추천", "정보", "어때", "차이", "vs", "장단점", "review"),
+    "product_info": ("출시", "신제품", "최신", "스펙", "사양", "신형", "성능"),
+    "news": ("뉴스", "소식", "발표", "루머", "news"),
+    "compare": ("비교", "최저", "싼", "싸", "저렴", "가성비", "얼마", "가격"),
+    "filter": ("이하", "이상", "이내", "필터", "평점", "정렬", "순으로", "골라", "중에", "만 보여"),
+    "price_history": ("이력", "역대", "최저가", "살까", "사도 될", "떨어", "내려", "시세", "변동", "오를"),
+    "local_catalog": ("아까", "방금", "이전", "앞에서", "다시", "또", "그거"),
+}
+
+# 검색 결과가 이미 있는 대화의 후속 질문에 포함할 기능
+FOLLOW_UP_CAPABILITIES = frozenset({"compare", "filter", "local_catalog"})
+
+# 키워드가 없을 때 기본 기능
+DEFAULT_CAPABILITIES = frozenset({"product_search"})
+
+_PRICE_RE = re.compile(r"\d+\s*(?:만\s*원|만원|천원|원)")
+
+TOOL_TOKENS_SAVED = registry.histogram(
+    "agent_tool_tokens_saved", "요청당 도구 선택으로 줄인 도구 스키마 토큰 수 (추정)",
+    buckets=(0, 250, 500, 1000, 2000, 4000, 8000, 16000)
+)
+
+
+def estimate_tool_tokens(tool: Any) -> int:
+    """도구 스키마 토큰 수 추정 (문자 수 / 4)"""
+    try:
+        schema = convert_to_openai_tool(tool)
+    except Exception:
+        schema = {"name": getattr(tool, "name", ""), "description": getattr(tool, "description", "")}
+    return len(json.dumps(schema, ensure_ascii=False)) // 4
+
+
+class ToolRegistry:
+    """기능 단위 도구 레지스트리 (이름 중복 제거, 같은 기능 도구 병합)"""
+
+    def __init__(self, tools: Sequence[Any]):
+        self.tools: Dict[str, Any] = {}
+        for tool in tools:
+            name = getattr(tool, "name", None)
+            if name and name not in self.tools:
+                self.tools[name] = tool
+
+        self.members: Dict[str, List[str]] = {}
+        for name in self.tools:
+            self.members.setdefault(self.capability_of(name), []).append(name)
+
+        # 기능별 대표 도구 (선호 순서상 가장 앞선 도구)
+        self.primary: Dict[str, str] = {}
+        for capability, names in self.members.items():
+            preferred = CAPABILITY_TOOLS.get(capability, ())
+            self.primary[capability] = min(
+                names, key=lambda name: preferred.index(name) if name in preferred else len(preferred)
+            )
+
+        self.tokens: Dict[str, int] = {name: estimate_tool_tokens(tool) for name, tool in self.tools.items()}
+
+    @staticmethod
+    def capability_of(name: str) -> str:
+        """도구 이름의 기능"""
+        for capability, names in CAPABILITY_TOOLS.items():
+            if name in names:
+                return capability
+        lowered = name.lower()
+        for hint, capability in _NAME_HINTS:
+            if hint in lowered:
+                return capability
+        return f"other:{name}"
+
+    def tools_for(self, capabilities: Iterable[str]) -> List[Any]:
+        """기능별 대표 도구 목록 (등록 순서 유지)"""
+        names = {self.primary[capability] for capability in capabilities if capability in self.primary}
+        return [tool for name, tool in self.tools.items() if name in names]
+
+    def merged_tools(self) -> List[Any]:
+        """중복 기능을 병합한 전체 대표 도구 목록"""
+        return self.tools_for(self.primary)
+
+    def total_tokens(self, tools: Optional[Iterable[Any]] = None) -> int:
+        """도구 스키마 토큰 합계 (기본값은 등록된 전체 도구)"""
+        if tools is None:
+            return sum(self.tokens.values())
+        return sum(self.tokens.get(tool.name, 0) for tool in tools)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """기능별 대표 도구와 병합된 도구 (상태 조회용)"""
+        return {
+            capability: {"primary": self.primary[capability], "merged": names}
+            for capability, names in self.members.items()
+        }
+
+
+class ToolRouter:
+    """키워드 기반 턴별 도구 선택기"""
+
+    def __init__(self, tools: Sequence[Any], cache_size: int = 512):
+        self.registry = ToolRegistry(tools)
+        self.full_tokens = self.registry.total_tokens()
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, bool], FrozenSet[str]]" = OrderedDict()
+
+    def route(self, text: str, has_results: bool = False) -> FrozenSet[str]:
+        """메시지에 필요한 기능 집합 (캐시)"""
+        key = (" ".join(text.lower().split()), has_results)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        lowered = key[0]
+        capabilities = set(DEFAULT_CAPABILITIES)
+        for capability, keywords in CAPABILITY_KEYWORDS.items():
+            if any(keyword in lowered for keyword in keywords):
+                capabilities.add(capability)
+        if _PRICE_RE.search(lowered):
+            capabilities.update(("filter", "compare"))
+        if has_results:
+            capabilities.update(FOLLOW_UP_CAPABILITIES)
+
+        # 목록에 없는 도구는 이름이 메시지에 나올 때만 선택
+        for capability in self.registry.primary:
+            if capability.startswith("other:") and capability[6:].lower() in lowered:
+                capabilities.add(capability)
+
+        result = frozenset(capabilities)
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def select(self, messages: Sequence[BaseMessage]) -> List[Any]:
+        """현재 턴에 바인딩할 도구 목록
+
+        마지막 사용자 메시지로 기능을 고르고, 이번 턴에 이미 호출한 도구의 기능을
+        더해 같은 턴의 다음 단계에서도 결과를 이어서 다룰 수 있게 합니다.
+        """
+        text = ""
+        called: List[str] = []
+        for message in reversed(messages):
+            if isinstance(message, HumanMessage):
+                text = str(message.content)
+                break
+            if isinstance(message, AIMessage):
+                called.extend(call["name"] for call in message.tool_calls or [])
+
+        has_results = any(
+            isinstance(message, ToolMessage) and '"result_id"' in str(message.content)
+            for message in messages
+        )
+
+        capabilities = set(self.route(text, has_results))
+        capabilities.update(self.registry.capability_of(name) for name in called)
+        return self.registry.tools_for(capabilities)
+
+    def tokens_saved(self, selected: Sequence[Any]) -> int:
+        """전체 도구 대비 줄인 스키마 토큰 수"""
+        return self.full_tokens - self.registry.total_tokens(selected)
+
+    def stats(self) -> Dict[str, Any]:
+        """선택기 상태"""
+        return {
+            "tools": len(self.registry.tools),
+            "full_tokens": self.full_tokens,
+            "merged_tokens": self.registry.total_tokens(self.registry.merged_tools()),
+            "cached_routes": len(self._cache),
+            "capabilities": self.registry.snapshot()
+        }
+
+
+def request_tokens_saved(trace: Any) -> int:
+    """요청 트레이스에 기록된 단계별 절약 토큰 합계"""
+    return sum(
+        span.attributes.get("tokens_saved", 0)
+        for span in list(trace.spans)
+        if span.name == "agent.tool_router"
+    )
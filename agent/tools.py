@@ -4,9 +4,13 @@
 
 import asyncio
 import random
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Union
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 from config import settings
+from agent.price_analytics import analyze_prices, filter_product_list
+from agent.price_history import get_price_history
+from agent.result_store import get_result_store, register_results, thread_id_from
 from agent.mcp_tools import get_shopping_tools_with_mcp
 
 
@@ -78,64 +82,115 @@ async def search_exa(query: str) -> List[Dict[str, Any]]:
     return dummy_results
 
 
+def _load_products(
+    result_id: Optional[str],
+    products: Optional[List[Dict[str, Any]]],
+    config: Optional[RunnableConfig]
+) -> Tuple[Union[List[Dict[str, Any]], Dict[str, Any]], Optional[tuple]]:
+    """핸들 또는 직접 전달된 상품 목록과 가격 분석 배치 캐시 키
+
+    핸들을 찾지 못하면 오류 dict를 반환합니다. 캐시 키는 핸들과 저장 시각으로 만들어
+    상품 내용을 순회하지 않고도 같은 결과의 배치를 재사용합니다.
+    """
+    if result_id:
+        thread_id = thread_id_from(config)
+        stored = get_result_store().get(thread_id, result_id)
+        if stored is None:
+            return {"error": f"검색 결과 {result_id}를 찾을 수 없습니다. 다시 검색해 주세요."}, None
+        return stored.items, (thread_id, result_id.strip(), stored.created_at)
+    return products or [], None
+
+
 @tool
-def compare_prices(products: List[Dict[str, Any]]) -> Dict[str, Any]:
+def compare_prices(
+    products: List[Dict[str, Any]] = None,
+    result_id: str = None,
+    config: RunnableConfig = None
+) -> Dict[str, Any]:
     """
     상품 가격 비교 및 분석
     
     Args:
-        products: 비교할 상품 리스트
+        products: 비교할 상품 리스트 (result_id를 쓸 수 없을 때만 사용)
+        result_id: 검색 도구가 반환한 결과 핸들 (예: "res_1")
     
     Returns:
         가격 분석 결과
     """
-    if not products:
-        return {"error": "비교할 상품이 없습니다."}
-    
-    prices = [p.get("price", 0) for p in products]
-    
-    analysis = {
-        "total_products": len(products),
-        "min_price": min(prices),
-        "max_price": max(prices),
-        "avg_price": sum(prices) // len(prices),
-        "price_range": max(prices) - min(prices),
-        "recommended_product": min(products, key=lambda x: x.get("price", float('inf'))),
-        "best_value": max(products, key=lambda x: x.get("rating", 0) * 100 / max(x.get("price", 1), 1))
-    }
-    
-    return analysis
+    items, batch_key = _load_products(result_id, products, config)
+    if isinstance(items, dict):
+        return items
+    return analyze_prices(items, key=batch_key)
 
 
 @tool
-def filter_products(products: List[Dict[str, Any]], 
-                   max_price: int = None, 
-                   min_rating: float = None,
-                   category: str = None) -> List[Dict[str, Any]]:
+def filter_products(
+    products: List[Dict[str, Any]] = None,
+    max_price: int = None,
+    min_rating: float = None,
+    category: str = None,
+    result_id: str = None,
+    min_price: int = None,
+    min_reviews: int = None,
+    sort_by: str = None,
+    limit: int = None,
+    config: RunnableConfig = None
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
-    상품 필터링
+    상품 필터링 및 정렬
     
     Args:
-        products: 필터링할 상품 리스트
+        products: 필터링할 상품 리스트 (result_id를 쓸 수 없을 때만 사용)
         max_price: 최대 가격
         min_rating: 최소 평점
         category: 카테고리
+        result_id: 검색 도구가 반환한 결과 핸들 (예: "res_1")
+        min_price: 최소 가격
+        min_reviews: 최소 리뷰 수
+        sort_by: 정렬 기준 (price, -price, rating, reviews)
+        limit: 최대 개수
     
     Returns:
-        필터링된 상품 리스트
+        필터링된 상품 리스트 (result_id로 호출하면 새 핸들과 함께 반환)
     """
-    filtered = products.copy()
-    
-    if max_price:
-        filtered = [p for p in filtered if p.get("price", 0) <= max_price]
+    items, batch_key = _load_products(result_id, products, config)
+    if isinstance(items, dict):
+        return items
+    
+    filtered = filter_product_list(
+        items,
+        max_price=max_price,
+        min_rating=min_rating,
+        category=category,
+        min_price=min_price,
+        min_reviews=min_reviews,
+        sort_by=sort_by,
+        limit=limit,
+        key=batch_key
+    )
+    if result_id:
+        # 필터 결과도 핸들로 등록하여 compare_prices 등에 이어서 사용
+        return register_results(config, filtered, query=f"{result_id} 필터", tool="filter_products")
+    return filtered
+
+
+@tool
+def check_price_history(product_name: str, current_price: int = None) -> Dict[str, Any]:
+    """
+    상품 가격 이력 조회 - 지금 가격이 좋은 가격인지 판단할 때 사용
     
-    if min_rating:
-        filtered = [p for p in filtered if p.get("rating", 0) >= min_rating]
+    Args:
+        product_name: 상품명 (검색 결과의 title)
+        current_price: 비교할 현재 가격 (없으면 가장 최근 관측 가격)
     
-    if category:
-        filtered = [p for p in filtered if p.get("category", "").lower() == category.lower()]
+    Returns:
+        최저가, 중앙값, 30일 최저가와 평가 결과
+    """
+    history = get_price_history()
+    if history is None:
+        return {"error": "가격 이력 저장소를 사용할 수 없습니다."}
     
-    return filtered
+    return history.assess(product_name, current_price)
 
 
 async def get_shopping_tools() -> List:
@@ -147,21 +202,26 @@ async def get_shopping_tools() -> List:
         # 추가 분석 도구
         analysis_tools = [
             compare_prices,
-            filter_products
+            filter_products,
+            check_price_history
         ]
         
-        return mcp_tools + analysis_tools
+        # 같은 이름의 이전 분석 도구는 결과 핸들을 지원하는 도구로 대체
+        analysis_names = {t.name for t in analysis_tools}
+        return [t for t in mcp_tools if getattr(t, "name", None) not in analysis_names] + analysis_tools
         
     except Exception as e:
         # 에러 시 기본 도구만 반환
         return [
             compare_prices,
-            filter_products
+            filter_products,
+            check_price_history
         ]
 
 
 # 사용 가능한 모든 툴 목록 (호환성을 위해 유지)
 AVAILABLE_TOOLS = [
     compare_prices,
-    filter_products
+    filter_products,
+    check_price_history
 ] 
\ No newline at end of file
@@ -7,6 +7,7 @@ import random
 from typing import List, Dict, Any
 from langchain_core.tools import tool
 from config import settings
+from agent.price_analytics import analyze_prices, filter_product_list
 
 
 @tool
@@ -88,22 +89,7 @@ def compare_prices(products: List[Dict[str, Any]]) -> Dict[str, Any]:
     Returns:
         가격 분석 결과
     """
-    if not products:
-        return {"error": "비교할 상품이 없습니다."}
-    
-    prices = [p.get("price", 0) for p in products]
-    
-    analysis = {
-        "total_products": len(products),
-        "min_price": min(prices),
-        "max_price": max(prices),
-        "avg_price": sum(prices) // len(prices),
-        "price_range": max(prices) - min(prices),
-        "recommended_product": min(products, key=lambda x: x.get("price", float('inf'))),
-        "best_value": max(products, key=lambda x: x.get("rating", 0) * 100 / max(x.get("price", 1), 1))
-    }
-    
-    return analysis
+    return analyze_prices(products)
 
 
 @tool
@@ -123,18 +109,7 @@ def filter_products(products: List[Dict[str, Any]],
     Returns:
         필터링된 상품 리스트
     """
-    filtered = products.copy()
-    
-    if max_price:
-        filtered = [p for p in filtered if p.get("price", 0) <= max_price]
-    
-    if min_rating:
-        filtered = [p for p in filtered if p.get("rating", 0) >= min_rating]
-    
-    if category:
-        filtered = [p for p in filtered if p.get("category", "").lower() == category.lower()]
-    
-    return filtered
+    return filter_product_list(products, max_price=max_price, min_rating=min_rating, category=category)
 
 
 def get_shopping_tools() -> List:
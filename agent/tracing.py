@@ -0,0 +1,323 @@
+"""
+요청 단위 경량 트레이싱 모듈
+
+routes에서 생성한 request id를 contextvars로 에이전트 노드, 도구, 검색 클라이언트까지
+전파하고, 각 구간을 span으로 기록합니다. 완료된 트레이스는 로컬 JSONL 파일 또는
+OTLP/HTTP(JSON) 호환 수집기로 백그라운드 스레드에서 내보냅니다.
+"""
+
+import abc
+import json
+import os
+import queue
+import threading
+import time
+import urllib.request
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """단일 구간 기록"""
+
+    __slots__ = ("span_id", "parent_id", "name", "start", "end", "attributes")
+
+    def __init__(self, name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.attributes = attributes
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+
+class Trace:
+    """요청 하나의 span 모음"""
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.trace_id = uuid.uuid4().hex
+        self.started_at = time.perf_counter()
+        self.started_wall = time.time()
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def start_span(self, name: str, parent_id: Optional[str] = None, **attributes: Any) -> Span:
+        span = Span(name, parent_id, attributes)
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    def record(self, name: str, duration: float, **attributes: Any):
+        """이미 측정된 구간을 span으로 추가"""
+        span = Span(name, None, attributes)
+        span.start = time.perf_counter() - duration
+        span.end = span.start + duration
+        with self._lock:
+            self.spans.append(span)
+
+    def breakdown(self) -> Dict[str, Any]:
+        """디버그용 구간별 시간 요약 (ms)"""
+        totals: Dict[str, Dict[str, float]] = {}
+        for span in list(self.spans):
+            entry = totals.setdefault(span.name, {"count": 0, "total_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += span.duration * 1000
+
+        return {
+            "request_id": self.request_id,
+            "elapsed_ms": round((time.perf_counter() - self.started_at) * 1000, 1),
+            "spans": {
+                name: {"count": int(entry["count"]), "total_ms": round(entry["total_ms"], 1)}
+                for name, entry in sorted(totals.items(), key=lambda item: -item[1]["total_ms"])
+            }
+        }
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """내보내기용 span 레코드"""
+        records = []
+        for span in list(self.spans):
+            offset = span.start - self.started_at
+            records.append({
+                "trace_id": self.trace_id,
+                "request_id": self.request_id,
+                "span_id": span.span_id,
+                "parent_id": span.parent_id,
+                "name": span.name,
+                "start_time": self.started_wall + offset,
+                "duration_ms": round(span.duration * 1000, 3),
+                "attributes": span.attributes
+            })
+        return records
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span_id: ContextVar[Optional[str]] = ContextVar("current_span_id", default=None)
+
+
+def new_request_id() -> str:
+    """요청 ID 생성"""
+    return uuid.uuid4().hex[:16]
+
+
+def start_trace(request_id: Optional[str] = None) -> Trace:
+    """새 트레이스를 시작하고 현재 컨텍스트에 설정"""
+    trace = Trace(request_id or new_request_id())
+    _current_trace.set(trace)
+    _current_span_id.set(None)
+    return trace
+
+
+def current_trace() -> Optional[Trace]:
+    """현재 컨텍스트의 트레이스"""
+    return _current_trace.get()
+
+
+def current_request_id() -> Optional[str]:
+    """현재 컨텍스트의 요청 ID"""
+    trace = _current_trace.get()
+    return trace.request_id if trace else None
+
+
+@contextmanager
+def span(name: str, **attributes: Any):
+    """현재 트레이스에 span 기록 (트레이스가 없으면 아무것도 하지 않음)"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    current = trace.start_span(name, _current_span_id.get(), **attributes)
+    token = _current_span_id.set(current.span_id)
+    try:
+        yield current
+    except BaseException as e:
+        current.attributes["error"] = type(e).__name__
+        raise
+    finally:
+        current.end = time.perf_counter()
+        _current_span_id.reset(token)
+
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """LLM/도구 실행과 그래프 노드를 span으로 기록하는 콜백 핸들러"""
+
+    run_inline = True
+
+    _traced_chains = {"agent", "tools"}
+
+    def __init__(self):
+        self._spans: Dict[UUID, Span] = {}
+
+    def _start(self, run_id: UUID, name: str, **attributes: Any):
+        trace = _current_trace.get()
+        if trace is not None:
+            self._spans[run_id] = trace.start_span(name, _current_span_id.get(), **attributes)
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None):
+        current = self._spans.pop(run_id, None)
+        if current is not None:
+            current.end = time.perf_counter()
+            if error is not None:
+                current.attributes["error"] = type(error).__name__
+
+    def on_chain_start(self, serialized, inputs, *, run_id: UUID, **kwargs: Any):
+        name = kwargs.get("name")
+        if name in self._traced_chains:
+            self._start(run_id, f"graph.{name}")
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs: Any):
+        self._end(run_id)
+
+    def on_chain_error(self, error, *, run_id: UUID, **kwargs: Any):
+        self._end(run_id, error)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs: Any):
+        self._start(run_id, "llm.call")
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs: Any):
+        self._start(run_id, "llm.call")
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any):
+        self._end(run_id)
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs: Any):
+        self._end(run_id, error)
+
+    def on_tool_start(self, serialized, input_str, *, run_id: UUID, **kwargs: Any):
+        name = (serialized or {}).get("name") or kwargs.get("name") or "unknown"
+        self._start(run_id, f"tool.{name}")
+
+    def on_tool_end(self, output, *, run_id: UUID, **kwargs: Any):
+        self._end(run_id)
+
+    def on_tool_error(self, error, *, run_id: UUID, **kwargs: Any):
+        self._end(run_id, error)
+
+
+tracing_callback = TracingCallbackHandler()
+
+
+class SpanExporter(abc.ABC):
+    """백그라운드 스레드에서 트레이스를 내보내는 기본 클래스"""
+
+    def __init__(self):
+        self._queue: "queue.Queue[Trace]" = queue.Queue(maxsize=1000)
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def export(self, trace: Trace):
+        """트레이스 내보내기 요청 (가득 차면 버림)"""
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            logger.warning("트레이스 내보내기 대기열이 가득 차 트레이스를 버립니다")
+
+    def _run(self):
+        while True:
+            trace = self._queue.get()
+            try:
+                self._write(trace.to_records())
+            except Exception as e:
+                logger.warning(f"트레이스 내보내기 실패: {e}")
+
+    @abc.abstractmethod
+    def _write(self, records: List[Dict[str, Any]]):
+        """스팬 레코드 기록 (하위 클래스 구현)"""
+
+
+class JsonlSpanExporter(SpanExporter):
+    """로컬 JSONL 파일 내보내기"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        super().__init__()
+
+    def _write(self, records: List[Dict[str, Any]]):
+        with open(self.path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class OTLPHttpSpanExporter(SpanExporter):
+    """OTLP/HTTP(JSON) 호환 수집기 내보내기"""
+
+    def __init__(self, endpoint: str):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        super().__init__()
+
+    def _write(self, records: List[Dict[str, Any]]):
+        spans = []
+        for record in records:
+            start_ns = int(record["start_time"] * 1e9)
+            attributes = [{"key": "request_id", "value": {"stringValue": record["request_id"]}}]
+            attributes.extend(
+                {"key": key, "value": {"stringValue": str(value)}}
+                for key, value in record["attributes"].items()
+            )
+            spans.append({
+                "traceId": record["trace_id"],
+                "spanId": record["span_id"],
+                "parentSpanId": record["parent_id"] or "",
+                "name": record["name"],
+                "startTimeUnixNano": str(start_ns),
+                "endTimeUnixNano": str(start_ns + int(record["duration_ms"] * 1e6)),
+                "attributes": attributes
+            })
+
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "shopping-chatbot"}}]},
+                "scopeSpans": [{"scope": {"name": "agent.tracing"}, "spans": spans}]
+            }]
+        }
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=5):
+            pass
+
+
+_exporter: Optional[SpanExporter] = None
+
+
+def _get_exporter() -> Optional[SpanExporter]:
+    """설정에 맞는 내보내기 싱글톤"""
+    global _exporter
+
+    if _exporter is None:
+        kind = settings.trace_exporter.lower()
+        if kind == "jsonl":
+            _exporter = JsonlSpanExporter(settings.trace_file_path)
+        elif kind == "otlp":
+            _exporter = OTLPHttpSpanExporter(settings.otlp_endpoint)
+
+    return _exporter
+
+
+def finish_trace(trace: Optional[Trace]):
+    """트레이스 종료 및 내보내기"""
+    if trace is None:
+        return
+
+    exporter = _get_exporter()
+    if exporter is not None:
+        exporter.export(trace)
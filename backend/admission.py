@@ -0,0 +1,216 @@
+"""
+요청 수락 제어 (Admission Control)
+
+/chat, /chat/stream 요청은 LLM 호출과 여러 번의 네이버 API 호출을 점유하므로
+전역/사용자별 동시 실행 수를 제한하고, 초과 요청은 제한된 대기열에서 기다리거나
+즉시 429/503으로 거절합니다.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+from config import settings
+from agent.metrics import registry
+
+
+class AdmissionRejected(Exception):
+    """수락 거절 예외 (HTTP 상태 코드와 Retry-After 포함)"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionTicket:
+    """수락된 요청의 슬롯 (release는 여러 번 호출해도 안전)"""
+
+    def __init__(self, controller: "AdmissionController", user_key: Optional[str]):
+        self.controller = controller
+        self.user_key = user_key
+        self.started_at = time.monotonic()
+        self.released = False
+
+    def release(self):
+        """슬롯 반환"""
+        if not self.released:
+            self.released = True
+            self.controller._release(self)
+
+
+class AdmissionController:
+    """전역/사용자별 동시성 제한과 제한된 대기열"""
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_per_user: int,
+        max_queue: int,
+        queue_timeout: float,
+        sample_size: int = 512
+    ):
+        """컨트롤러 초기화"""
+        self.max_concurrent = max_concurrent
+        self.max_per_user = max_per_user
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._user_counts: Dict[str, int] = {}
+        self._wait_times = deque(maxlen=sample_size)
+        self._service_times = deque(maxlen=sample_size)
+
+        self.active = 0
+        self.queued = 0
+        self.admitted_total = 0
+        self.rejected_user_limit = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """세마포어 지연 생성 (실행 중인 이벤트 루프에 바인딩)"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphore
+
+    async def acquire(self, user_key: Optional[str] = None) -> AdmissionTicket:
+        """슬롯 획득 (거절 시 AdmissionRejected)"""
+        semaphore = self._get_semaphore()
+
+        if user_key and self._user_counts.get(user_key, 0) >= self.max_per_user:
+            self.rejected_user_limit += 1
+            raise AdmissionRejected(429, "사용자별 동시 요청 한도를 초과했습니다", self._retry_after())
+
+        if semaphore.locked() and self.queued >= self.max_queue:
+            self.rejected_queue_full += 1
+            raise AdmissionRejected(503, "서버 대기열이 가득 찼습니다", self._retry_after())
+
+        if user_key:
+            self._user_counts[user_key] = self._user_counts.get(user_key, 0) + 1
+
+        self.queued += 1
+        wait_started = time.monotonic()
+        # wait_for는 Python 3.12 미만에서 타임아웃과 획득이 겹치면 허가를 잃을 수 있으므로
+        # 획득을 별도 작업으로 기다리고, 포기한 뒤에 얻은 허가는 되돌려줍니다.
+        waiter = asyncio.ensure_future(semaphore.acquire())
+        try:
+            await asyncio.wait({waiter}, timeout=self.queue_timeout)
+        except BaseException:
+            self._abandon(waiter)
+            self._decrement_user(user_key)
+            raise
+        finally:
+            self.queued -= 1
+
+        if not waiter.done():
+            self._abandon(waiter)
+            self._decrement_user(user_key)
+            self.rejected_timeout += 1
+            raise AdmissionRejected(503, "서버가 혼잡하여 요청을 처리할 수 없습니다", self._retry_after())
+
+        self._wait_times.append(time.monotonic() - wait_started)
+        self.active += 1
+        self.admitted_total += 1
+        return AdmissionTicket(self, user_key)
+
+    @asynccontextmanager
+    async def slot(self, user_key: Optional[str] = None):
+        """슬롯 컨텍스트 매니저"""
+        ticket = await self.acquire(user_key)
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+
+    def _release(self, ticket: AdmissionTicket):
+        """슬롯 반환 처리"""
+        self._service_times.append(time.monotonic() - ticket.started_at)
+        self.active -= 1
+        self._decrement_user(ticket.user_key)
+        self._get_semaphore().release()
+
+    def _abandon(self, waiter: "asyncio.Future[bool]"):
+        """포기한 획득 작업 정리 (취소 전에 이미 얻은 허가는 반환)"""
+        semaphore = self._get_semaphore()
+
+        def release_if_acquired(done: "asyncio.Future[bool]"):
+            if not done.cancelled() and done.exception() is None:
+                semaphore.release()
+
+        waiter.cancel()
+        waiter.add_done_callback(release_if_acquired)
+
+    def _decrement_user(self, user_key: Optional[str]):
+        """사용자별 카운트 감소"""
+        if not user_key:
+            return
+
+        count = self._user_counts.get(user_key, 0) - 1
+        if count > 0:
+            self._user_counts[user_key] = count
+        else:
+            self._user_counts.pop(user_key, None)
+
+    def _retry_after(self) -> int:
+        """Retry-After 초 계산 (최근 평균 처리 시간 기준)"""
+        if not self._service_times:
+            return 1
+        avg_service = sum(self._service_times) / len(self._service_times)
+        return max(1, math.ceil(avg_service))
+
+    @staticmethod
+    def _percentile(samples, q: float) -> float:
+        """단순 백분위수 계산"""
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(q * len(ordered)))
+        return ordered[index]
+
+    def stats(self) -> Dict[str, Any]:
+        """수락 제어 통계"""
+        waits = list(self._wait_times)
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_per_user": self.max_per_user,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queue_depth": self.queued,
+            "admitted_total": self.admitted_total,
+            "rejected": {
+                "user_limit": self.rejected_user_limit,
+                "queue_full": self.rejected_queue_full,
+                "timeout": self.rejected_timeout
+            },
+            "wait_time_avg_ms": round(sum(waits) / len(waits) * 1000, 1) if waits else 0.0,
+            "wait_time_p95_ms": round(self._percentile(waits, 0.95) * 1000, 1)
+        }
+
+
+# 전역 수락 제어 인스턴스
+admission_controller = AdmissionController(
+    max_concurrent=settings.max_concurrent_requests,
+    max_per_user=settings.max_requests_per_user,
+    max_queue=settings.admission_queue_size,
+    queue_timeout=settings.admission_queue_timeout
+)
+
+
+def _render_admission_metrics() -> List[str]:
+    """수락 제어 메트릭 (스크레이프 시점 수집)"""
+    stats = admission_controller.stats()
+    return [
+        "# TYPE admission_active_requests gauge",
+        f"admission_active_requests {stats['active']}",
+        "# TYPE admission_queue_depth gauge",
+        f"admission_queue_depth {stats['queue_depth']}",
+        "# TYPE admission_rejected_total counter",
+        *[f'admission_rejected_total{{reason="{reason}"}} {count}' for reason, count in stats["rejected"].items()]
+    ]
+
+
+registry.register_collector(_render_admission_metrics)
@@ -3,13 +3,25 @@
 """
 
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from agent.agent import ShoppingAgent
+from agent.search_cache import get_cache_stats
+from agent.price_history import get_price_history
+from agent.prefetch import prefetcher
+from agent.speculative import speculative_search
+from agent.resilience import get_breaker_stats
+from agent.mcp_client import get_mcp_tool_selection
+from agent.metrics import RESPONSE_TIME, TIME_TO_FIRST_TOKEN, render_metrics
+from agent.tracing import finish_trace, new_request_id, span, start_trace
+from backend.admission import AdmissionRejected, AdmissionTicket, admission_controller
+import os
 import uuid
 import logging
 import json
+import time
 import asyncio
 
 # 로깅 설정
@@ -48,12 +60,14 @@ class ChatRequest(BaseModel):
     message: str
     session_id: Optional[str] = None
     user_id: Optional[str] = None
+    debug: bool = False  # True이면 done 이벤트에 구간별 시간 분석 포함
 
 
 class ChatResponse(BaseModel):
     response: str
     session_id: str
     user_id: Optional[str] = None
+    products: List[Dict[str, Any]] = []
 
 
 class HistoryResponse(BaseModel):
@@ -61,24 +75,66 @@ class HistoryResponse(BaseModel):
     session_id: str
 
 
-async def generate_sse_stream(message: str, session_id: str, user_id: Optional[str] = None):
+def _admission_key(request: ChatRequest) -> Optional[str]:
+    """사용자별 동시성 제한 키 (user_id 우선, 없으면 session_id)"""
+    return request.user_id or request.session_id
+
+
+async def _admit(request: ChatRequest) -> AdmissionTicket:
+    """요청 수락 (거절 시 429/503 + Retry-After)"""
+    try:
+        return await admission_controller.acquire(_admission_key(request))
+    except AdmissionRejected as e:
+        logger.warning(f"⛔ 요청 거절: {e.status_code} {e.detail}")
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.detail,
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+
+async def generate_sse_stream(
+    message: str,
+    session_id: str,
+    user_id: Optional[str] = None,
+    ticket: Optional[AdmissionTicket] = None,
+    started_at: Optional[float] = None,
+    request_id: Optional[str] = None,
+    debug: bool = False
+):
     """SSE 스트리밍 데이터 생성"""
+    started_at = started_at or time.perf_counter()
+    first_token_recorded = False
+    trace = start_trace(request_id)
+    pacing_delay = 0.0
     try:
         agent = await ensure_agent_ready()
         if agent is None:
             yield f"data: {json.dumps({'type': 'error', 'error': 'ShoppingAgent not available'})}\n\n"
             return
         
-        logger.info(f"🔄 스트리밍 시작: session={session_id}")
+        logger.info(f"🔄 스트리밍 시작: session={session_id}, request={trace.request_id}")
         
         # 실제 스트리밍 AI 응답 생성
         async for chunk in agent.process_message_stream(
             message=message,
             session_id=session_id,
-            user_id=user_id
+            user_id=user_id,
+            request_id=trace.request_id,
+            debug=debug
         ):
+            if not first_token_recorded and chunk.get("type") == "content":
+                TIME_TO_FIRST_TOKEN.observe(time.perf_counter() - started_at, "/chat/stream")
+                first_token_recorded = True
+            if chunk.get("type") == "done" and "timing" in chunk:
+                chunk["timing"]["spans"]["sse.pacing_delay"] = {
+                    "count": 1, "total_ms": round(pacing_delay * 1000, 1)
+                }
             yield f"data: {json.dumps(chunk)}\n\n"
+            
+            delay_started = time.perf_counter()
             await asyncio.sleep(0.01)  # 약간의 지연
+            pacing_delay += time.perf_counter() - delay_started
         
         # 스트리밍 완료 신호
         yield f"data: [DONE]\n\n"
@@ -90,6 +146,13 @@ async def generate_sse_stream(message: str, session_id: str, user_id: Optional[s
         error_data = {"type": "error", "error": str(e)}
         yield f"data: {json.dumps(error_data)}\n\n"
         yield f"data: [DONE]\n\n"
+    
+    finally:
+        RESPONSE_TIME.observe(time.perf_counter() - started_at, "/chat/stream")
+        trace.record("sse.pacing_delay", pacing_delay)
+        finish_trace(trace)
+        if ticket is not None:
+            ticket.release()
 
 
 # 헬스 체크
@@ -112,19 +175,29 @@ async def health_check():
 @router.post("/chat/stream")
 async def chat_stream(request: ChatRequest):
     """SSE 스트리밍 방식 대화 처리"""
+    started_at = time.perf_counter()
     if not request.message.strip() and request.message != "":
         raise HTTPException(status_code=400, detail="메시지가 필요합니다")
     
     # 세션 ID 생성 (없는 경우)
     session_id = request.session_id or str(uuid.uuid4())
     user_id = request.user_id
+    request_id = new_request_id()
+    
+    logger.info(f"📡 SSE 스트리밍 요청: session={session_id}, request={request_id}")
     
-    logger.info(f"📡 SSE 스트리밍 요청: session={session_id}")
+    # 스트림이 끝날 때까지 슬롯 유지 (클라이언트가 끊어도 백그라운드 태스크로 반환)
+    ticket = await _admit(request)
     
     return StreamingResponse(
-        generate_sse_stream(request.message, session_id, user_id),
+        generate_sse_stream(
+            request.message, session_id, user_id, ticket, started_at,
+            request_id=request_id, debug=request.debug
+        ),
         media_type="text/event-stream",
+        background=BackgroundTask(ticket.release),
         headers={
+            "X-Request-ID": request_id,
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
             "Access-Control-Allow-Origin": "*",
@@ -137,30 +210,37 @@ async def chat_stream(request: ChatRequest):
 @router.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """멀티턴 대화 처리"""
+    started_at = time.perf_counter()
     agent = await ensure_agent_ready()
     if agent is None:
         raise HTTPException(status_code=503, detail="ShoppingAgent not available")
     
+    ticket = await _admit(request)
+    trace = start_trace()
+    
     try:
         # 세션 ID 생성 (없는 경우)
         session_id = request.session_id or str(uuid.uuid4())
         user_id = request.user_id
         
-        logger.info(f"📩 메시지 처리: session={session_id}, user={user_id}")
+        logger.info(f"📩 메시지 처리: session={session_id}, user={user_id}, request={trace.request_id}")
         
         # 에이전트로 메시지 처리
-        response = await agent.process_message(
-            message=request.message,
-            session_id=session_id,
-            user_id=user_id
-        )
+        with span("agent.process_message"):
+            result = await agent.process_message_with_products(
+                message=request.message,
+                session_id=session_id,
+                user_id=user_id
+            )
         
+        response = result["response"]
         logger.info(f"✅ 응답 생성 완료: {len(response)}자")
         
         return ChatResponse(
             response=response,
             session_id=session_id,
-            user_id=user_id
+            user_id=user_id,
+            products=result["products"]
         )
         
     except Exception as e:
@@ -169,6 +249,11 @@ async def chat(request: ChatRequest):
             status_code=500, 
             detail=f"메시지 처리 중 오류가 발생했습니다: {str(e)}"
         )
+    
+    finally:
+        RESPONSE_TIME.observe(time.perf_counter() - started_at, "/chat")
+        finish_trace(trace)
+        ticket.release()
 
 
 # 대화 히스토리 조회
@@ -219,6 +304,25 @@ async def clear_session(session_id: str):
         )
 
 
+# 상품 가격 이력 조회
+@router.get("/prices/history")
+async def get_price_history_stats(title: str, current_price: Optional[int] = None, days: int = 30):
+    """상품 가격 이력 통계 (최저가/중앙값/기간 최저가)"""
+    history = get_price_history()
+    if history is None:
+        raise HTTPException(status_code=503, detail="가격 이력 저장소를 사용할 수 없습니다")
+    
+    # SQLite 조회는 이벤트 루프를 막지 않도록 스레드에서 실행
+    return await asyncio.to_thread(history.assess, title, current_price, days)
+
+
+# Prometheus 메트릭
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus 텍스트 형식 메트릭"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 # 에이전트 상태 조회
 @router.get("/agent/status")
 async def get_agent_status():
@@ -228,8 +332,16 @@ async def get_agent_status():
     
     return {
         "status": "ready",
-        "checkpointer": "InMemorySaver",
-        "store": "InMemoryStore",
+        "checkpointer": type(shopping_agent.checkpointer).__name__,
+        "store": type(shopping_agent.store).__name__,
+        "worker_pid": os.getpid(),
+        "search_cache": get_cache_stats(),
+        "prefetch": prefetcher.stats(),
+        "speculative_search": speculative_search.stats(),
+        "circuit_breakers": get_breaker_stats(),
+        "mcp_tools": get_mcp_tool_selection(),
+        "admission": admission_controller.stats(),
         "tools_count": len(shopping_agent.tools),
+        "tool_router": shopping_agent.tool_router.stats() if shopping_agent.tool_router else None,
         "graph_compiled": shopping_agent.graph is not None
     } 
\ No newline at end of file
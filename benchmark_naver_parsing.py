@@ -0,0 +1,140 @@
+"""
+네이버 응답 파싱 벤치마크
+- 기존 구현 (response.json() 표준 디코더, 필드별 replace 체인, 날짜 문자열 그대로)
+- 파싱 파이프라인 (orjson 디코딩, 단일 패스 태그/엔티티 제거, 응답당 수집 시각 1회, 날짜 epoch 변환)
+
+녹화한 네이버 응답(JSON 파일)을 인자로 주면 그 응답을, 없으면 실제 응답 형식의
+합성 응답(강조 태그와 HTML 엔티티 포함)을 사용합니다.
+
+실행: python benchmark_naver_parsing.py [응답.json ...]
+"""
+
+import json
+import random
+import sys
+import os
+import time
+from datetime import datetime
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from agent.models import Product, SearchHit
+from agent.naver_parsing import ORJSON_AVAILABLE, loads, parse_items
+from agent.product_events import parse_price
+
+ENDPOINTS = ("webkr", "news", "blog", "shop")
+
+
+def make_payload(endpoint: str, n: int) -> bytes:
+    """네이버 검색 API 응답 형식의 합성 응답 (강조 태그는 대부분, 엔티티는 일부 항목에 포함)"""
+    rng = random.Random(42)
+    words = ["아이폰", "15", "프로", "자급제", "정품", "케이스", "리뷰", "사용기", "최저가", "배송", "할인", "카메라", "배터리"]
+    markup = ["&quot;정품&quot;", "AT&amp;T", "&#39;특가&#39;", "&lt;한정&gt;"]
+    
+    def text(k: int) -> str:
+        tokens = rng.choices(words, k=k)
+        tokens[0] = f"<b>{tokens[0]}</b>"
+        if rng.random() < 0.2:
+            tokens.append(rng.choice(markup))
+        return " ".join(tokens)
+    
+    items = []
+    for i in range(n):
+        item = {"title": text(6), "link": f"https://example.com/{endpoint}/{i}", "description": text(25)}
+        if endpoint == "news":
+            item["pubDate"] = "Mon, 19 Oct 2026 09:%02d:00 +0900" % (i % 60)
+        elif endpoint == "blog":
+            item.update(bloggername="리뷰 블로그", postdate="202610%02d" % (1 + i % 28))
+        elif endpoint == "shop":
+            item.update(lprice=str(rng.randint(1000, 2000000)), mallName="네이버", brand="Apple", category1="디지털/가전")
+        items.append(item)
+    return json.dumps({"total": n, "display": n, "items": items}, ensure_ascii=False).encode()
+
+
+def _strip_tags(text: str) -> str:
+    return text.replace("<b>", "").replace("</b>", "")
+
+
+def baseline(endpoint: str, body: bytes):
+    """기존 구현 방식 (표준 디코더, replace 체인, 문자열 날짜)"""
+    items = json.loads(body).get("items", [])
+    timestamp = datetime.now().isoformat()
+    if endpoint == "shop":
+        return [
+            Product(
+                title=_strip_tags(item.get("title", "")),
+                price=parse_price(item.get("lprice")),
+                mall=item.get("mallName", ""),
+                brand=item.get("brand", ""),
+                category=item.get("category1", ""),
+                content=_strip_tags(item.get("description", "")),
+                url=item.get("link", ""),
+                source="naver_shopping",
+                timestamp=timestamp
+            )
+            for item in items
+        ]
+    extra_keys = {"news": ("pubDate",), "blog": ("bloggername", "postdate")}.get(endpoint, ())
+    return [
+        SearchHit(
+            title=_strip_tags(item.get("title", "")),
+            content=_strip_tags(item.get("description", "")),
+            url=item.get("link", ""),
+            source=f"naver_{endpoint}",
+            timestamp=timestamp,
+            extra={key: item.get(key, "") for key in extra_keys} or None
+        )
+        for item in items
+    ]
+
+
+def pipeline(endpoint: str, body: bytes):
+    """파싱 파이프라인"""
+    return parse_items(endpoint, loads(body).get("items", []))
+
+
+def timed(func, *args, repeat: int = 20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(*args)
+    return result, (time.perf_counter() - start) * 1000 / repeat
+
+
+def run(label: str, endpoint: str, body: bytes):
+    old, baseline_ms = timed(baseline, endpoint, body)
+    new, pipeline_ms = timed(pipeline, endpoint, body)
+    leaked = sum(("&" in hit.title or "&" in hit.content) for hit in old)
+    wasted = sum(len(hit.title) + len(hit.content) for hit in old) - sum(len(hit.title) + len(hit.content) for hit in new)
+    
+    assert len(old) == len(new)
+    assert not any("&" in hit.title or "<b>" in hit.content for hit in new if "AT&T" not in hit.title + hit.content)
+    
+    print(f"📦 {label}: {len(new):,}개 항목, {len(body) / 1024:,.0f} KB")
+    print(f"   기존 구현:        {baseline_ms:8.2f} ms  (엔티티가 남은 항목 {leaked:,}개, 불필요한 문자 {wasted:,}자)")
+    print(f"   파싱 파이프라인:  {pipeline_ms:8.2f} ms  ({baseline_ms / max(pipeline_ms, 1e-6):.1f}배)")
+
+
+def endpoint_of(payload: dict) -> str:
+    """녹화된 응답의 엔드포인트 추정"""
+    item = (payload.get("items") or [{}])[0]
+    if "lprice" in item:
+        return "shop"
+    if "postdate" in item:
+        return "blog"
+    if "pubDate" in item:
+        return "news"
+    return "webkr"
+
+
+if __name__ == "__main__":
+    print(f"JSON 디코더: {'orjson' if ORJSON_AVAILABLE else 'json (orjson 미설치)'}")
+    
+    if sys.argv[1:]:
+        for path in sys.argv[1:]:
+            with open(path, "rb") as f:
+                body = f.read()
+            run(os.path.basename(path), endpoint_of(json.loads(body)), body)
+    else:
+        for endpoint in ENDPOINTS:
+            run(f"{endpoint} 합성 응답", endpoint, make_payload(endpoint, 10_000))
@@ -0,0 +1,101 @@
+"""
+가격 분석 벤치마크
+- 기존 순수 파이썬 구현 (min/max/avg 개별 순회, 조건별 리스트 컴프리헨션)
+- ProductBatch 벡터 연산 (배치 생성 1회 + 통계/필터 재사용)
+
+배치 생성은 검색 결과당 한 번만 일어나고 이후 분석 도구 호출에서 재사용되므로
+생성 비용과 분석 비용을 나누어 출력합니다.
+
+실행: python benchmark_price_analytics.py [상품 수 ...]
+"""
+
+import random
+import sys
+import os
+import time
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from agent.price_analytics import ProductBatch
+
+
+def make_products(n: int):
+    """네이버 쇼핑 형식(문자열 lprice)의 더미 상품 생성"""
+    rng = random.Random(42)
+    categories = ["전자제품", "의류", "생활용품", "스포츠", "도서"]
+    return [
+        {
+            "title": f"상품 {i}",
+            "lprice": str(rng.randint(1000, 2000000)),
+            "rating": round(rng.uniform(1.0, 5.0), 1),
+            "review_count": rng.randint(0, 5000),
+            "category": rng.choice(categories),
+            "url": f"https://shopping.naver.com/product/{i}"
+        }
+        for i in range(n)
+    ]
+
+
+# 한 검색 결과에 대해 반복되는 필터 조건 (에이전트가 조건을 바꿔 가며 재호출)
+FILTERS = [
+    {"max_price": 500000, "min_rating": 4.0, "category": "전자제품"},
+    {"max_price": 300000},
+    {"min_rating": 4.5},
+    {"category": "의류", "max_price": 100000},
+    {"max_price": 1000000, "min_rating": 3.0}
+]
+
+
+def baseline(products):
+    """기존 구현 방식 (min/max/avg 개별 순회, 조건별 리스트 컴프리헨션)"""
+    prices = [int(p.get("lprice", 0)) for p in products]
+    stats = (min(prices), max(prices), sum(prices) // len(prices))
+    counts = []
+    for conditions in FILTERS:
+        filtered = products.copy()
+        if conditions.get("max_price"):
+            filtered = [p for p in filtered if int(p.get("lprice", 0)) <= conditions["max_price"]]
+        if conditions.get("min_rating"):
+            filtered = [p for p in filtered if p.get("rating", 0) >= conditions["min_rating"]]
+        if conditions.get("category"):
+            filtered = [p for p in filtered if p.get("category", "").lower() == conditions["category"].lower()]
+        counts.append(len(filtered))
+    return stats, counts
+
+
+def vectorized(batch):
+    """ProductBatch 방식 (배치 재사용)"""
+    stats = batch.price_stats()
+    return stats, [len(batch.filter(**conditions)) for conditions in FILTERS]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run(n: int):
+    products = make_products(n)
+    
+    (_, baseline_counts), baseline_ms = timed(baseline, products)
+    batch, build_ms = timed(ProductBatch.from_products, products)
+    (_, vector_counts), vector_ms = timed(vectorized, batch)
+    
+    assert baseline_counts == vector_counts
+    
+    print(f"📦 상품 {n:,}개 (통계 1회 + 필터 {len(FILTERS)}회)")
+    print(f"   기존 구현:          {baseline_ms:10.1f} ms")
+    print(f"   배치 생성 (1회):     {build_ms:10.1f} ms")
+    print(f"   통계+필터 (벡터):    {vector_ms:10.1f} ms  ({baseline_ms / max(vector_ms, 1e-6):.0f}배)")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 1_000_000]
+    
+    # NumPy 지연 초기화 비용 제외
+    vectorized(ProductBatch.from_products(make_products(10)))
+    
+    for size in sizes:
+        run(size)
@@ -36,6 +36,79 @@ class Settings(BaseSettings):
     dummy_search_delay: float = 1.0  # 검색 시뮬레이션 지연 시간
     max_search_results: int = 10
     
+    # 멀티 워커 배포 설정
+    workers: int = int(os.getenv("WORKERS", "1"))
+    state_backend: str = os.getenv("STATE_BACKEND", "memory")  # memory | sqlite
+    state_db_path: str = os.getenv("STATE_DB_PATH", "data/agent_state.db")
+    
+    # 검색 캐시 설정
+    search_cache_ttl: float = float(os.getenv("SEARCH_CACHE_TTL", "300"))
+    search_cache_max_entries: int = 1024
+    search_cache_db_path: str = os.getenv("SEARCH_CACHE_DB_PATH", "data/search_cache.db")
+    search_cache_stale_ttl: float = float(os.getenv("SEARCH_CACHE_STALE_TTL", "600"))
+    search_cache_persistent: bool = os.getenv("SEARCH_CACHE_PERSISTENT", "True").lower() == "true"  # 단일 워커에서도 디스크 계층 사용
+    
+    # 인기 검색어 사전 갱신 설정
+    prefetch_enabled: bool = os.getenv("PREFETCH_ENABLED", "True").lower() == "true"
+    prefetch_interval: float = float(os.getenv("PREFETCH_INTERVAL", "30"))
+    prefetch_top_n: int = int(os.getenv("PREFETCH_TOP_N", "20"))
+    prefetch_refresh_ahead: float = float(os.getenv("PREFETCH_REFRESH_AHEAD", "60"))
+    naver_rate_limit: float = float(os.getenv("NAVER_RATE_LIMIT", "10"))  # 초당 호출 수
+    query_planner_enabled: bool = os.getenv("QUERY_PLANNER_ENABLED", "True").lower() == "true"
+    
+    # 최저가 질문의 쇼핑 다중 페이지 수집 (start 파라미터)
+    naver_deep_fetch_enabled: bool = os.getenv("NAVER_DEEP_FETCH_ENABLED", "True").lower() == "true"
+    naver_deep_fetch_pages: int = int(os.getenv("NAVER_DEEP_FETCH_PAGES", "5"))  # 최대 페이지 수 (페이지당 100개)
+    naver_deep_fetch_concurrency: int = int(os.getenv("NAVER_DEEP_FETCH_CONCURRENCY", "2"))
+    naver_deep_fetch_target: int = int(os.getenv("NAVER_DEEP_FETCH_TARGET", "300"))  # 목표 상품 수
+    naver_deep_fetch_tolerance: float = float(os.getenv("NAVER_DEEP_FETCH_TOLERANCE", "0.02"))  # 가격 분포 수렴 기준
+    naver_deep_fetch_daily_quota: int = int(os.getenv("NAVER_DEEP_FETCH_DAILY_QUOTA", "5000"))  # 추가 페이지 일일 호출 수
+    
+    # MCP 호출 복원력 설정
+    mcp_call_timeout: float = float(os.getenv("MCP_CALL_TIMEOUT", "8"))
+    mcp_hedge_delay: float = float(os.getenv("MCP_HEDGE_DELAY", "1.5"))  # p95 표본이 부족할 때 사용
+    realtime_hedge_delay: float = float(os.getenv("REALTIME_HEDGE_DELAY", "2"))  # 0이면 MCP와 동시에 시작
+    circuit_failure_threshold: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    circuit_recovery_timeout: float = float(os.getenv("CIRCUIT_RECOVERY_TIMEOUT", "30"))
+    
+    # 턴별 도구 선택 (메시지에 필요한 도구만 바인딩)
+    tool_router_enabled: bool = os.getenv("TOOL_ROUTER_ENABLED", "True").lower() == "true"
+    
+    # 추측 검색 (첫 턴 메시지로 첫 LLM 호출과 동시에 네이버 검색 시작, 선택 기능)
+    speculative_search_enabled: bool = os.getenv("SPECULATIVE_SEARCH_ENABLED", "False").lower() == "true"
+    speculative_match_threshold: float = float(os.getenv("SPECULATIVE_MATCH_THRESHOLD", "0.7"))
+    
+    # 대화별 검색 결과 핸들 보관 개수
+    result_store_max_per_thread: int = int(os.getenv("RESULT_STORE_MAX_PER_THREAD", "20"))
+    
+    # 가격 이력 설정
+    price_history_db_path: str = os.getenv("PRICE_HISTORY_DB_PATH", "data/price_history.db")
+    price_history_flush_interval: float = float(os.getenv("PRICE_HISTORY_FLUSH_INTERVAL", "2"))
+    
+    # 검색 결과 로컬 카탈로그 (FTS5, 후속/반복 질문을 외부 API 없이 응답)
+    local_catalog_enabled: bool = os.getenv("LOCAL_CATALOG_ENABLED", "True").lower() == "true"
+    local_catalog_db_path: str = os.getenv("LOCAL_CATALOG_DB_PATH", "data/local_catalog.db")
+    local_catalog_min_results: int = int(os.getenv("LOCAL_CATALOG_MIN_RESULTS", "3"))  # 미만이면 실시간 검색
+    local_catalog_retention_days: float = float(os.getenv("LOCAL_CATALOG_RETENTION_DAYS", "30"))
+    
+    # 수락 제어 (동시성 제한) 설정
+    max_concurrent_requests: int = int(os.getenv("MAX_CONCURRENT_REQUESTS", "16"))
+    max_requests_per_user: int = int(os.getenv("MAX_REQUESTS_PER_USER", "2"))
+    admission_queue_size: int = int(os.getenv("ADMISSION_QUEUE_SIZE", "32"))
+    admission_queue_timeout: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "10"))
+    
+    # 트레이싱 설정
+    trace_exporter: str = os.getenv("TRACE_EXPORTER", "none")  # none | jsonl | otlp
+    trace_file_path: str = os.getenv("TRACE_FILE_PATH", "data/traces.jsonl")
+    otlp_endpoint: str = os.getenv("OTLP_ENDPOINT", "http://localhost:4318")
+    
+    # 프론트엔드 스트리밍 렌더링 설정
+    stream_render_fps: float = float(os.getenv("STREAM_RENDER_FPS", "15"))
+    
+    def use_shared_state(self) -> bool:
+        """워커 간 공유 저장소 사용 여부"""
+        return self.workers > 1 or self.state_backend.lower() == "sqlite"
+    
     model_config = {"env_file": ".env", "case_sensitive": False, "extra": "ignore"}
 
 
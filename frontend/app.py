@@ -3,12 +3,9 @@ Streamlit 프론트엔드 애플리케이션 - 실시간 스트리밍 지원
 """
 
 import streamlit as st
-import requests
 import sys
 import os
-import asyncio
-import json
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Tuple
 import time
 
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
@@ -17,7 +14,17 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from config import settings
-from frontend.streamlit_streaming import StreamlitStreamingUI
+from frontend.streamlit_streaming import (
+    TOOL_DONE, TOOL_RUNNING, StreamlitStreamingUI, ThrottledMarkdownRenderer, ToolStatusPanel
+)
+from frontend.streaming_client import BlockingChatClient
+
+
+@st.cache_resource
+def get_chat_client() -> BlockingChatClient:
+    """백엔드 연결 풀을 공유하는 채팅 클라이언트 (스크립트 재실행 간 유지)"""
+    backend_url = f"http://{settings.backend_host}:{settings.backend_port}"
+    return BlockingChatClient(backend_url)
 
 
 def init_session_state():
@@ -31,7 +38,7 @@ def init_session_state():
         import uuid
         st.session_state.user_id = str(uuid.uuid4())
     if "streaming_ui" not in st.session_state:
-        st.session_state.streaming_ui = StreamlitStreamingUI()
+        st.session_state.streaming_ui = StreamlitStreamingUI(max_fps=settings.stream_render_fps)
     if "use_streaming" not in st.session_state:
         st.session_state.use_streaming = True
 
@@ -47,11 +54,12 @@ def display_message(message: Dict[str, Any]):
 
 
 def display_products(products: list):
-    """상품 정보 표시"""
+    """상품 정보 표시 (간결한 스키마: title, price, mall, brand, url)"""
     st.subheader("🛍️ 검색 결과")
     
     for i, product in enumerate(products):
-        with st.expander(f"상품 {i+1}: {product.get('name', '상품명 없음')}"):
+        title = product.get("title") or product.get("name") or "상품명 없음"
+        with st.expander(f"상품 {i+1}: {title}"):
             col1, col2 = st.columns([1, 2])
             
             with col1:
@@ -59,115 +67,96 @@ def display_products(products: list):
                     st.image(product["image_url"], width=150)
             
             with col2:
-                st.write(f"**가격:** {product.get('price', 0):,}원")
+                price = product.get("price")
+                st.write(f"**가격:** {price:,}원" if isinstance(price, int) else "**가격:** 정보 없음")
                 if product.get("original_price"):
                     st.write(f"~~원가: {product['original_price']:,}원~~")
                 if product.get("discount_rate"):
                     st.write(f"**할인율:** {product['discount_rate']}%")
-                st.write(f"**판매자:** {product.get('seller', '정보 없음')}")
-                st.write(f"**평점:** {product.get('rating', 0)}⭐ ({product.get('review_count', 0)}개 리뷰)")
-                st.write(f"**배송:** {product.get('shipping_info', '정보 없음')}")
-                if product.get("product_url"):
-                    st.link_button("상품 보기", product["product_url"])
+                st.write(f"**판매처:** {product.get('mall') or product.get('seller') or '정보 없음'}")
+                if product.get("brand"):
+                    st.write(f"**브랜드:** {product['brand']}")
+                if product.get("rating"):
+                    st.write(f"**평점:** {product['rating']}⭐ ({product.get('review_count', 0)}개 리뷰)")
+                if product.get("shipping_info"):
+                    st.write(f"**배송:** {product['shipping_info']}")
+                url = product.get("url") or product.get("product_url")
+                if url:
+                    st.link_button("상품 보기", url)
 
 
-def send_message_stream(message: str) -> requests.Response:
-    """스트리밍 방식으로 메시지 전송"""
-    try:
-        backend_url = f"http://{settings.backend_host}:{settings.backend_port}"
-        response = requests.post(
-            f"{backend_url}/chat/stream",
-            json={
-                "message": message,
-                "session_id": st.session_state.session_id,
-                "user_id": st.session_state.user_id
-            },
-            stream=True,
-            headers={
-                "Accept": "text/event-stream",
-                "Cache-Control": "no-cache"
-            },
-            timeout=30
-        )
-        response.raise_for_status()
-        return response
-    except Exception as e:
-        raise ConnectionError(f"스트리밍 연결 실패: {e}")
+def send_message_stream(message: str) -> Iterator[Dict[str, Any]]:
+    """스트리밍 방식으로 메시지 전송 (응답 청크 제너레이터 반환)"""
+    return get_chat_client().stream_chat(
+        message,
+        session_id=st.session_state.session_id,
+        user_id=st.session_state.user_id
+    )
 
 
-def process_streaming_response(response: requests.Response) -> str:
-    """스트리밍 응답 처리"""
+def process_streaming_response(chunks: Iterator[Dict[str, Any]], message: str = "") -> Tuple[str, List[Dict[str, Any]]]:
+    """스트리밍 응답 처리 (응답 텍스트와 수신한 상품 목록 반환)"""
     streaming_ui = st.session_state.streaming_ui
-    streaming_ui.start_streaming(response.url)
+    streaming_ui.start_streaming(message)
+    
+    # 상품 카드는 응답 텍스트보다 먼저 도착하므로 위쪽에 자리 확보
+    products_container = st.container()
+    products: List[Dict[str, Any]] = []
     
-    # 스트리밍 메시지 표시용 컨테이너
-    response_container = st.empty()
-    full_response = ""
+    # 스트리밍 메시지 표시용 컨테이너 (프레임 속도 제한 렌더링)
+    renderer = ThrottledMarkdownRenderer(st.empty(), max_fps=settings.stream_render_fps)
+    tool_panel = ToolStatusPanel()
     
     try:
-        for line in response.iter_lines(decode_unicode=True):
-            if line.startswith('data: '):
-                data = line[6:]  # 'data: ' 제거
-                
-                if data == '[DONE]':
-                    break
-                
-                try:
-                    chunk = json.loads(data)
-                    
-                    # 백엔드에서 오는 청크 형식에 맞게 처리
-                    if chunk.get("type") == "content" and "content" in chunk:
-                        content = chunk.get("content", "")
-                        full_response += content
-                        
-                        # 실시간으로 응답 업데이트
-                        display_text = full_response + "▋"  # 커서 효과
-                        response_container.markdown(f"🤖 **AI 응답:**\n\n{display_text}")
-                    
-                    elif chunk.get("type") == "tool_call":
-                        tool_name = chunk.get("tool_name", "Unknown")
-                        with st.status(f"🔧 {tool_name} 실행 중...", expanded=False):
-                            st.write("도구를 실행하고 있습니다...")
-                    
-                    elif chunk.get("type") == "error":
-                        error_msg = chunk.get("error", "알 수 없는 오류")
-                        st.error(f"❌ 오류 발생: {error_msg}")
-                    
-                    elif chunk.get("type") == "done":
-                        # 스트리밍 완료
-                        break
-                
-                except json.JSONDecodeError:
-                    # JSON이 아닌 경우 텍스트로 처리
-                    full_response += data
-                    response_container.markdown(f"🤖 **AI 응답:**\n\n{full_response}▋")
+        for chunk in chunks:
+            # 백엔드에서 오는 청크 형식에 맞게 처리
+            if chunk.get("type") == "content" and "content" in chunk:
+                renderer.append(chunk.get("content", ""))
+            
+            elif chunk.get("type") == "tool_call":
+                tool_panel.update(chunk.get("tool_name", "Unknown"), TOOL_RUNNING)
+            
+            elif chunk.get("type") == "tool_result":
+                tool_panel.update(chunk.get("tool_name", "Unknown"), TOOL_DONE)
+            
+            elif chunk.get("type") == "products":
+                # 도구 결과 상품은 LLM 응답을 기다리지 않고 바로 표시
+                new_products = chunk.get("products", [])
+                products.extend(new_products)
+                with products_container:
+                    display_products(new_products)
+            
+            elif chunk.get("type") == "error":
+                error_msg = chunk.get("error", "알 수 없는 오류")
+                st.error(f"❌ 오류 발생: {error_msg}")
+            
+            elif chunk.get("type") == "done":
+                # 스트리밍 완료
+                break
+    
+    except ConnectionError:
+        # 연결 실패는 호출자가 일반 모드로 폴백
+        raise
     
     except Exception as e:
         st.error(f"스트리밍 처리 오류: {e}")
     
     finally:
-        # 스트리밍 완료 시 커서 제거
-        response_container.markdown(f"🤖 **AI 응답:**\n\n{full_response}")
+        # 남은 청크 렌더링 및 커서 제거
+        renderer.flush()
         streaming_ui.stop_streaming()
     
-    return full_response
+    return renderer.text, products
 
 
 def send_message(message: str) -> Dict[str, Any]:
     """일반 방식으로 메시지 전송 (fallback)"""
     try:
-        backend_url = f"http://{settings.backend_host}:{settings.backend_port}"
-        response = requests.post(
-            f"{backend_url}/chat",
-            json={
-                "message": message,
-                "session_id": st.session_state.session_id,
-                "user_id": st.session_state.user_id
-            },
-            timeout=30
+        return get_chat_client().chat(
+            message,
+            session_id=st.session_state.session_id,
+            user_id=st.session_state.user_id
         )
-        response.raise_for_status()
-        return response.json()
     except Exception as e:
         return {
             "response": f"오류가 발생했습니다: {str(e)}",
@@ -178,13 +167,7 @@ def send_message(message: str) -> Dict[str, Any]:
 def get_conversation_history() -> list:
     """대화 히스토리 조회"""
     try:
-        backend_url = f"http://{settings.backend_host}:{settings.backend_port}"
-        response = requests.get(
-            f"{backend_url}/history/{st.session_state.session_id}",
-            timeout=10
-        )
-        response.raise_for_status()
-        return response.json().get("history", [])
+        return get_chat_client().get_json(f"/history/{st.session_state.session_id}").get("history", [])
     except Exception:
         return []
 
@@ -192,13 +175,7 @@ def get_conversation_history() -> list:
 def clear_session():
     """세션 초기화"""
     try:
-        backend_url = f"http://{settings.backend_host}:{settings.backend_port}"
-        response = requests.delete(
-            f"{backend_url}/session/{st.session_state.session_id}",
-            timeout=10
-        )
-        response.raise_for_status()
-        return True
+        return get_chat_client().delete(f"/session/{st.session_state.session_id}")
     except Exception:
         return False
 
@@ -280,7 +257,8 @@ def main():
                 # 스트리밍 방식
                 try:
                     streaming_response = send_message_stream(prompt)
-                    ai_response = process_streaming_response(streaming_response)
+                    ai_response, streamed_products = process_streaming_response(streaming_response, prompt)
+                    response = {"response": ai_response, "products": streamed_products}
                 except Exception as e:
                     st.error(f"스트리밍 오류: {e}")
                     # fallback to normal mode
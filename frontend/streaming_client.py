@@ -1,19 +1,86 @@
 """
 SSE 스트리밍 클라이언트
+
+httpx.AsyncClient의 keep-alive 연결 풀을 재사용하며, 원시 바이트 스트림을
+점진적으로 파싱하여 청크 단위로 비동기 반복합니다. Streamlit처럼 동기 코드에서
+사용할 때는 백그라운드 이벤트 루프에서 같은 클라이언트를 구동하는
+BlockingChatClient를 사용합니다.
 """
 
 import asyncio
 import json
+import threading
 import uuid
-import requests
-from typing import Callable, Optional, List, Dict, Any
-import time
+import httpx
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+
+# 연결 풀 설정
+DEFAULT_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0)
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, read=120.0)
+
+
+class SSEParser:
+    """원시 바이트를 받아 완성된 SSE 이벤트의 data 문자열을 반환하는 증분 파서"""
+
+    def __init__(self):
+        self._buffer = b""
+        self._data_lines: List[bytes] = []
+
+    def feed(self, chunk: bytes) -> List[str]:
+        """바이트 청크 입력 후 완성된 이벤트 data 목록 반환"""
+        self._buffer += chunk
+        events = []
+
+        while True:
+            newline = self._buffer.find(b"\n")
+            if newline < 0:
+                break
+
+            line = self._buffer[:newline]
+            self._buffer = self._buffer[newline + 1:]
+            if line.endswith(b"\r"):
+                line = line[:-1]
+
+            if not line:
+                # 빈 줄은 이벤트 경계
+                if self._data_lines:
+                    events.append(b"\n".join(self._data_lines).decode("utf-8"))
+                    self._data_lines = []
+            elif line.startswith(b"data:"):
+                value = line[5:]
+                if value.startswith(b" "):
+                    value = value[1:]
+                self._data_lines.append(value)
+            # 주석(:)과 event/id/retry 필드는 무시
+
+        return events
+
+    def flush(self) -> List[str]:
+        """스트림 종료 시 남은 이벤트 반환"""
+        events = self.feed(b"\n\n") if self._buffer or self._data_lines else []
+        self._buffer = b""
+        return events
+
+
+def parse_sse_data(data: str) -> Dict[str, Any]:
+    """SSE data 문자열을 청크 딕셔너리로 변환"""
+    try:
+        return json.loads(data)
+    except json.JSONDecodeError:
+        # JSON이 아닌 경우 텍스트로 처리
+        return {"type": "content", "content": data}
 
 
 class StreamingChatClient:
-    """SSE 기반 실시간 채팅 클라이언트"""
-    
-    def __init__(self, base_url: str, auto_reconnect: bool = True):
+    """httpx 기반 비동기 SSE 채팅 클라이언트"""
+
+    def __init__(
+        self,
+        base_url: str,
+        auto_reconnect: bool = True,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
         """클라이언트 초기화"""
         self.base_url = base_url.rstrip('/')
         self.session_id = str(uuid.uuid4())
@@ -22,117 +89,153 @@ class StreamingChatClient:
         self.message_queue = []
         self.reconnect_attempts = 0
         self.max_reconnect_attempts = 5
-        
+        self._http_client = http_client
+
         # 이벤트 핸들러
         self.on_chunk: Optional[Callable] = None
         self.on_error: Optional[Callable] = None
         self.on_connect: Optional[Callable] = None
         self.on_disconnect: Optional[Callable] = None
         self.on_reconnect: Optional[Callable] = None
-    
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """keep-alive 연결 풀을 가진 httpx 클라이언트 (지연 생성)"""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=DEFAULT_LIMITS,
+                timeout=DEFAULT_TIMEOUT
+            )
+        return self._http_client
+
     def _build_stream_url(self, message: str, session_id: str) -> str:
         """스트리밍 URL 구성"""
         return f"{self.base_url}/chat/stream"
-    
-    def _create_event_source(self, message: str, session_id: str):
-        """EventSource 생성 (실제로는 requests 사용)"""
-        url = self._build_stream_url(message, session_id)
-        
+
+    def _create_event_source(self, message: str, session_id: str, user_id: Optional[str] = None,
+                             debug: bool = False):
+        """스트리밍 요청 컨텍스트 생성 (async with로 사용)"""
         payload = {
             "message": message,
-            "session_id": session_id
+            "session_id": session_id,
+            "user_id": user_id,
+            "debug": debug
         }
-        
+
+        return self._get_http_client().stream(
+            "POST",
+            self._build_stream_url(message, session_id),
+            json=payload,
+            headers={
+                "Accept": "text/event-stream",
+                "Cache-Control": "no-cache"
+            }
+        )
+
+    async def stream_chat(
+        self,
+        message: str,
+        session_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        debug: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """메시지를 전송하고 응답 청크를 비동기로 반복"""
+        session_id = session_id or self.session_id
+
         try:
-            response = requests.post(
-                url,
-                json=payload,
-                stream=True,
-                headers={
-                    "Accept": "text/event-stream",
-                    "Cache-Control": "no-cache"
-                },
-                timeout=30
-            )
-            response.raise_for_status()
-            return response
-        except Exception as e:
-            raise ConnectionError(f"스트리밍 연결 실패: {e}")
-    
+            async with self._create_event_source(message, session_id, user_id, debug) as response:
+                response.raise_for_status()
+                self.is_connected = True
+
+                async for chunk in self._iter_chunks(response):
+                    yield chunk
+        except httpx.HTTPError as e:
+            raise ConnectionError(f"스트리밍 연결 실패: {e}") from e
+        finally:
+            self.is_connected = False
+
+    async def _iter_chunks(self, response: httpx.Response) -> AsyncIterator[Dict[str, Any]]:
+        """원시 바이트 스트림을 SSE 청크로 변환"""
+        parser = SSEParser()
+
+        async for raw in response.aiter_bytes():
+            for data in parser.feed(raw):
+                if data == '[DONE]':
+                    return
+                yield parse_sse_data(data)
+
+        for data in parser.flush():
+            if data != '[DONE]':
+                yield parse_sse_data(data)
+
     async def connect(self, message: str, session_id: Optional[str] = None):
-        """스트리밍 연결 및 메시지 전송"""
+        """스트리밍 연결 및 메시지 전송 (핸들러 콜백 방식)"""
         session_id = session_id or self.session_id
-        
+
         try:
-            response = self._create_event_source(message, session_id)
-            self.is_connected = True
-            self.reconnect_attempts = 0
-            
-            if self.on_connect:
-                self.on_connect()
-            
-            await self._process_stream(response)
-            
+            connected = False
+            async for chunk in self.stream_chat(message, session_id):
+                if not connected:
+                    connected = True
+                    self.reconnect_attempts = 0
+                    if self.on_connect:
+                        self.on_connect()
+                self._handle_message(chunk)
+
+            if self.on_disconnect:
+                self.on_disconnect()
+
         except Exception as e:
             self.is_connected = False
             if self.on_error:
                 self.on_error(str(e))
-            
+
             if self.auto_reconnect and self.reconnect_attempts < self.max_reconnect_attempts:
                 await self._handle_connection_error()
-    
-    async def _process_stream(self, response):
-        """스트리밍 응답 처리"""
-        try:
-            for line in response.iter_lines(decode_unicode=True):
-                if line.startswith('data: '):
-                    data = line[6:]  # 'data: ' 제거
-                    
-                    if data == '[DONE]':
-                        break
-                    
-                    try:
-                        chunk = json.loads(data)
-                        self._handle_message(chunk)
-                    except json.JSONDecodeError:
-                        # JSON이 아닌 경우 텍스트로 처리
-                        chunk = {"type": "content", "content": data}
-                        self._handle_message(chunk)
-        
-        except Exception as e:
-            if self.on_error:
-                self.on_error(f"스트리밍 처리 오류: {e}")
-        
-        finally:
-            self.is_connected = False
-            if self.on_disconnect:
-                self.on_disconnect()
-    
+
+    async def post_json(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """일반 JSON POST 요청 (같은 연결 풀 사용)"""
+        response = await self._get_http_client().post(path, json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    async def get_json(self, path: str) -> Dict[str, Any]:
+        """일반 JSON GET 요청"""
+        response = await self._get_http_client().get(path, timeout=10.0)
+        response.raise_for_status()
+        return response.json()
+
+    async def delete(self, path: str) -> bool:
+        """DELETE 요청"""
+        response = await self._get_http_client().delete(path, timeout=10.0)
+        response.raise_for_status()
+        return True
+
     def _handle_message(self, chunk: Dict[str, Any]):
         """메시지 처리"""
         if self.on_chunk:
             self.on_chunk(chunk)
-    
+
     def _handle_error(self, error: str):
         """오류 처리"""
         if self.on_error:
             self.on_error(error)
-    
+
     async def _handle_connection_error(self):
         """연결 오류 처리 및 재연결"""
         self.reconnect_attempts += 1
-        
+
         if self.reconnect_attempts <= self.max_reconnect_attempts:
             # 재연결 지연 (exponential backoff)
             delay = min(2 ** self.reconnect_attempts, 30)
             await asyncio.sleep(delay)
-            
+
             if await self._attempt_reconnect():
                 if self.on_reconnect:
                     self.on_reconnect()
             else:
                 await self._handle_connection_error()
-    
+
     async def _attempt_reconnect(self) -> bool:
         """재연결 시도"""
         try:
@@ -144,23 +247,84 @@ class StreamingChatClient:
             return False
         except Exception:
             return False
-    
+
     def disconnect(self):
         """연결 해제"""
         self.is_connected = False
         if self.on_disconnect:
             self.on_disconnect()
-    
+
+    async def aclose(self):
+        """연결 풀 종료"""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
     def _add_to_queue(self, message: str):
         """메시지 큐에 추가"""
         self.message_queue.append(message)
-        
+
         # 큐 크기 제한 (최근 10개만 유지)
         if len(self.message_queue) > 10:
             self.message_queue = self.message_queue[-10:]
-    
+
     def _process_queue(self) -> List[str]:
         """큐 처리"""
         processed = self.message_queue.copy()
         self.message_queue.clear()
-        return processed 
\ No newline at end of file
+        return processed
+
+
+class BlockingChatClient:
+    """동기 코드(Streamlit)용 래퍼
+
+    전용 스레드의 이벤트 루프에서 StreamingChatClient를 구동하므로
+    스크립트가 다시 실행되어도 연결 풀이 유지됩니다.
+    """
+
+    def __init__(self, base_url: str):
+        """백그라운드 이벤트 루프 시작"""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="chat-client-loop", daemon=True)
+        self._thread.start()
+        self.client = StreamingChatClient(base_url, auto_reconnect=False)
+
+    def _run(self, coro, timeout: Optional[float] = None):
+        """백그라운드 루프에서 코루틴 실행 후 결과 대기"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    def stream_chat(
+        self,
+        message: str,
+        session_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        debug: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """응답 청크를 동기 제너레이터로 반환"""
+        stream = self.client.stream_chat(message, session_id, user_id, debug)
+        try:
+            while True:
+                try:
+                    yield self._run(stream.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            self._run(stream.aclose())
+
+    def chat(self, message: str, session_id: Optional[str] = None, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """일반 방식 대화 요청"""
+        payload = {"message": message, "session_id": session_id, "user_id": user_id}
+        return self._run(self.client.post_json("/chat", payload))
+
+    def get_json(self, path: str) -> Dict[str, Any]:
+        """GET 요청"""
+        return self._run(self.client.get_json(path))
+
+    def delete(self, path: str) -> bool:
+        """DELETE 요청"""
+        return self._run(self.client.delete(path))
+
+    def close(self):
+        """연결 풀과 이벤트 루프 종료"""
+        self._run(self.client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
@@ -5,15 +5,120 @@ Streamlit 기반 스트리밍 UI
 import streamlit as st
 import uuid
 import time
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
+
+
+RESPONSE_PREFIX = "🤖 **AI 응답:**\n\n"
+STREAMING_CURSOR = "▋"
+
+# 도구 상태 라벨 (tool_call / tool_result 청크)
+TOOL_RUNNING = "실행 중"
+TOOL_DONE = "완료"
+
+TOOL_DISPLAY_NAMES = {
+    "search_naver": "네이버 검색",
+    "search_exa": "웹 검색",
+    "get_weather": "날씨 조회"
+}
+
+
+class ThrottledMarkdownRenderer:
+    """프레임 속도가 제한된 증분 마크다운 렌더러
+    
+    청크마다 전체 문자열을 다시 보내면 긴 응답에서 웹소켓 전송량이 O(n²)가 되므로,
+    청크를 모아 두었다가 최대 max_fps 횟수만큼만 화면을 갱신합니다.
+    """
+    
+    def __init__(
+        self,
+        container=None,
+        max_fps: float = 15.0,
+        prefix: str = RESPONSE_PREFIX,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """렌더러 초기화"""
+        self.container = container
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.prefix = prefix
+        self.clock = clock
+        self.render_count = 0
+        self._parts: List[str] = []
+        self._text = ""
+        self._dirty = False
+        self._last_render = float("-inf")
+    
+    @property
+    def text(self) -> str:
+        """지금까지 누적된 전체 텍스트"""
+        if self._parts:
+            self._text += "".join(self._parts)
+            self._parts = []
+        return self._text
+    
+    def append(self, chunk: str):
+        """청크 추가 (프레임 간격이 지났을 때만 렌더링)"""
+        self._parts.append(chunk)
+        self._dirty = True
+        
+        if self.clock() - self._last_render >= self.min_interval:
+            self.render()
+    
+    def render(self, final: bool = False):
+        """현재 텍스트 렌더링 (final이면 커서 제거)"""
+        if self.container is None:
+            self.container = st.empty()
+        
+        cursor = "" if final else STREAMING_CURSOR
+        self.container.markdown(f"{self.prefix}{self.text}{cursor}")
+        self.render_count += 1
+        self._dirty = False
+        self._last_render = self.clock()
+    
+    def flush(self):
+        """남은 청크를 최종 렌더링"""
+        self.render(final=True)
+
+
+class ToolStatusPanel:
+    """응답 하나당 하나의 st.status 블록으로 도구 진행 상황 표시"""
+    
+    def __init__(self):
+        """패널 초기화"""
+        self.status = None
+        self.running: List[str] = []
+        self.completed: List[str] = []
+    
+    def _label(self) -> str:
+        if self.running:
+            return f"🔧 {', '.join(self.running)} {TOOL_RUNNING}"
+        return f"✅ 도구 {len(self.completed)}개 실행 완료"
+    
+    def update(self, tool_name: str, status: str):
+        """도구 상태 갱신 (블록을 새로 만들지 않고 라벨만 갱신)"""
+        display_name = TOOL_DISPLAY_NAMES.get(tool_name, tool_name)
+        
+        if status == TOOL_DONE:
+            if display_name in self.running:
+                self.running.remove(display_name)
+            self.completed.append(display_name)
+        elif display_name not in self.running:
+            self.running.append(display_name)
+        
+        if self.status is None:
+            self.status = st.status(self._label(), expanded=False)
+        else:
+            self.status.update(label=self._label(), state="running" if self.running else "complete")
+        
+        self.status.write(f"{display_name}: {status}")
 
 
 class StreamlitStreamingUI:
     """Streamlit 기반 실시간 스트리밍 UI"""
     
-    def __init__(self):
+    def __init__(self, max_fps: float = 15.0):
         """UI 초기화"""
         self.session_id = str(uuid.uuid4())
+        self.max_fps = max_fps
         self.current_response = ""
         self.current_message = ""
         self.is_streaming = False
@@ -25,6 +130,8 @@ class StreamlitStreamingUI:
         self.response_container = None
         self.typing_container = None
         self.status_container = None
+        self.renderer: Optional[ThrottledMarkdownRenderer] = None
+        self.tool_panel: Optional[ToolStatusPanel] = None
     
     def start_streaming(self, message: str):
         """스트리밍 시작"""
@@ -34,6 +141,8 @@ class StreamlitStreamingUI:
         self.tool_calls = []
         self.has_error = False
         self.error_message = ""
+        self.renderer = None
+        self.tool_panel = None
         
         # 타이핑 인디케이터 표시
         self.show_typing_indicator()
@@ -42,6 +151,10 @@ class StreamlitStreamingUI:
         """스트리밍 중지"""
         self.is_streaming = False
         
+        # 모아 둔 청크 최종 렌더링 (커서 제거)
+        if self.renderer is not None:
+            self.renderer.flush()
+        
         # 타이핑 인디케이터 제거
         if self.typing_container:
             self.typing_container.empty()
@@ -54,18 +167,18 @@ class StreamlitStreamingUI:
             # 콘텐츠 청크 처리
             content = chunk.get("content", "")
             self.current_response += content
-            self.display_streaming_message(self.current_response)
+            self._render_throttled(content)
         
         elif chunk_type == "tool_call":
             # 도구 호출 청크 처리
             self.tool_calls.append(chunk)
             tool_name = chunk.get("tool_name", "Unknown")
-            self.display_tool_status(tool_name, "실행 중...")
+            self.display_tool_status(tool_name, TOOL_RUNNING)
         
         elif chunk_type == "tool_result":
             # 도구 결과 청크 처리
             tool_name = chunk.get("tool_name", "Unknown")
-            self.display_tool_status(tool_name, "완료")
+            self.display_tool_status(tool_name, TOOL_DONE)
         
         elif chunk_type == "error":
             # 에러 청크 처리
@@ -77,6 +190,14 @@ class StreamlitStreamingUI:
             # 완료 신호
             self.stop_streaming()
     
+    def _render_throttled(self, content: str):
+        """프레임 속도 제한 렌더러로 청크 전달"""
+        if self.renderer is None:
+            if not self.response_container:
+                self.response_container = st.empty()
+            self.renderer = ThrottledMarkdownRenderer(self.response_container, max_fps=self.max_fps)
+        self.renderer.append(content)
+    
     def display_streaming_message(self, message: str):
         """스트리밍 메시지 표시"""
         if not self.response_container:
@@ -90,20 +211,10 @@ class StreamlitStreamingUI:
         self.response_container.markdown(f"🤖 **AI 응답:**\n\n{display_text}")
     
     def display_tool_status(self, tool_name: str, status: str):
-        """도구 상태 표시"""
-        tool_display_names = {
-            "search_naver": "네이버 검색",
-            "search_exa": "웹 검색",
-            "get_weather": "날씨 조회"
-        }
-        
-        display_name = tool_display_names.get(tool_name, tool_name)
-        
-        with st.status(f"🔧 {display_name} - {status}", expanded=False):
-            st.write(f"도구: {display_name}")
-            st.write(f"상태: {status}")
-            if status == "완료":
-                st.success("처리 완료!")
+        """도구 상태 표시 (응답당 하나의 status 블록 재사용)"""
+        if self.tool_panel is None:
+            self.tool_panel = ToolStatusPanel()
+        self.tool_panel.update(tool_name, status)
     
     def display_error(self, error_message: str):
         """에러 메시지 표시"""
@@ -126,6 +237,8 @@ class StreamlitStreamingUI:
         if self.response_container:
             self.response_container.empty()
             self.response_container = None
+        self.renderer = None
+        self.tool_panel = None
         
         if self.typing_container:
             self.typing_container.empty()
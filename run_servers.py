@@ -3,6 +3,7 @@
 FastAPI와 Streamlit 서버를 동시에 실행하는 스크립트
 """
 
+import argparse
 import subprocess
 import time
 import sys
@@ -11,17 +12,41 @@ import os
 from threading import Thread
 
 
-def run_fastapi():
+def build_fastapi_command(workers: int = 1) -> list:
+    """uvicorn 실행 명령 구성"""
+    command = [
+        sys.executable, "-m", "uvicorn", 
+        "backend.main:app", 
+        "--host", "localhost", 
+        "--port", "8000"
+    ]
+    
+    # --reload는 단일 워커에서만 사용 가능
+    if workers > 1:
+        command.extend(["--workers", str(workers)])
+    else:
+        command.append("--reload")
+    
+    return command
+
+
+def build_fastapi_env(workers: int = 1) -> dict:
+    """워커 프로세스 환경 변수 구성"""
+    env = os.environ.copy()
+    env["WORKERS"] = str(workers)
+    
+    # 멀티 워커에서는 세션/메모리/검색 캐시를 SQLite로 공유
+    if workers > 1:
+        env["STATE_BACKEND"] = "sqlite"
+    
+    return env
+
+
+def run_fastapi(workers: int = 1):
     """FastAPI 서버 실행"""
-    print("🚀 FastAPI 서버를 시작합니다...")
+    print(f"🚀 FastAPI 서버를 시작합니다... (워커 {workers}개)")
     try:
-        subprocess.run([
-            sys.executable, "-m", "uvicorn", 
-            "backend.main:app", 
-            "--host", "localhost", 
-            "--port", "8000",
-            "--reload"
-        ])
+        subprocess.run(build_fastapi_command(workers), env=build_fastapi_env(workers))
     except KeyboardInterrupt:
         print("\n🛑 FastAPI 서버를 종료합니다.")
 
@@ -48,14 +73,32 @@ def signal_handler(sig, frame):
     os._exit(0)
 
 
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="쇼핑 챗봇 서버 실행")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("WORKERS", "1")),
+        help="FastAPI 워커 프로세스 수 (0이면 CPU 코어 수)"
+    )
+    args = parser.parse_args()
+    
+    if args.workers <= 0:
+        args.workers = os.cpu_count() or 1
+    
+    return args
+
+
 def main():
     """메인 함수"""
+    args = parse_args()
     signal.signal(signal.SIGINT, signal_handler)
     
     print("="*60)
     print("🛍️  쇼핑 챗봇 서버 시작")
     print("="*60)
-    print("📍 FastAPI Backend: http://localhost:8000")
+    print(f"📍 FastAPI Backend: http://localhost:8000 (워커 {args.workers}개)")
     print("📍 Streamlit Frontend: http://localhost:8501")
     print("📍 API 문서: http://localhost:8000/docs")
     print("="*60)
@@ -63,7 +106,7 @@ def main():
     print("="*60)
     
     # 두 서버를 별도 스레드에서 실행
-    fastapi_thread = Thread(target=run_fastapi, daemon=True)
+    fastapi_thread = Thread(target=run_fastapi, args=(args.workers,), daemon=True)
     streamlit_thread = Thread(target=run_streamlit, daemon=True)
     
     fastapi_thread.start()
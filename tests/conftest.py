@@ -0,0 +1,16 @@
+"""
+테스트 공통 설정
+
+검색 결과 색인, 가격 이력, 검색 캐시는 전역 싱글톤이 설정 경로(data/*.db)에
+기록하므로, 테스트 픽스처가 실제 서비스 데이터에 섞이지 않도록 설정을 불러오기 전에
+임시 디렉터리로 경로를 바꿉니다.
+"""
+
+import os
+import tempfile
+
+_TEST_DATA_DIR = tempfile.mkdtemp(prefix="shopping-agent-tests-")
+
+os.environ["LOCAL_CATALOG_DB_PATH"] = os.path.join(_TEST_DATA_DIR, "local_catalog.db")
+os.environ["PRICE_HISTORY_DB_PATH"] = os.path.join(_TEST_DATA_DIR, "price_history.db")
+os.environ["SEARCH_CACHE_DB_PATH"] = os.path.join(_TEST_DATA_DIR, "search_cache.db")
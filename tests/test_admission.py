@@ -0,0 +1,111 @@
+"""
+요청 수락 제어 테스트
+"""
+
+import asyncio
+import pytest
+from backend.admission import AdmissionController, AdmissionRejected
+
+
+class TestAdmissionController:
+    """동시성 제한 및 대기열 테스트"""
+    
+    @pytest.mark.asyncio
+    async def test_per_user_limit_returns_429(self):
+        """사용자별 한도 초과 시 429 테스트"""
+        controller = AdmissionController(max_concurrent=4, max_per_user=1, max_queue=4, queue_timeout=1.0)
+        
+        ticket = await controller.acquire("user-1")
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await controller.acquire("user-1")
+        
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.retry_after >= 1
+        
+        # 다른 사용자는 수락되어야 함
+        other = await controller.acquire("user-2")
+        ticket.release()
+        other.release()
+        assert controller.stats()["active"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_queue_full_returns_503(self):
+        """대기열이 가득 찼을 때 503 테스트"""
+        controller = AdmissionController(max_concurrent=1, max_per_user=10, max_queue=1, queue_timeout=1.0)
+        
+        first = await controller.acquire()
+        waiter = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        assert controller.stats()["queue_depth"] == 1
+        
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await controller.acquire()
+        assert exc_info.value.status_code == 503
+        
+        first.release()
+        second = await waiter
+        second.release()
+        assert controller.stats()["admitted_total"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_queue_timeout(self):
+        """대기 시간 초과 테스트"""
+        controller = AdmissionController(max_concurrent=1, max_per_user=10, max_queue=4, queue_timeout=0.01)
+        
+        ticket = await controller.acquire("user-1")
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await controller.acquire("user-2")
+        
+        assert exc_info.value.status_code == 503
+        assert controller.stats()["rejected"]["timeout"] == 1
+        ticket.release()
+    
+    @pytest.mark.asyncio
+    async def test_release_is_idempotent(self):
+        """슬롯 중복 반환 방지 테스트"""
+        controller = AdmissionController(max_concurrent=1, max_per_user=1, max_queue=1, queue_timeout=0.1)
+        
+        async with controller.slot("user-1") as ticket:
+            assert controller.stats()["active"] == 1
+        ticket.release()
+        
+        assert controller.stats()["active"] == 0
+        again = await controller.acquire("user-1")
+        again.release()
+    
+    @pytest.mark.asyncio
+    async def test_timeout_and_cancel_keep_permits(self):
+        """대기 시간 초과나 취소 후에도 허가 수가 유지되는지 테스트"""
+        controller = AdmissionController(max_concurrent=1, max_per_user=10, max_queue=4, queue_timeout=0.01)
+        
+        ticket = await controller.acquire()
+        with pytest.raises(AdmissionRejected):
+            await controller.acquire()
+        
+        waiter = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        
+        ticket.release()
+        await asyncio.sleep(0)
+        assert controller._get_semaphore()._value == 1
+        assert controller.stats()["queue_depth"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_abandoned_acquire_returns_permit(self):
+        """포기 직전에 획득이 끝난 경우 허가를 되돌려주는지 테스트"""
+        controller = AdmissionController(max_concurrent=1, max_per_user=10, max_queue=4, queue_timeout=1.0)
+        semaphore = controller._get_semaphore()
+        
+        waiter = asyncio.ensure_future(semaphore.acquire())
+        await asyncio.sleep(0)
+        assert waiter.done() and semaphore.locked()
+        
+        controller._abandon(waiter)
+        await asyncio.sleep(0)
+        assert not semaphore.locked()
+        
+        again = await controller.acquire()
+        again.release()
@@ -0,0 +1,180 @@
+"""
+네이버 쇼핑 다중 페이지 수집 테스트
+"""
+
+import asyncio
+import pytest
+from agent.deep_fetch import CallQuota, PriceDistribution, iter_shopping_pages
+
+
+def _page_fetcher(total: int, price_of=lambda rank: 100000 + rank * 10):
+    """전체 total개 결과를 가진 가상 쇼핑 검색 (호출한 start 기록)"""
+    calls = []
+
+    async def fetch_page(start, display):
+        calls.append(start)
+        await asyncio.sleep(0)
+        ranks = range(start, min(start + display, total + 1))
+        return [{"title": f"상품 {rank}", "price": price_of(rank), "url": f"https://shop/{rank}"} for rank in ranks]
+
+    return fetch_page, calls
+
+
+async def _collect(fetch_page, **limits):
+    return [page async for page in iter_shopping_pages(fetch_page, **limits)]
+
+
+class TestDeepFetch:
+    """다중 페이지 수집 조기 종료 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_stops_at_target_count(self):
+        """목표 개수에 도달하면 더 요청하지 않는지 테스트"""
+        fetch_page, calls = _page_fetcher(1000)
+        pages = await _collect(
+            fetch_page, page_size=100, max_pages=10, target_count=250,
+            concurrency=2, tolerance=0.0, quota=CallQuota(100)
+        )
+
+        assert sorted(calls) == [1, 101, 201]
+        assert sum(len(page) for page in pages) == 300
+
+    @pytest.mark.asyncio
+    async def test_stops_when_results_exhausted(self):
+        """마지막 페이지가 덜 차면 멈추는지 테스트"""
+        fetch_page, calls = _page_fetcher(150)
+        pages = await _collect(
+            fetch_page, page_size=100, max_pages=10, target_count=1000,
+            concurrency=3, tolerance=0.0, quota=CallQuota(100)
+        )
+
+        assert sum(len(page) for page in pages) == 150
+        assert max(calls) <= 301
+
+    @pytest.mark.asyncio
+    async def test_stops_when_price_distribution_settles(self):
+        """가격 분포가 수렴하면 최대 깊이 전에 멈추는지 테스트"""
+        fetch_page, calls = _page_fetcher(1000, price_of=lambda rank: 100000 + (rank % 100) * 100)
+        await _collect(
+            fetch_page, page_size=100, max_pages=10, target_count=1000,
+            concurrency=1, tolerance=0.02, quota=CallQuota(100)
+        )
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_quota_limits_extra_pages(self):
+        """추가 페이지 호출이 할당량을 넘지 않는지 테스트"""
+        quota = CallQuota(1)
+        fetch_page, calls = _page_fetcher(1000)
+        await _collect(
+            fetch_page, page_size=100, max_pages=10, target_count=1000,
+            concurrency=3, tolerance=0.0, quota=quota
+        )
+
+        assert len(calls) == 2
+        assert quota.remaining() == 0
+
+    @pytest.mark.asyncio
+    async def test_drops_accessory_outliers(self):
+        """추가 페이지의 지나치게 싼 상품(액세서리)을 제외하는지 테스트"""
+        fetch_page, _ = _page_fetcher(200, price_of=lambda rank: 5000 if rank > 150 else 300000)
+        pages = await _collect(
+            fetch_page, page_size=100, max_pages=2, target_count=1000,
+            concurrency=1, tolerance=0.0, quota=CallQuota(100)
+        )
+
+        assert len(pages[1]) == 50
+        assert all(product["price"] == 300000 for product in pages[1])
+
+    @pytest.mark.asyncio
+    async def test_drops_accessories_on_first_page(self):
+        """첫 페이지에 섞인 액세서리도 제외하는지 테스트"""
+        fetch_page, _ = _page_fetcher(80, price_of=lambda rank: 9900 if rank % 3 == 0 else 1500000)
+        pages = await _collect(
+            fetch_page, page_size=100, max_pages=2, target_count=1000,
+            concurrency=1, tolerance=0.0, quota=CallQuota(100)
+        )
+
+        assert len(pages) == 1
+        assert all(product["price"] == 1500000 for product in pages[0])
+
+    @pytest.mark.asyncio
+    async def test_failed_page_is_skipped_not_exhausted(self):
+        """실패한 페이지(None, 예외)는 건너뛰고 결과 소진으로 보지 않는지 테스트"""
+        from agent.deep_fetch import DEEP_FETCH_PAGE_ERRORS, DEEP_FETCH_STOPS
+        fetch_page, calls = _page_fetcher(1000)
+        
+        async def flaky_page(start, display):
+            if start == 101:
+                return None
+            if start == 201:
+                raise RuntimeError("429 Too Many Requests")
+            return await fetch_page(start, display)
+        
+        errors_before = DEEP_FETCH_PAGE_ERRORS._values.get((), 0.0)
+        exhausted_before = DEEP_FETCH_STOPS._values.get(("exhausted",), 0.0)
+        pages = await _collect(
+            flaky_page, page_size=100, max_pages=5, target_count=1000,
+            concurrency=3, tolerance=0.0, quota=CallQuota(100)
+        )
+        
+        assert sorted(calls) == [1, 301, 401]
+        assert sum(len(page) for page in pages) == 300
+        assert DEEP_FETCH_PAGE_ERRORS._values.get((), 0.0) - errors_before == 2
+        assert DEEP_FETCH_STOPS._values.get(("exhausted",), 0.0) == exhausted_before
+    
+    @pytest.mark.asyncio
+    async def test_first_page_failure_stops_with_error(self):
+        """첫 페이지가 실패하면 추가 페이지 없이 오류로 멈추는지 테스트"""
+        from agent.deep_fetch import DEEP_FETCH_STOPS
+        quota = CallQuota(100)
+        
+        async def failing_page(start, display):
+            return None
+        
+        errors_before = DEEP_FETCH_STOPS._values.get(("error",), 0.0)
+        pages = await _collect(
+            failing_page, page_size=100, max_pages=5, target_count=1000,
+            concurrency=2, tolerance=0.0, quota=quota
+        )
+        
+        assert pages == []
+        assert quota.remaining() == 100
+        assert DEEP_FETCH_STOPS._values.get(("error",), 0.0) - errors_before == 1
+
+    def test_price_distribution_settled(self):
+        """분포 요약 변화가 허용 범위 안일 때만 수렴으로 보는지 테스트"""
+        distribution = PriceDistribution(tolerance=0.05)
+        distribution.add([{"price": 100}, {"price": 200}, {"price": 300}])
+        assert distribution.settled() is False
+
+        distribution.add([{"price": 50}])
+        assert distribution.settled() is False
+
+        distribution.add([{"price": 200}])
+        assert distribution.settled() is True
+
+    @pytest.mark.asyncio
+    async def test_price_query_streams_shop_pages(self, monkeypatch):
+        """최저가 질의의 통합 검색이 쇼핑 페이지를 여러 번 수집하는지 테스트"""
+        from agent.models import Product
+        from agent.naver_realtime_search import NaverRealtimeSearchClient
+
+        monkeypatch.setenv("NAVER_CLIENT_ID", "test-id")
+        monkeypatch.setenv("NAVER_CLIENT_SECRET", "test-secret")
+        client = NaverRealtimeSearchClient()
+        starts = []
+
+        async def search_shopping(query, display=10, sort="date", start=1):
+            starts.append(start)
+            return [
+                Product(title=f"모델{rank} 청소기", price=500000 - rank, url=f"https://shop/{rank}")
+                for rank in range(start, min(start + display, 151))
+            ]
+
+        client._shopping_page = search_shopping
+        batches = [batch async for batch in client.iter_unified_naver_search("청소기 최저가")]
+
+        assert starts == [1, 101, 201]  # 두 번째 묶음은 두 페이지를 동시에 요청
+        assert [endpoint for endpoint, _ in batches] == ["shop", "shop"]
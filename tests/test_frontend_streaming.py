@@ -4,9 +4,10 @@
 
 import pytest
 import asyncio
+import httpx
 import requests
 from unittest.mock import Mock, patch
-from frontend.streaming_client import StreamingChatClient
+from frontend.streaming_client import SSEParser, StreamingChatClient
 
 
 def test_streaming_client_initialization():
@@ -31,16 +32,42 @@ def test_streaming_client_url_construction():
 @pytest.mark.asyncio
 async def test_streaming_client_connection():
     """스트리밍 연결 테스트"""
-    client = StreamingChatClient("http://localhost:8000")
+    body = (
+        'data: {"type": "content", "content": "안녕"}\n\n'
+        'data: {"type": "done", "session_id": "test-session"}\n\n'
+        'data: [DONE]\n\n'
+    ).encode("utf-8")
     
-    # Mock EventSource-like behavior
-    with patch('frontend.streaming_client.StreamingChatClient._create_event_source') as mock_es:
-        mock_es.return_value = Mock()
-        
-        await client.connect("테스트 메시지", "test-session")
-        
-        assert mock_es.called
-        assert client.is_connected == True
+    def handler(request):
+        assert request.url.path == "/chat/stream"
+        return httpx.Response(200, content=body, headers={"Content-Type": "text/event-stream"})
+    
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://localhost:8000")
+    client = StreamingChatClient("http://localhost:8000", http_client=http_client)
+    
+    connected = []
+    received_chunks = []
+    client.on_connect = lambda: connected.append(client.is_connected)
+    client.on_chunk = received_chunks.append
+    
+    await client.connect("테스트 메시지", "test-session")
+    
+    assert connected == [True]
+    assert [chunk["type"] for chunk in received_chunks] == ["content", "done"]
+    assert client.is_connected == False
+    await client.aclose()
+
+
+def test_sse_parser_handles_split_bytes():
+    """바이트 경계가 잘린 SSE 파싱 테스트"""
+    raw = 'data: {"type": "content", "content": "한글"}\r\n\r\ndata: [DONE]\n\n'.encode("utf-8")
+    parser = SSEParser()
+    
+    events = []
+    for i in range(len(raw)):
+        events.extend(parser.feed(raw[i:i + 1]))
+    
+    assert events == ['{"type": "content", "content": "한글"}', "[DONE]"]
 
 
 @pytest.mark.asyncio
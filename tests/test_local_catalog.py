@@ -0,0 +1,121 @@
+"""
+로컬 검색 결과 카탈로그 테스트
+"""
+
+import time
+import pytest
+from agent.local_catalog import LocalCatalog, match_expression
+from agent.models import Product, SearchHit
+from agent.query_planner import PRICE, REVIEW
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = LocalCatalog(str(tmp_path / "catalog.db"), flush_interval=60)
+    catalog.index([
+        Product("다이슨 무선청소기 V15 디텍트", 899000, mall="쿠팡", url="https://shop/1", source="naver_shopping"),
+        Product("다이슨 V12 청소기 정품", 759000, mall="11번가", url="https://shop/2", source="naver_shopping"),
+        Product("삼성 비스포크 제트 청소기", 690000, mall="G마켓", url="https://shop/3", source="naver_shopping"),
+        SearchHit("다이슨 청소기 한 달 사용 후기", content="흡입력이 좋아요", url="https://blog/1", source="naver_blog")
+    ])
+    catalog.flush()
+    return catalog
+
+
+class TestLocalCatalog:
+    """FTS5 카탈로그 색인/검색/신선도 테스트"""
+
+    def test_match_expression_drops_intent_words(self):
+        """의도 표현은 빼고 어절마다 바이그램 대안을 만드는지 테스트"""
+        assert match_expression("다이슨 청소기 최저가 찾아줘") == '("다이슨" OR ("다이" AND "이슨")) AND ("청소기" OR ("청소" AND "소기"))'
+        assert match_expression("최저가") is None
+
+    def test_korean_compound_match(self, catalog):
+        """복합어(무선청소기)와 조사가 붙은 어절도 찾는지 테스트"""
+        titles = [hit.title for hit, _ in catalog.search("다이슨 청소기")]
+
+        assert "다이슨 무선청소기 V15 디텍트" in titles
+        assert "삼성 비스포크 제트 청소기" not in titles
+        assert len(titles) == 3
+
+    def test_round_trip_fields(self, catalog):
+        """가격/판매처가 상품으로 복원되는지 테스트"""
+        hit, seen_at = catalog.search("비스포크")[0]
+
+        assert isinstance(hit, Product)
+        assert (hit.price, hit.mall, hit.url) == (690000, "G마켓", "https://shop/3")
+        assert time.time() - seen_at < 60
+
+    def test_upsert_by_url(self, catalog):
+        """같은 URL은 최신 가격으로 갱신되는지 테스트"""
+        catalog.index([Product("삼성 비스포크 제트 청소기", 650000, mall="G마켓", url="https://shop/3")])
+        catalog.flush()
+
+        results = catalog.search("비스포크")
+        assert len(results) == 1 and results[0][0].price == 650000
+
+    def test_freshness_rules(self, catalog):
+        """결과 수와 의도별 유효 시간으로 실시간 검색 전환을 판정하는지 테스트"""
+        assert catalog.lookup("다이슨 청소기", PRICE).fresh is True
+        assert catalog.lookup("비스포크", PRICE).reason == "too_few"
+        assert catalog.lookup("에어팟", PRICE).reason == "empty"
+
+        two_hours_later = time.time() + 2 * 3600
+        assert catalog.lookup("다이슨 청소기", PRICE, now=two_hours_later).reason == "stale"
+        assert catalog.lookup("다이슨 청소기", REVIEW, now=two_hours_later).fresh is True
+
+    def test_old_hits_do_not_count_as_fresh(self, tmp_path):
+        """최근 결과 하나가 오래된 가격들을 신선하게 만들지 않는지 테스트"""
+        catalog = LocalCatalog(str(tmp_path / "mixed.db"), flush_interval=60)
+        catalog.index(
+            [Product(f"다이슨 청소기 V{i}", 500000 + i, url=f"https://shop/old/{i}") for i in range(5)],
+            seen_at=time.time() - 3 * 86400
+        )
+        catalog.index([Product("다이슨 청소기 V15", 899000, url="https://shop/new")])
+        catalog.flush()
+
+        assert catalog.lookup("다이슨 청소기", PRICE).reason == "stale"
+        review = catalog.lookup("다이슨 청소기", REVIEW)
+        assert review.fresh is True and len(review.hits) == 6
+
+    @pytest.mark.asyncio
+    async def test_tool_falls_through_to_live_search(self, catalog):
+        """도구가 신선한 로컬 결과는 바로 반환하고, 아니면 실시간 검색을 사용하는지 테스트"""
+        from unittest.mock import AsyncMock, MagicMock, patch
+        from agent.naver_realtime_search import local_catalog_search
+
+        live = MagicMock()
+        live.unified_naver_search = AsyncMock(return_value=[SearchHit("에어팟 프로 2", url="https://shop/9")])
+
+        with patch("agent.naver_realtime_search.get_local_catalog", return_value=catalog), \
+             patch("agent.naver_realtime_search.get_naver_client", AsyncMock(return_value=live)):
+            local = await local_catalog_search.ainvoke({"query": "다이슨 청소기 최저가"})
+            fallback = await local_catalog_search.ainvoke({"query": "에어팟 프로"})
+
+        assert local["source"] == "local_catalog"
+        prices = [item["price"] for item in local["results"] if "price" in item]
+        assert len(prices) == 2 and prices == sorted(prices)
+        assert fallback["source"] == "naver_realtime"
+        live.unified_naver_search.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_cached_responses_not_reindexed(self, monkeypatch):
+        """캐시에서 꺼낸 결과는 다시 색인하지 않는지 테스트 (최근 확인 시각 유지)"""
+        from unittest.mock import AsyncMock, MagicMock, patch
+        from agent.naver_realtime_search import NaverRealtimeSearchClient
+
+        monkeypatch.setenv("NAVER_CLIENT_ID", "test-id")
+        monkeypatch.setenv("NAVER_CLIENT_SECRET", "test-secret")
+        client = NaverRealtimeSearchClient()
+        client._request_items = AsyncMock(return_value=[
+            {"title": "다이슨 청소기 소식", "link": "https://news/1", "description": "신제품 출시", "pubDate": ""}
+        ])
+
+        with patch("agent.naver_realtime_search.index_hits") as mock_index, \
+             patch("agent.naver_realtime_search.naver_rate_limiter.acquire", new_callable=AsyncMock):
+            first = await client.search_news("캐시 재색인 확인 질의")
+            second = await client.search_news("캐시 재색인 확인 질의")
+
+        assert [hit.url for hit in first] == [hit.url for hit in second] == ["https://news/1"]
+        client._request_items.assert_awaited_once()
+        mock_index.assert_called_once()
@@ -102,4 +102,65 @@ class TestMCPSearchClient:
             results = await mcp_client.unified_search("테스트 쿼리")
             
             # 에러가 발생해도 빈 결과를 반환해야 함
-            assert results is not None 
\ No newline at end of file
+            assert results is not None
+    
+    @pytest.mark.asyncio
+    async def test_unified_search_hedges_realtime(self, mcp_client):
+        """MCP 검색이 느리면 네이버 실시간 검색 결과를 먼저 채택하는지 테스트"""
+        mcp_client.naver_connected = True
+        
+        async def slow_naver(query):
+            await asyncio.sleep(1.0)
+            return {"source": "naver", "results": [{"title": "느린 결과"}]}
+        
+        with patch.object(mcp_client, 'search_naver', side_effect=slow_naver), \
+             patch.object(mcp_client, '_fetch_realtime', new_callable=AsyncMock) as mock_realtime, \
+             patch("agent.mcp_client.settings.realtime_hedge_delay", 0.01):
+            mock_realtime.return_value = [{"title": "실시간 결과"}]
+            
+            results = await asyncio.wait_for(mcp_client.unified_search("테스트 쿼리"), timeout=0.5)
+            
+            assert results == [{"source": "naver_realtime", "results": [{"title": "실시간 결과"}]}]
+    
+    @pytest.mark.asyncio
+    async def test_hedged_naver_search_returns_dicts(self, mcp_client):
+        """헤징 백업이 채택되면 도구 경계용 딕셔너리 목록을 반환하는지 테스트"""
+        from agent.models import Product
+        from agent.product_events import extract_products
+        mcp_client.naver_connected = True
+        mcp_client._naver_tools = [MagicMock()]
+        
+        async def slow_mcp(*args):
+            await asyncio.sleep(1.0)
+            return [{"title": "느린 결과"}]
+        
+        with patch.object(mcp_client.tool_index, 'get', return_value=MagicMock()), \
+             patch.object(mcp_client, '_call_mcp', side_effect=slow_mcp), \
+             patch.object(mcp_client, '_fetch_realtime', new_callable=AsyncMock) as mock_realtime, \
+             patch("agent.mcp_client.naver_rate_limiter.acquire", new_callable=AsyncMock), \
+             patch("agent.mcp_client.settings.mcp_hedge_delay", 0.01):
+            mock_realtime.return_value = [Product(title="갤럭시 S24", price=1200000, mall="삼성스토어", url="https://shop/1")]
+            
+            result = await asyncio.wait_for(mcp_client.search_naver("헤징 백업 질의"), timeout=0.5)
+        
+        assert result["hedged"] is True
+        assert all(type(item) is dict for item in result["results"])
+        assert result["results"][0]["price"] == 1200000
+        assert extract_products(result["results"])[0]["mall"] == "삼성스토어"
+    
+    @pytest.mark.asyncio
+    async def test_hedge_spends_token_only_for_backup(self, mcp_client):
+        """MCP가 먼저 응답하면 네이버 API 토큰을 쓰지 않는지 테스트"""
+        mcp_client.naver_connected = True
+        mcp_client._naver_tools = [MagicMock()]
+        
+        with patch.object(mcp_client.tool_index, 'get', return_value=MagicMock()), \
+             patch.object(mcp_client, '_call_mcp', new_callable=AsyncMock) as mock_mcp, \
+             patch("agent.mcp_client.naver_rate_limiter.acquire", new_callable=AsyncMock) as mock_acquire, \
+             patch("agent.mcp_client.settings.mcp_hedge_delay", 1.0):
+            mock_mcp.return_value = [{"title": "MCP 결과"}]
+            
+            result = await mcp_client.search_naver("헤징 토큰 질의")
+        
+        assert result == {"source": "naver", "results": [{"title": "MCP 결과"}]}
+        mock_acquire.assert_not_called()
@@ -0,0 +1,48 @@
+"""
+메트릭 모듈 테스트
+"""
+
+import uuid
+from agent.metrics import Histogram, MetricsCallbackHandler, MetricsRegistry, TOOL_LATENCY
+
+
+class TestMetrics:
+    """카운터/히스토그램/콜백 테스트"""
+    
+    def test_histogram_render(self):
+        """히스토그램 누적 버킷 출력 테스트"""
+        histogram = Histogram("test_seconds", "테스트", ["endpoint"], buckets=(0.1, 1.0))
+        histogram.observe(0.05, "/chat")
+        histogram.observe(0.5, "/chat")
+        histogram.observe(5.0, "/chat")
+        
+        text = "\n".join(histogram.render())
+        
+        assert 'test_seconds_bucket{endpoint="/chat",le="0.1"} 1' in text
+        assert 'test_seconds_bucket{endpoint="/chat",le="1.0"} 2' in text
+        assert 'test_seconds_bucket{endpoint="/chat",le="+Inf"} 3' in text
+        assert 'test_seconds_count{endpoint="/chat"} 3' in text
+    
+    def test_registry_with_collector(self):
+        """레지스트리 콜렉터 출력 테스트"""
+        registry = MetricsRegistry()
+        counter = registry.counter("test_total", "테스트", ["direction"])
+        counter.inc(3, "in")
+        registry.register_collector(lambda: ["test_gauge 7"])
+        
+        text = registry.render()
+        
+        assert '# TYPE test_total counter' in text
+        assert 'test_total{direction="in"} 3.0' in text
+        assert 'test_gauge 7' in text
+    
+    def test_tool_callback_records_latency(self):
+        """도구 콜백 지연 시간 기록 테스트"""
+        handler = MetricsCallbackHandler()
+        run_id = uuid.uuid4()
+        
+        handler.on_tool_start({"name": "compare_prices"}, "{}", run_id=run_id)
+        handler.on_tool_end("ok", run_id=run_id)
+        
+        text = "\n".join(TOOL_LATENCY.render())
+        assert 'tool="compare_prices",status="ok"' in text
@@ -0,0 +1,79 @@
+"""
+검색 결과 모델 테스트
+"""
+
+import json
+import sys
+import pytest
+from unittest.mock import AsyncMock
+from agent.models import Product, SearchHit, dumps_hits, to_dicts
+from agent.naver_realtime_search import NaverRealtimeSearchClient
+from agent.mcp_client import MCPSearchClient
+
+
+class TestSearchModels:
+    """SearchHit/Product 테스트"""
+    
+    def test_product_normalization(self):
+        """가격 정수화와 키 차이 흡수 테스트"""
+        naver = Product.from_dict({"title": "에어팟", "lprice": "199000", "mallName": "쿠팡", "link": "https://a"})
+        dummy = Product.from_dict({"name": "에어팟", "price": 199000, "seller": "쿠팡", "product_url": "https://a"})
+        
+        for product in (naver, dummy):
+            assert product.price == 199000
+            assert product.mall == "쿠팡"
+            assert product.url == "https://a"
+            assert product.get("mallName") == "쿠팡"
+            assert product.get("missing", "기본값") == "기본값"
+    
+    def test_slots_and_interning(self):
+        """인스턴스 딕셔너리가 없고 반복 문자열이 intern되는지 테스트"""
+        hit = SearchHit("제목", source="".join(["naver", "_web"]))
+        
+        assert not hasattr(hit, "__dict__")
+        assert hit.source is sys.intern("naver_web")
+    
+    def test_serialization(self):
+        """도구 메시지 직렬화 테스트"""
+        items = [
+            SearchHit("뉴스", url="https://n", source="naver_news", extra={"pubDate": "Mon"}),
+            Product("노트북", 1290000, mall="11번가", source="naver_shopping"),
+            {"title": "이미 딕셔너리"}
+        ]
+        
+        data = json.loads(dumps_hits(items))
+        
+        assert data[0]["pubDate"] == "Mon"
+        assert data[1]["price"] == 1290000 and data[1]["mallName"] == "11번가"
+        assert data[2] == {"title": "이미 딕셔너리"}
+        assert to_dicts(items)[1]["source"] == "naver_shopping"
+
+
+class TestParsingBoundary:
+    """파싱 경계에서 모델 생성 테스트"""
+    
+    @pytest.mark.asyncio
+    async def test_naver_shopping_returns_products(self):
+        """네이버 쇼핑 결과가 Product로 변환되는지 테스트"""
+        client = NaverRealtimeSearchClient()
+        client.client_id = client.client_secret = "test"
+        client._fetch_items = AsyncMock(return_value=[
+            {"title": "<b>에어팟</b> 프로", "link": "https://a", "lprice": "299000", "mallName": "쿠팡", "brand": "Apple"}
+        ])
+        
+        results = await client.search_shopping("에어팟")
+        
+        assert isinstance(results[0], Product)
+        assert results[0].title == "에어팟 프로"
+        assert results[0].price == 299000
+    
+    def test_format_search_results(self):
+        """MCP 결과 포맷 통일화 테스트"""
+        client = MCPSearchClient()
+        results = client.format_search_results([
+            {"source": "naver", "results": [{"title": "상품", "price": "1000", "url": "u1", "score": 0.5}]},
+            {"source": "exa", "results": [{"title": "기사", "content": "내용", "url": "u2", "score": 0.9}]}
+        ])
+        
+        assert [type(r) for r in results] == [SearchHit, Product]
+        assert results[1].price == 1000 and results[1].source == "naver"
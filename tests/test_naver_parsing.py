@@ -0,0 +1,50 @@
+"""
+네이버 응답 파싱 파이프라인 테스트
+"""
+
+from agent.models import Product
+from agent.naver_parsing import clean_text, loads, parse_items, parse_post_date, parse_pub_date
+
+
+class TestNaverParsing:
+    """태그/엔티티 정리와 날짜 변환 테스트"""
+    
+    def test_clean_text_strips_tags_and_entities(self):
+        """강조 태그 외 태그와 HTML 엔티티도 제거/복원하는지 테스트"""
+        assert clean_text("<b>에어팟</b> &quot;프로&quot; AT&amp;T") == '에어팟 "프로" AT&T'
+        assert clean_text("<i>특가</i> &#39;한정&#39; &lt;공식&gt;") == "특가 '한정' <공식>"
+        assert clean_text("&amp;quot;") == "&quot;"
+        assert clean_text("일반 텍스트") == "일반 텍스트"
+        assert clean_text(None) == ""
+    
+    def test_parse_dates_to_epoch(self):
+        """pubDate/postdate를 epoch 초로 변환하는지 테스트"""
+        assert parse_pub_date("Mon, 19 Oct 2026 09:00:00 +0900") == 1792368000.0
+        assert parse_pub_date("19 Oct 2026 00:00:00 GMT") == 1792368000.0
+        assert parse_post_date("20261019") == 1792368000.0 - 9 * 3600
+        assert parse_pub_date("") is None and parse_post_date("2026-10") is None
+    
+    def test_parse_items_shares_timestamp(self):
+        """응답 항목이 같은 수집 시각과 정리된 필드를 갖는지 테스트"""
+        body = (
+            '{"items": ['
+            '{"title": "<b>갤럭시</b> S25 &amp; 케이스", "link": "https://a", "lprice": "1200000", "mallName": "쿠팡"},'
+            '{"title": "갤럭시 S25 울트라", "link": "https://b", "lprice": "1500000", "mallName": "11번가"}'
+            ']}'
+        ).encode()
+        products = parse_items("shop", loads(body)["items"])
+        
+        assert all(isinstance(product, Product) for product in products)
+        assert products[0].title == "갤럭시 S25 & 케이스"
+        assert products[0].price == 1200000
+        assert products[0].timestamp == products[1].timestamp
+    
+    def test_news_and_blog_published(self):
+        """뉴스/블로그 결과에 epoch 게시 시각이 담기는지 테스트"""
+        news = parse_items("news", [{"title": "t", "link": "u", "pubDate": "Mon, 19 Oct 2026 09:00:00 +0900"}])
+        blog = parse_items("blog", [{"title": "t", "link": "u", "postdate": "20261019", "bloggername": "a&amp;b"}])
+        
+        assert news[0].extra["published"] == 1792368000.0
+        assert news[0].extra["pubDate"] == "Mon, 19 Oct 2026 09:00:00 +0900"
+        assert blog[0].extra["published"] == parse_post_date("20261019")
+        assert blog[0].extra["bloggerName"] == "a&b"
@@ -0,0 +1,71 @@
+"""
+네이버 통합 검색 점진 스트리밍 테스트
+"""
+
+import asyncio
+import pytest
+from agent.agent import _unsent_products
+from agent.models import SearchHit
+from agent.naver_realtime_search import NaverRealtimeSearchClient
+from agent.query_planner import GENERAL, EndpointPlan, SearchPlan
+
+
+def _searcher(delay, hits):
+    async def search(query, display=10, sort="date"):
+        await asyncio.sleep(delay)
+        return hits
+    return search
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("NAVER_CLIENT_ID", "test-id")
+    monkeypatch.setenv("NAVER_CLIENT_SECRET", "test-secret")
+    client = NaverRealtimeSearchClient()
+    client.search_web = _searcher(0.05, [
+        SearchHit("웹 문서", url="https://a.example/1", source="naver_web", score=0.8),
+        SearchHit("공통 문서", url="https://a.example/shared", source="naver_web", score=0.8)
+    ])
+    client.search_news = _searcher(0.0, [
+        SearchHit("뉴스 기사", url="https://a.example/2", source="naver_news", score=0.9),
+        SearchHit("공통 문서", url="https://a.example/shared", source="naver_news", score=0.9)
+    ])
+    return client
+
+
+PLAN = SearchPlan(GENERAL, [EndpointPlan("webkr", 5, "date"), EndpointPlan("news", 5, "date")])
+
+
+class TestIncrementalNaverSearch:
+    """엔드포인트별 결과 묶음 스트리밍 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_batches_arrive_in_completion_order(self, client):
+        """먼저 끝난 엔드포인트 묶음이 먼저 나오고 URL이 반복되지 않는지 테스트"""
+        batches = [batch async for batch in client.iter_unified_naver_search("테스트", plan=PLAN)]
+
+        assert [endpoint for endpoint, _ in batches] == ["news", "webkr"]
+        assert [hit.url for hit in batches[1][1]] == ["https://a.example/1"]
+        urls = [hit.url for _, batch in batches for hit in batch]
+        assert len(urls) == len(set(urls)) == 3
+
+    @pytest.mark.asyncio
+    async def test_on_batch_receives_early_results(self, client):
+        """on_batch 콜백이 최종 결과보다 먼저 묶음을 받는지 테스트"""
+        received = []
+        results = await client.unified_naver_search(
+            "테스트", on_batch=lambda endpoint, batch: received.append((endpoint, len(batch)))
+        )
+
+        assert received[0][0] == "news"
+        assert sum(count for _, count in received) == len(results) == 3
+
+    def test_unsent_products_skips_streamed(self):
+        """부분 전송한 상품이 도구 결과 이벤트에서 다시 전송되지 않는지 테스트"""
+        sent = set()
+        early = [{"title": "상품 A", "url": "https://shop/a"}]
+        final = early + [{"title": "상품 B", "url": "https://shop/b"}, {"title": "상품 C"}]
+
+        assert _unsent_products(early, sent) == early
+        assert [p["title"] for p in _unsent_products(final, sent)] == ["상품 B", "상품 C"]
+        assert _unsent_products(final, sent) == []
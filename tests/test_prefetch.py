@@ -0,0 +1,84 @@
+"""
+캐시 사전 갱신 테스트
+"""
+
+import asyncio
+import time
+import pytest
+from agent.prefetch import CachePrefetcher, PopularityTracker, RateLimiter
+from agent.search_cache import SearchCache
+
+
+class TestPrefetch:
+    """인기 항목 사전 갱신 테스트"""
+    
+    def test_popularity_decay(self):
+        """지수 감쇠 인기 순위 테스트"""
+        tracker = PopularityTracker(half_life=10)
+        now = time.time()
+        for _ in range(4):
+            tracker.hit("old", now - 20)
+        tracker.hit("new", now)
+        tracker.hit("new", now)
+        
+        ranked = tracker.top(2, now)
+        
+        assert [key for key, _ in ranked] == ["new", "old"]
+        assert ranked[1][1] == pytest.approx(1.0)
+    
+    def test_rate_limiter_reserve(self):
+        """백그라운드 호출은 예약분을 남기고 대기 중인 요청에 양보하는지 테스트"""
+        limiter = RateLimiter(rate=0.001, burst=4)
+        
+        assert limiter.try_acquire(reserve=0.5)
+        assert limiter.try_acquire(reserve=0.5)
+        assert not limiter.try_acquire(reserve=0.5)
+        
+        limiter.waiting = 1
+        assert not limiter.try_acquire(reserve=0.0)
+    
+    @pytest.mark.asyncio
+    async def test_tick_refreshes_expiring_popular_entries(self):
+        """곧 만료될 인기 항목만 갱신하는지 테스트"""
+        cache = SearchCache("prefetch_test", ttl=300)
+        prefetcher = CachePrefetcher(interval=3600, top_n=10, refresh_ahead=60)
+        calls = []
+        
+        async def refresh(key):
+            calls.append(key)
+            cache.set(key, ["new"])
+        
+        cache.set("hot", ["old"], ttl=10)
+        cache.set("fresh", ["old"], ttl=300)
+        cache.set("cold", ["old"], ttl=10)
+        for _ in range(3):
+            prefetcher.track(cache, "hot", lambda: refresh("hot"))
+            prefetcher.track(cache, "fresh", lambda: refresh("fresh"))
+        prefetcher.track(cache, "cold", lambda: refresh("cold"))
+        
+        await prefetcher.tick()
+        prefetcher.stop()
+        
+        assert calls == ["hot"]
+        assert cache.get("hot") == ["new"]
+    
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self):
+        """만료된 항목은 이전 값을 반환하고 백그라운드에서 갱신하는지 테스트"""
+        cache = SearchCache("swr_test", ttl=0.01, stale_ttl=60)
+        prefetcher = CachePrefetcher(interval=3600, top_n=10, refresh_ahead=60)
+        cache.set("key", ["old"])
+        await asyncio.sleep(0.02)
+        
+        assert cache.get("key") is None
+        assert cache.get_stale("key") == ["old"]
+        
+        async def refresh():
+            cache.set("key", ["new"], ttl=60)
+        
+        prefetcher.revalidate(cache, "key", refresh)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        
+        assert cache.get("key") == ["new"]
+        assert prefetcher.revalidated == 1
@@ -0,0 +1,69 @@
+"""
+컬럼 기반 가격 분석 테스트
+"""
+
+from agent.price_analytics import ProductBatch, analyze_prices, filter_product_list, get_product_batch
+
+
+PRODUCTS = [
+    {"name": "상품1", "price": 50000, "rating": 4.5, "category": "전자제품"},
+    {"name": "상품2", "price": 80000, "rating": 4.0, "category": "의류"},
+    {"name": "상품3", "price": 30000, "rating": 3.0, "category": "전자제품"},
+    {"title": "상품4", "lprice": "45000", "mallName": "쿠팡"}
+]
+
+
+class TestProductBatch:
+    """ProductBatch 테스트"""
+    
+    def test_columns(self):
+        """문자열 lprice 파싱과 카테고리 코드화 테스트"""
+        batch = ProductBatch.from_products(PRODUCTS)
+        
+        assert batch.price.tolist() == [50000, 80000, 30000, 45000]
+        assert batch.categories == ["전자제품", "의류", ""]
+        assert batch.category_codes.tolist() == [0, 1, 0, 2]
+    
+    def test_analyze_prices(self):
+        """통계와 추천 상품 테스트"""
+        analysis = analyze_prices(PRODUCTS[:3])
+        
+        assert analysis["total_products"] == 3
+        assert analysis["min_price"] == 30000
+        assert analysis["max_price"] == 80000
+        assert analysis["avg_price"] == 53333
+        assert analysis["price_range"] == 50000
+        assert analysis["price_percentiles"]["p50"] == 50000
+        assert analysis["recommended_product"]["name"] == "상품3"
+        assert analysis["best_value"]["name"] == "상품3"
+    
+    def test_analyze_without_prices(self):
+        """가격 정보가 없는 경우 테스트"""
+        assert "error" in analyze_prices([])
+        assert "error" in analyze_prices([{"title": "블로그 글"}])
+    
+    def test_filter(self):
+        """다중 조건 필터링 테스트 (기존 동작과 동일)"""
+        assert len(filter_product_list(PRODUCTS, max_price=60000)) == 3
+        assert [p["name"] for p in filter_product_list(PRODUCTS, min_price=60000)] == ["상품2"]
+        assert [p["name"] for p in filter_product_list(PRODUCTS, min_rating=4.0)] == ["상품1", "상품2"]
+        assert len(filter_product_list(PRODUCTS, category="전자제품")) == 2
+        assert filter_product_list(PRODUCTS, category="도서") == []
+        assert [p["name"] for p in filter_product_list(PRODUCTS, max_price=60000, min_rating=4.0)] == ["상품1"]
+    
+    def test_price_filters_exclude_unpriced(self):
+        """가격 조건이 있으면 가격 없는 상품은 제외하는지 테스트"""
+        products = PRODUCTS + [{"name": "가격 없음", "rating": 5.0}]
+        
+        assert "가격 없음" not in [p.get("name") for p in filter_product_list(products, max_price=100000)]
+        assert "가격 없음" not in [p.get("name") for p in filter_product_list(products, min_price=1)]
+        assert len(filter_product_list(products, min_rating=5.0)) == 1
+    
+    def test_batch_reused(self):
+        """같은 목록 객체나 같은 결과 키는 배치를 재사용하는지 테스트"""
+        products = [dict(p) for p in PRODUCTS]
+        assert get_product_batch(products) is get_product_batch(products)
+        
+        keyed = get_product_batch([dict(p) for p in PRODUCTS], key=("thread", "res_1", 1.0))
+        assert get_product_batch([dict(p) for p in PRODUCTS], key=("thread", "res_1", 1.0)) is keyed
+        assert get_product_batch([dict(p) for p in PRODUCTS]) is not keyed
@@ -0,0 +1,58 @@
+"""
+가격 이력 저장소 테스트
+"""
+
+import time
+import pytest
+from agent.models import Product
+from agent.price_history import DAY_SECONDS, PriceHistoryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceHistoryStore(str(tmp_path / "price_history.db"), flush_interval=60)
+
+
+class TestPriceHistoryStore:
+    """가격 이력 저장소 테스트"""
+    
+    def test_batched_write_and_lookup(self, store):
+        """버퍼 일괄 저장과 묶음 키 조회 테스트"""
+        now = time.time()
+        store.record([Product("애플 아이폰15 프로 256GB", 1500000, mall="쿠팡")], observed_at=now - 40 * DAY_SECONDS)
+        store.record([Product("Apple iPhone 15 Pro 256GB", 1450000, mall="11번가")], observed_at=now - 3 * DAY_SECONDS)
+        store.record([Product("아이폰 15 프로 256GB", 1480000, mall="G마켓")], observed_at=now)
+        
+        # 저장 전에도 버퍼의 관측값이 조회되고, 통계는 조회 기간 안의 관측값만 사용
+        assert store.lookup("iPhone 15 Pro 256GB", days=60)["count"] == 3
+        
+        store.flush()
+        stats = store.lookup("iPhone 15 Pro 256GB")
+        
+        assert store.written == 3
+        assert stats["count"] == 2
+        assert stats["min_price"] == 1450000
+        assert stats["median_price"] == 1465000
+        assert stats["low_30d"] == 1450000
+        assert stats["low_30d_mall"] == "11번가"
+        assert stats["latest_price"] == 1480000
+    
+    def test_dedupe_repeated_observations(self, store):
+        """캐시된 결과의 반복 기록은 한 번만 저장되는지 테스트"""
+        product = Product("갤럭시 S24 SM-S921N", 990000, mall="쿠팡")
+        for _ in range(5):
+            store.record([product])
+        store.record([Product("가격 없음", None)])
+        store.flush()
+        
+        assert store.written == 1
+    
+    def test_assess(self, store):
+        """좋은 가격 평가 테스트"""
+        now = time.time()
+        for days_ago, price in [(20, 100000), (10, 120000), (1, 130000)]:
+            store.record([Product("소니 WH-1000XM5", price, mall=f"몰{days_ago}")], observed_at=now - days_ago * DAY_SECONDS)
+        
+        assert "최저가" in store.assess("소니 WH-1000XM5 블랙", current_price=99000)["assessment"]
+        assert "비쌉니다" in store.assess("소니 WH-1000XM5", current_price=150000)["assessment"]
+        assert store.assess("없는 상품")["count"] == 0
@@ -0,0 +1,48 @@
+"""
+도구 결과 상품 추출 테스트
+"""
+
+import json
+from agent.product_events import extract_products, parse_price
+
+
+class TestProductEvents:
+    """products 이벤트용 상품 추출 테스트"""
+    
+    def test_parse_price(self):
+        """문자열/숫자 가격 변환 테스트"""
+        assert parse_price("199000") == 199000
+        assert parse_price("1,299,000원") == 1299000
+        assert parse_price(35000) == 35000
+        assert parse_price("") is None
+        assert parse_price(None) is None
+    
+    def test_extract_from_naver_shopping_json(self):
+        """네이버 쇼핑 결과(JSON 문자열)에서 간결한 스키마 추출 테스트"""
+        content = json.dumps([
+            {"title": "에어팟 프로", "price": "299000", "mallName": "쿠팡", "brand": "Apple", "url": "https://a"},
+            {"title": "에어팟 후기", "content": "블로그", "url": "https://b"}
+        ], ensure_ascii=False)
+        
+        products = extract_products(content)
+        
+        assert products == [
+            {"title": "에어팟 프로", "price": 299000, "mall": "쿠팡", "brand": "Apple", "url": "https://a"}
+        ]
+    
+    def test_extract_from_results_dict_and_limit(self):
+        """{"results": [...]} 형태와 개수 제한 테스트"""
+        payload = {"source": "naver", "results": [
+            {"name": f"상품 {i}", "price": 1000 * i, "seller": "G마켓", "product_url": f"https://p/{i}"}
+            for i in range(1, 20)
+        ]}
+        
+        products = extract_products(payload, limit=5)
+        
+        assert len(products) == 5
+        assert products[0] == {"title": "상품 1", "price": 1000, "mall": "G마켓", "brand": "", "url": "https://p/1"}
+    
+    def test_non_product_content(self):
+        """상품이 아닌 도구 결과는 빈 목록 테스트"""
+        assert extract_products("맑음, 23도") == []
+        assert extract_products(json.dumps({"error": "실패"})) == []
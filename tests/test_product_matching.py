@@ -0,0 +1,108 @@
+"""
+상품 매칭(엔티티 해석) 테스트
+"""
+
+from agent.models import Product, SearchHit
+from agent.product_matching import ProductMatcher, cluster_key, dedupe_hits, normalize_title
+
+
+class TestNormalizeTitle:
+    """제목 정규화 테스트"""
+    
+    def test_korean_english_variants(self):
+        """태그 제거와 한/영 표기 통일 테스트"""
+        korean = normalize_title("<b>애플</b> 아이폰15 프로 256GB 자급제 [정품]")
+        english = normalize_title("Apple iPhone 15 Pro 256GB")
+        
+        assert korean.tokens == english.tokens == {"apple", "iphone", "pro"}
+        assert korean.specs == english.specs == {"15", "256"}
+        assert cluster_key("<b>애플</b> 아이폰15 프로 256GB") == cluster_key("Apple iPhone 15 Pro 256GB")
+    
+    def test_model_numbers(self):
+        """모델 번호 분리 테스트"""
+        title = normalize_title("삼성 갤럭시 S24 울트라 SM-S928N")
+        
+        assert title.models == {"sms928n"}
+        assert "sm" not in title.tokens
+        assert cluster_key("갤럭시 S24 Ultra 자급제 SM-S928N") == "m:sms928n"
+
+
+class TestProductMatcher:
+    """블로킹 기반 매칭 테스트"""
+    
+    def test_different_specs_not_merged(self):
+        """용량이 다른 상품은 묶지 않는지 테스트"""
+        matcher = ProductMatcher()
+        titles = [normalize_title(t) for t in ["아이폰 15 프로 256GB", "iPhone 15 Pro 256GB", "아이폰 15 프로 512GB"]]
+        
+        assert matcher.cluster(titles) == [[0, 1], [2]]
+    
+    def test_dedupe_keeps_lowest_price(self):
+        """같은 상품은 최저가 제안 하나만 남기는지 테스트"""
+        hits = [
+            Product("<b>애플</b> 아이폰15 프로 256GB", 1500000, mall="쿠팡", brand="애플", url="u1", score=0.85),
+            SearchHit("아이폰 15 프로 리뷰", url="u2", source="naver_blog", score=0.7),
+            Product("Apple iPhone 15 Pro 256GB", 1450000, mall="11번가", brand="Apple", url="u3", score=0.85),
+            SearchHit("<b>아이폰</b> 15 프로 리뷰", url="u4", source="exa", score=0.6)
+        ]
+        
+        results = dedupe_hits(hits)
+        
+        assert len(results) == 2
+        best = results[0]
+        assert best.price == 1450000
+        assert best.get("offer_count") == 2
+        assert best.get("malls") == ["쿠팡", "11번가"]
+        assert best.get("max_price") == 1500000
+    
+    def test_empty_titles_deduped_by_url(self):
+        """제목이 비었거나 문장 부호뿐인 결과는 URL이 다르면 모두 남기는지 테스트"""
+        hits = [
+            SearchHit("", url="https://blog/1", source="naver_blog"),
+            SearchHit("...", url="https://blog/2", source="naver_blog"),
+            SearchHit("<b></b> !!", url="https://blog/3", source="exa"),
+            SearchHit("", url="https://blog/1", source="exa")
+        ]
+        
+        results = dedupe_hits(hits)
+        
+        assert [hit.url for hit in results] == ["https://blog/1", "https://blog/2", "https://blog/3"]
+    
+    def test_large_block_still_merged(self):
+        """한 상품을 많은 쇼핑몰이 올려 블록이 커져도 하나로 묶는지 테스트"""
+        hits = [
+            Product("Apple 아이폰 15 프로 256GB", 1500000 - i, mall=f"몰{i}", url=f"u{i}")
+            for i in range(200)
+        ]
+        
+        results = dedupe_hits(hits)
+        
+        assert len(results) == 1
+        assert results[0].price == 1499801
+        assert results[0].get("offer_count") == 200
+    
+    def test_merge_returns_copy(self):
+        """병합이 입력을 수정하지 않고, 대표를 다시 병합하면 제안 정보를 누적하는지 테스트"""
+        first = dedupe_hits([
+            Product("아이폰 15 프로 256GB", 1500000, mall="쿠팡", url="u1"),
+            Product("iPhone 15 Pro 256GB", 1450000, mall="11번가", url="u2")
+        ])
+        second = dedupe_hits([Product("애플 아이폰15 프로 256GB", 1400000, mall="G마켓", url="u3")] + first)
+        
+        assert first[0].get("offer_count") == 2
+        best = second[0]
+        assert best.price == 1400000
+        assert best.get("offer_count") == 3
+        assert best.get("malls") == ["G마켓", "쿠팡", "11번가"]
+        assert best.get("max_price") == 1500000
+    
+    def test_large_input_is_fast(self):
+        """블로킹으로 대량 입력도 전체 비교 없이 처리되는지 테스트"""
+        hits = [
+            Product(f"브랜드{i % 500} 상품 모델{i} {i % 7}세대", 10000 + i, url=f"u{i}")
+            for i in range(5000)
+        ]
+        
+        results = dedupe_hits(hits)
+        
+        assert len(results) == 5000
@@ -0,0 +1,63 @@
+"""
+네이버 검색 질의 계획 테스트
+"""
+
+import pytest
+from agent.models import Product
+from agent.query_planner import GENERAL, NEWS, PRICE, REVIEW, classify_intent, plan_query
+
+
+class TestQueryPlanner:
+    """질의 의도 분류 및 계획 테스트"""
+    
+    def test_classify_intent(self):
+        """의도 분류 테스트"""
+        assert classify_intent("에어팟 프로 2 최저가") == PRICE
+        assert classify_intent("30만원대 모니터") == PRICE
+        assert classify_intent("갤럭시 버즈3 실사용 후기") == REVIEW
+        assert classify_intent("아이폰 17 출시일") == NEWS
+        assert classify_intent("맥북 프로 M4") == GENERAL
+    
+    def test_price_plan_hits_shopping_only(self):
+        """최저가 탐색은 쇼핑 한 곳만 넉넉히 조회하는지 테스트"""
+        plan = plan_query("다이슨 청소기 최저가", max_results=20)
+        
+        assert [(step.endpoint, step.display) for step in plan.endpoints] == [("shop", 20)]
+    
+    def test_plans_respect_budget(self):
+        """의도별 엔드포인트 결과 수 합이 요청 수를 넘지 않는지 테스트"""
+        for query in ("노트북 후기", "폴더블 신제품 발표 소식", "맥북 프로 M4"):
+            plan = plan_query(query, max_results=20)
+            assert sum(step.display for step in plan.endpoints) <= 20
+        
+        assert len(plan_query("맥북 프로 M4").endpoints) == 4
+        assert {step.endpoint for step in plan_query("노트북 후기").endpoints} == {"blog", "webkr", "shop"}
+
+
+class TestPriceIntentSearch:
+    """최저가 탐색 결과 정렬 테스트"""
+    
+    @pytest.mark.asyncio
+    async def test_accessories_not_ranked_as_lowest_price(self, monkeypatch):
+        """같은 페이지에 섞인 액세서리가 최저가 결과로 올라오지 않는지 테스트"""
+        from agent.naver_realtime_search import NaverRealtimeSearchClient
+        
+        monkeypatch.setenv("NAVER_CLIENT_ID", "test-id")
+        monkeypatch.setenv("NAVER_CLIENT_SECRET", "test-secret")
+        client = NaverRealtimeSearchClient()
+        page = [
+            Product("Apple 아이폰 15 프로 256GB", 1350000 + i * 1000, mall=f"몰{i}", url=f"https://shop/phone/{i}")
+            for i in range(40)
+        ] + [
+            Product("아이폰 15 프로 케이스", 9900 + i * 100, mall=f"케이스몰{i}", url=f"https://shop/case/{i}")
+            for i in range(30)
+        ]
+        
+        async def search_shopping(query, display=10, sort="date", start=1):
+            return page if start == 1 else []
+        
+        client._shopping_page = search_shopping
+        results = await client.unified_naver_search("아이폰 15 프로 최저가")
+        
+        assert results and all("케이스" not in hit.title for hit in results)
+        assert results[0].price == 1350000
@@ -0,0 +1,70 @@
+"""
+검색 결과 관련도 순위 테스트
+"""
+
+from datetime import datetime, timedelta, timezone
+from agent.models import Product, SearchHit
+from agent.query_planner import NEWS, PRICE
+from agent.ranking import bm25_scores, rank_hits, recency_scores, tokenize
+
+
+class TestRanking:
+    """BM25/최신성/가격 특징 기반 순위 테스트"""
+
+    def test_tokenize_korean(self):
+        """조사가 붙은 어절도 음절 바이그램으로 일치하는지 테스트"""
+        assert {"청소", "소기"} <= set(tokenize("청소기가 좋아요"))
+        assert {"아이폰", "15"} <= set(tokenize("<b>아이폰15</b> 프로"))
+
+    def test_relevance_beats_source_prior(self):
+        """출처 점수가 높아도 질의와 무관한 결과는 뒤로 가는지 테스트"""
+        hits = [
+            SearchHit("오늘의 날씨 뉴스", content="전국 맑음", source="naver_news"),
+            SearchHit("다이슨 청소기 V15 사용 후기", content="흡입력이 좋은 청소기", source="naver_blog")
+        ]
+        ranked = rank_hits("다이슨 청소기 후기", hits)
+
+        assert ranked[0].title.startswith("다이슨")
+        assert ranked[0].score > ranked[1].score
+
+    def test_bm25_title_weight(self):
+        """제목 일치가 본문 일치보다 높은 점수를 받는지 테스트"""
+        hits = [
+            SearchHit("기타 소식", content="에어팟 언급"),
+            SearchHit("에어팟 프로 2세대", content="무선 이어폰")
+        ]
+        scores = bm25_scores(tokenize("에어팟"), hits)
+
+        assert scores[1] > scores[0] > 0
+
+    def test_recency_from_pub_and_post_dates(self):
+        """pubDate/postdate 최신성 점수 테스트"""
+        now = datetime(2026, 10, 19, tzinfo=timezone.utc)
+        hits = [
+            SearchHit("a", extra={"pubDate": "Mon, 19 Oct 2026 09:00:00 +0900"}),
+            SearchHit("b", extra={"postDate": (now - timedelta(days=30)).strftime("%Y%m%d")}),
+            SearchHit("c")
+        ]
+        scores = recency_scores(hits, now=now)
+
+        assert scores[0] > 0.99
+        assert abs(scores[1] - 0.5) < 0.01
+        assert scores[2] == 0
+
+    def test_news_intent_prefers_recent(self):
+        """뉴스 의도에서는 같은 관련도면 최근 기사가 앞서는지 테스트"""
+        today = datetime.now(timezone.utc)
+        old = SearchHit("갤럭시 신제품 발표", extra={"postDate": (today - timedelta(days=365)).strftime("%Y%m%d")})
+        new = SearchHit("갤럭시 신제품 발표", extra={"postDate": today.strftime("%Y%m%d")})
+
+        assert rank_hits("갤럭시 발표", [old, new], intent=NEWS)[0] is new
+
+    def test_top_k_with_price_intent(self):
+        """최저가 의도에서 상위 k개만 저렴한 순으로 선택하는지 테스트"""
+        products = [
+            Product(f"에어팟 프로 {i}", price, source="naver_shopping", url=f"u{i}")
+            for i, price in enumerate([359000, 289000, 310000, 299000])
+        ]
+        ranked = rank_hits("에어팟 프로 최저가", products, k=2, intent=PRICE)
+
+        assert [product.price for product in ranked] == [289000, 299000]
@@ -0,0 +1,106 @@
+"""
+회로 차단기/헤징 테스트
+"""
+
+import asyncio
+import pytest
+from agent.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, hedge
+
+
+async def _fail():
+    raise RuntimeError("upstream down")
+
+
+async def _ok():
+    return ["result"]
+
+
+def _delayed(value, delay):
+    async def call():
+        await asyncio.sleep(delay)
+        return value
+    return call
+
+
+class TestCircuitBreaker:
+    """회로 차단기 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_opens_after_failures(self):
+        """연속 실패 시 열리고 이후 호출은 즉시 거부되는지 테스트"""
+        breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=60)
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await breaker.call(_fail)
+
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(_ok)
+        assert breaker.rejected == 1
+
+    @pytest.mark.asyncio
+    async def test_half_open_probe(self):
+        """복구 시간 후 시험 호출 하나만 허용하고 성공하면 닫히는지 테스트"""
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0)
+        with pytest.raises(RuntimeError):
+            await breaker.call(_fail)
+
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+        breaker.record_success(0.1)
+        assert breaker.state == CLOSED
+
+    @pytest.mark.asyncio
+    async def test_timeout_counts_as_failure(self):
+        """제한 시간 초과가 실패로 기록되는지 테스트"""
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=60)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await breaker.call(_delayed([], 1.0), timeout=0.01)
+
+        assert breaker.state == OPEN
+
+    def test_latency_percentile(self):
+        """p95 지연 시간 계산 테스트"""
+        breaker = CircuitBreaker("test")
+        assert breaker.latency_percentile() is None
+
+        for i in range(100):
+            breaker.record_success(i / 100)
+
+        assert breaker.latency_percentile() == pytest.approx(0.95)
+
+
+class TestHedge:
+    """헤징 호출 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_wins(self):
+        """primary가 지연 시간 안에 끝나면 backup을 시작하지 않는지 테스트"""
+        started = []
+
+        async def backup():
+            started.append(True)
+            return ["backup"]
+
+        result, winner = await hedge(_ok, backup, delay=1.0)
+
+        assert (result, winner) == (["result"], "primary")
+        assert not started
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_hedged(self):
+        """primary가 느리면 backup 결과를 채택하는지 테스트"""
+        result, winner = await hedge(_delayed(["slow"], 1.0), _delayed(["fast"], 0.0), delay=0.01)
+
+        assert (result, winner) == (["fast"], "backup")
+
+    @pytest.mark.asyncio
+    async def test_failed_primary_falls_back(self):
+        """primary 실패 시 지연 없이 backup으로 넘어가는지 테스트"""
+        result, winner = await asyncio.wait_for(hedge(_fail, _ok, delay=10.0), timeout=1.0)
+
+        assert (result, winner) == (["result"], "backup")
@@ -0,0 +1,79 @@
+"""
+검색 결과 핸들 저장소 테스트
+"""
+
+from agent.result_store import ResultStore, SharedResultStore, register_results
+from agent.tools import compare_prices, filter_products
+
+
+PRODUCTS = [
+    {"title": "상품1", "price": 50000, "rating": 4.5, "review_count": 10},
+    {"title": "상품2", "price": 80000, "rating": 4.9, "review_count": 300},
+    {"title": "상품3", "price": 30000, "rating": 3.0, "review_count": 50}
+]
+
+
+def _config(thread_id):
+    return {"configurable": {"thread_id": thread_id}}
+
+
+class TestResultStore:
+    """대화별 결과 핸들 테스트"""
+    
+    def test_handles_per_thread(self):
+        """대화마다 핸들 번호가 따로 매겨지고 오래된 결과는 제거되는지 테스트"""
+        store = ResultStore(max_results_per_thread=2)
+        
+        assert store.put("a", PRODUCTS) == "res_1"
+        assert store.put("b", PRODUCTS[:1]) == "res_1"
+        assert store.put("a", PRODUCTS[:2]) == "res_2"
+        assert store.put("a", PRODUCTS[:1]) == "res_3"
+        
+        assert store.get("a", "res_1") is None
+        assert len(store.get("a", "res_2").items) == 2
+        assert len(store.get("b", "res_1").items) == 1
+        assert store.get("c", "res_1") is None
+    
+    def test_shared_handles_across_workers(self, tmp_path):
+        """공유 저장소에서는 다른 워커도 같은 핸들로 같은 결과를 찾고 번호가 겹치지 않는지 테스트"""
+        path = str(tmp_path / "state.db")
+        worker_a = SharedResultStore(path, max_results_per_thread=2)
+        worker_b = SharedResultStore(path, max_results_per_thread=2)
+        
+        assert worker_a.put("a", PRODUCTS, "상품") == "res_1"
+        assert worker_b.put("a", PRODUCTS[:2]) == "res_2"
+        assert worker_a.put("a", PRODUCTS[:1]) == "res_3"
+        
+        assert worker_b.get("a", "res_1") is None
+        assert len(worker_b.get("a", "res_2").items) == 2
+        assert worker_b.get("a", "res_3").items == PRODUCTS[:1]
+        assert worker_a.get("b", "res_3") is None
+        assert [handle["count"] for handle in worker_b.handles("a")] == [2, 1]
+    
+    def test_compare_prices_by_handle(self):
+        """핸들만으로 가격 비교가 수행되는지 테스트"""
+        response = register_results(_config("compare"), PRODUCTS, "상품", "test")
+        
+        analysis = compare_prices.invoke({"result_id": response["result_id"]}, config=_config("compare"))
+        
+        assert analysis["min_price"] == 30000
+        assert analysis["max_price"] == 80000
+        
+        # 다른 대화에서는 핸들을 찾을 수 없음
+        missing = compare_prices.invoke({"result_id": response["result_id"]}, config=_config("other"))
+        assert "error" in missing
+    
+    def test_filter_products_by_handle(self):
+        """핸들 필터/정렬 결과가 새 핸들로 등록되는지 테스트"""
+        response = register_results(_config("filter"), PRODUCTS, "상품", "test")
+        
+        filtered = filter_products.invoke(
+            {"result_id": response["result_id"], "max_price": 60000, "sort_by": "price", "limit": 5},
+            config=_config("filter")
+        )
+        
+        assert [item["title"] for item in filtered["results"]] == ["상품3", "상품1"]
+        assert filtered["result_id"] != response["result_id"]
+        
+        analysis = compare_prices.invoke({"result_id": filtered["result_id"]}, config=_config("filter"))
+        assert analysis["max_price"] == 50000
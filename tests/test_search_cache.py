@@ -0,0 +1,133 @@
+"""
+검색 캐시 테스트
+"""
+
+import time
+import pytest
+from agent.search_cache import SearchCache
+
+
+class TestSearchCache:
+    """TTL 검색 캐시 테스트"""
+    
+    def test_memory_hit_and_miss(self):
+        """메모리 계층 조회 테스트"""
+        cache = SearchCache("test", ttl=60)
+        key = SearchCache.make_key("shop", {"query": "노트북"})
+        
+        assert cache.get(key) is None
+        cache.set(key, [{"title": "노트북"}])
+        
+        assert cache.get(key) == [{"title": "노트북"}]
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+    
+    def test_expiry(self):
+        """TTL 만료 테스트"""
+        cache = SearchCache("test", ttl=0.01)
+        cache.set("key", [1, 2, 3])
+        time.sleep(0.02)
+        
+        assert cache.get("key") is None
+    
+    def test_lru_eviction(self):
+        """최대 항목 수 제한 테스트"""
+        cache = SearchCache("test", ttl=60, max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+        
+        assert cache.get("a") is None
+        assert cache.get("c") == 3
+    
+    def test_shared_tier_between_workers(self, tmp_path):
+        """워커 간 공유 SQLite 계층 테스트"""
+        db_path = str(tmp_path / "search_cache.db")
+        worker_a = SearchCache("naver_api", ttl=60, shared_path=db_path)
+        worker_b = SearchCache("naver_api", ttl=60, shared_path=db_path)
+        
+        worker_a.set("key", [{"title": "아이폰"}])
+        
+        assert worker_b.get("key") == [{"title": "아이폰"}]
+        assert worker_b.stats()["shared"] is True
+    
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """백그라운드로 기록된 압축 값이 새 캐시 인스턴스에서 조회되는지 테스트"""
+        import sqlite3
+        from agent.search_cache import _get_writer
+        
+        db_path = str(tmp_path / "search_cache.db")
+        before = SearchCache("naver_api", ttl=60, shared_path=db_path)
+        before.set("key", [{"title": "갤럭시 버즈3"}])
+        _get_writer(db_path).flush()
+        
+        value = sqlite3.connect(db_path).execute("SELECT value FROM search_cache").fetchone()[0]
+        assert isinstance(value, bytes)
+        
+        after = SearchCache("naver_api", ttl=60, shared_path=db_path)
+        assert after.get("key") == [{"title": "갤럭시 버즈3"}]
+        assert after.stats()["disk_writes"] >= 1
+    
+    def test_stale_value_from_disk_after_restart(self, tmp_path):
+        """재시작 직후에도 유예 시간 안의 값을 디스크에서 반환하는지 테스트"""
+        from agent.search_cache import _get_writer
+        
+        db_path = str(tmp_path / "search_cache.db")
+        SearchCache("naver_api", ttl=0.01, shared_path=db_path, stale_ttl=60).set("key", [1])
+        _get_writer(db_path).flush()
+        time.sleep(0.02)
+        
+        restarted = SearchCache("naver_api", ttl=0.01, shared_path=db_path, stale_ttl=60)
+        assert restarted.get("key") is None
+        assert restarted.get_stale("key") == [1]
+    
+    def test_purge_expired_rows(self, tmp_path):
+        """유예 시간까지 지난 항목을 정리하는지 테스트"""
+        import sqlite3
+        from agent.search_cache import _get_writer
+        
+        db_path = str(tmp_path / "search_cache.db")
+        cache = SearchCache("naver_api", ttl=60, shared_path=db_path)
+        cache.set("old", [1], ttl=-10_000)
+        cache.set("new", [2])
+        writer = _get_writer(db_path)
+        writer.flush()
+        writer.purge()
+        
+        keys = [row[0] for row in sqlite3.connect(db_path).execute("SELECT key FROM search_cache")]
+        assert keys == ["new"]
+    
+    @pytest.mark.asyncio
+    async def test_async_reads_from_disk(self, tmp_path):
+        """비동기 조회가 메모리에 없는 값을 디스크 계층에서 가져오는지 테스트"""
+        from agent.search_cache import _get_writer
+        
+        db_path = str(tmp_path / "search_cache.db")
+        SearchCache("naver_api", ttl=60, shared_path=db_path).set("fresh", [1])
+        SearchCache("naver_api", ttl=0.01, shared_path=db_path, stale_ttl=60).set("expired", [2])
+        _get_writer(db_path).flush()
+        time.sleep(0.02)
+        
+        restarted = SearchCache("naver_api", ttl=60, shared_path=db_path, stale_ttl=60)
+        assert await restarted.aget("fresh") == [1]
+        assert await restarted.aget("expired") is None
+        assert await restarted.aget_stale("expired") == [2]
+        assert await restarted.aget("missing") is None
+    
+    def test_clear_and_serialization_in_writer(self, tmp_path):
+        """삭제와 직렬화가 기록 스레드에서 처리되고 그 전에도 조회에 반영되는지 테스트"""
+        import sqlite3
+        from agent.search_cache import _get_writer
+        
+        db_path = str(tmp_path / "search_cache.db")
+        cache = SearchCache("naver_api", ttl=60, shared_path=db_path)
+        cache.set("key", [1])
+        cache.set("unserializable", {1, 2})
+        writer = _get_writer(db_path)
+        writer.flush()
+        
+        cache.clear()
+        assert SearchCache("naver_api", ttl=60, shared_path=db_path).get("key") is None
+        
+        writer.flush()
+        assert sqlite3.connect(db_path).execute("SELECT COUNT(*) FROM search_cache").fetchone()[0] == 0
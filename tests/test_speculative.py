@@ -0,0 +1,55 @@
+"""
+추측 검색 테스트
+"""
+
+import asyncio
+import pytest
+from agent.speculative import SpeculativeSearch, normalize_query
+
+
+def _searcher(calls):
+    async def search(query):
+        calls.append(query)
+        await asyncio.sleep(0.01)
+        return [f"{query} 결과"]
+    return search
+
+
+class TestSpeculativeSearch:
+    """추측 검색 관리자 테스트"""
+    
+    def test_normalize_query(self):
+        """요청 문구와 문장 부호가 제거되는지 테스트"""
+        assert normalize_query("무선 이어폰 추천해줘!") == "무선 이어폰"
+        assert normalize_query("ＡｉｒＰｏｄｓ 프로 좀 찾아줘?") == "airpods 프로"
+    
+    @pytest.mark.asyncio
+    async def test_matching_query_hits(self):
+        """모델 질의가 비슷하면 미리 받은 결과를 사용하는지 테스트"""
+        speculative = SpeculativeSearch()
+        calls = []
+        
+        assert speculative.start("t1", "갤럭시 버즈3 프로 찾아줘", _searcher(calls))
+        result = await speculative.take("t1", "갤럭시 버즈3 프로")
+        
+        assert result == ["갤럭시 버즈3 프로 결과"]
+        assert calls == ["갤럭시 버즈3 프로"]
+        assert speculative.stats()["hit_rate"] == 1.0
+        
+        # 한 번 사용한 결과는 다시 사용하지 않음
+        assert await speculative.take("t1", "갤럭시 버즈3 프로") is None
+    
+    @pytest.mark.asyncio
+    async def test_different_query_dropped(self):
+        """다른 질의이거나 검색을 요청하지 않으면 결과를 버리는지 테스트"""
+        speculative = SpeculativeSearch()
+        
+        speculative.start("t1", "가성비 좋은 노트북", _searcher([]))
+        assert await speculative.take("t1", "맥북 에어 M3 가격") is None
+        
+        speculative.start("t2", "무선 청소기", _searcher([]))
+        speculative.finish("t2")
+        
+        stats = speculative.stats()
+        assert (stats["hits"], stats["misses"], stats["unused"]) == (0, 1, 1)
+        assert not speculative.start("t3", "안녕" * 50, _searcher([]))
@@ -2,10 +2,9 @@
 Streamlit 스트리밍 UI 테스트
 """
 
-import pytest
 from unittest.mock import Mock, patch
 import streamlit as st
-from frontend.streamlit_streaming import StreamlitStreamingUI
+from frontend.streamlit_streaming import StreamlitStreamingUI, ThrottledMarkdownRenderer, ToolStatusPanel
 
 
 def test_streamlit_streaming_ui_initialization():
@@ -157,4 +156,59 @@ def test_streamlit_streaming_ui_session_management():
     
     assert ui.session_id != original_session
     assert ui.current_response == ""
-    assert ui.is_streaming == False 
\ No newline at end of file
+    assert ui.is_streaming == False 
+
+def test_throttled_renderer_coalesces_chunks():
+    """프레임 간격 안의 청크는 한 번에 렌더링되는지 테스트"""
+    now = [0.0]
+    container = Mock()
+    renderer = ThrottledMarkdownRenderer(container, max_fps=10, prefix="", clock=lambda: now[0])
+    
+    renderer.append("a")  # 첫 청크는 즉시 렌더링
+    for _ in range(50):
+        renderer.append("b")
+    assert container.markdown.call_count == 1
+    
+    now[0] = 0.2
+    renderer.append("c")
+    assert container.markdown.call_count == 2
+    container.markdown.assert_called_with("a" + "b" * 50 + "c▋")
+    
+    renderer.flush()
+    container.markdown.assert_called_with("a" + "b" * 50 + "c")
+    assert renderer.text == "a" + "b" * 50 + "c"
+
+
+def test_tool_status_panel_reuses_single_block():
+    """도구 호출마다 st.status 블록을 새로 만들지 않는지 테스트"""
+    with patch('streamlit.status') as mock_status:
+        panel = ToolStatusPanel()
+        panel.update("search_naver", "실행 중")
+        panel.update("search_exa", "실행 중")
+        panel.update("search_naver", "완료")
+        
+        assert mock_status.call_count == 1
+        assert mock_status.return_value.update.call_count == 2
+        assert panel.running == ["웹 검색"]
+        assert panel.completed == ["네이버 검색"]
+
+
+def test_tool_result_marks_tool_done():
+    """tool_result 청크를 받으면 도구 상태가 완료로 바뀌는지 테스트"""
+    from frontend.app import process_streaming_response
+    from frontend.streamlit_streaming import TOOL_DONE, TOOL_RUNNING
+    
+    chunks = [
+        {"type": "tool_call", "tool_name": "search_naver"},
+        {"type": "tool_result", "tool_name": "search_naver", "result_preview": "..."},
+        {"type": "content", "content": "결과입니다"},
+        {"type": "done"}
+    ]
+    
+    with patch('frontend.app.st'), patch('frontend.app.ToolStatusPanel') as mock_panel:
+        text, _ = process_streaming_response(iter(chunks))
+    
+    assert text == "결과입니다"
+    assert [call.args for call in mock_panel.return_value.update.call_args_list] == [
+        ("search_naver", TOOL_RUNNING), ("search_naver", TOOL_DONE)
+    ]
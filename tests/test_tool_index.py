@@ -0,0 +1,48 @@
+"""
+MCP 툴 기능 인덱스 테스트
+"""
+
+from types import SimpleNamespace
+from agent.tool_index import ToolIndex, resolve_capabilities
+
+
+def _tools(*names):
+    return [SimpleNamespace(name=name) for name in names]
+
+
+class TestToolIndex:
+    """기능 → 툴 인덱스 테스트"""
+    
+    def test_exact_name_preferred(self):
+        """부분 일치보다 정확한 이름이 우선 선택되는지 테스트"""
+        tools = _tools("search_shop", "search_news", "search_webkr")
+        
+        resolved = resolve_capabilities(tools, {"web_search": ("search_webkr", "search"), "shopping_search": ("search_shop",)})
+        
+        assert resolved["web_search"].name == "search_webkr"
+        assert resolved["shopping_search"].name == "search_shop"
+    
+    def test_substring_fallback(self):
+        """정확한 이름이 없으면 후보 순서대로 부분 일치하는지 테스트"""
+        tools = _tools("get_status", "exa_web_search_v2")
+        
+        resolved = resolve_capabilities(tools, {"web_search": ("web_search_exa", "web_search"), "crawl": ("crawl",)})
+        
+        assert resolved["web_search"].name == "exa_web_search_v2"
+        assert "crawl" not in resolved
+    
+    def test_reconnect_replaces_server_entries(self):
+        """재연결 시 해당 서버 매핑만 다시 만들어지는지 테스트"""
+        index = ToolIndex()
+        index.update("naver_search_mcp", _tools("search_webkr"))
+        index.update("exa_search_mcp", _tools("web_search_exa"))
+        
+        index.update("naver_search_mcp", _tools("naver_web_search", "search_news"))
+        
+        assert index.get("naver_search_mcp", "web_search").name == "naver_web_search"
+        assert index.get("naver_search_mcp", "news_search").name == "search_news"
+        assert index.get("exa_search_mcp", "web_search").name == "web_search_exa"
+        
+        index.clear("exa_search_mcp")
+        assert index.get("exa_search_mcp", "web_search") is None
+        assert set(index.snapshot()) == {"naver_search_mcp"}
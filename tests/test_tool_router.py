@@ -0,0 +1,102 @@
+"""
+턴별 도구 선택 테스트
+"""
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.tools import tool
+from agent.tool_router import ToolRegistry, ToolRouter
+
+
+@tool
+def naver_realtime_search(query: str) -> list:
+    """네이버 실시간 검색"""
+    return []
+
+
+@tool
+def unified_search_tool(query: str) -> list:
+    """통합 웹 검색"""
+    return []
+
+
+@tool
+def naver_search_mcp(query: str) -> dict:
+    """네이버 검색 MCP"""
+    return {}
+
+
+@tool(description="MCP 서버 원본 웹 검색 도구 " + "긴 설명 " * 100)
+def search_webkr(query: str) -> str:
+    return ""
+
+
+@tool
+def compare_prices(result_id: str) -> dict:
+    """가격 비교"""
+    return {}
+
+
+@tool
+def filter_products(result_id: str) -> list:
+    """상품 필터링"""
+    return []
+
+
+@tool
+def check_price_history(product_name: str) -> dict:
+    """가격 이력"""
+    return {}
+
+
+TOOLS = [
+    naver_realtime_search, unified_search_tool, naver_search_mcp, search_webkr,
+    compare_prices, filter_products, check_price_history, compare_prices
+]
+
+
+def _names(tools):
+    return [t.name for t in tools]
+
+
+class TestToolRouter:
+    """도구 선택기 테스트"""
+    
+    def test_registry_merges_duplicates(self):
+        """같은 기능 도구가 대표 도구 하나로 병합되는지 테스트"""
+        registry = ToolRegistry(TOOLS)
+        
+        assert registry.primary["web_search"] == "unified_search_tool"
+        assert set(registry.members["web_search"]) == {"unified_search_tool", "naver_search_mcp", "search_webkr"}
+        assert _names(registry.merged_tools()).count("compare_prices") == 1
+        assert "naver_search_mcp" not in _names(registry.merged_tools())
+    
+    def test_route_by_keywords(self):
+        """메시지 키워드로 필요한 도구만 선택하는지 테스트"""
+        router = ToolRouter(TOOLS)
+        
+        plain = router.select([HumanMessage(content="무선 이어폰 찾아줘")])
+        assert _names(plain) == ["naver_realtime_search"]
+        
+        budget = router.select([HumanMessage(content="30만원 이하 노트북 중에 제일 싼 거")])
+        assert set(_names(budget)) == {"naver_realtime_search", "compare_prices", "filter_products"}
+        
+        history = router.select([HumanMessage(content="아이패드 지금 살까? 역대 최저가야?")])
+        assert "check_price_history" in _names(history)
+        
+        assert router.tokens_saved(plain) > 0
+    
+    def test_follow_up_and_called_tools(self):
+        """후속 질문과 이번 턴에 호출한 도구가 선택에 반영되는지 테스트"""
+        router = ToolRouter(TOOLS)
+        messages = [
+            HumanMessage(content="갤럭시 버즈 찾아줘"),
+            AIMessage(content="", tool_calls=[{"name": "naver_realtime_search", "args": {"query": "갤럭시 버즈"}, "id": "1"}]),
+            ToolMessage(content='{"result_id": "res_1", "count": 3, "results": []}', tool_call_id="1"),
+            AIMessage(content="찾았습니다"),
+            HumanMessage(content="그거 말고 다른 것도"),
+            AIMessage(content="", tool_calls=[{"name": "naver_search_mcp", "args": {"query": "버즈"}, "id": "2"}]),
+        ]
+        
+        names = _names(router.select(messages))
+        
+        assert {"compare_prices", "filter_products", "unified_search_tool"} <= set(names)
@@ -0,0 +1,73 @@
+"""
+요청 트레이싱 테스트
+"""
+
+import json
+import time
+import uuid
+from agent.tracing import (
+    JsonlSpanExporter,
+    TracingCallbackHandler,
+    current_request_id,
+    span,
+    start_trace,
+)
+
+
+class TestTracing:
+    """span 기록 및 내보내기 테스트"""
+    
+    def test_span_nesting_and_breakdown(self):
+        """중첩 span과 시간 분석 테스트"""
+        trace = start_trace("req-1")
+        
+        with span("outer") as outer:
+            with span("inner") as inner:
+                pass
+        
+        assert current_request_id() == "req-1"
+        assert inner.parent_id == outer.span_id
+        breakdown = trace.breakdown()
+        assert breakdown["request_id"] == "req-1"
+        assert set(breakdown["spans"]) == {"outer", "inner"}
+    
+    def test_span_without_trace_is_noop(self):
+        """트레이스 없이 span 사용 테스트"""
+        import contextvars
+        
+        def run():
+            with span("orphan") as current:
+                return current
+        
+        assert contextvars.Context().run(run) is None
+    
+    def test_callback_records_tool_span(self):
+        """콜백 핸들러 도구 span 테스트"""
+        trace = start_trace("req-2")
+        handler = TracingCallbackHandler()
+        run_id = uuid.uuid4()
+        
+        handler.on_tool_start({"name": "compare_prices"}, "{}", run_id=run_id)
+        handler.on_tool_end("ok", run_id=run_id)
+        
+        assert [s.name for s in trace.spans] == ["tool.compare_prices"]
+        assert trace.spans[0].end is not None
+    
+    def test_jsonl_exporter(self, tmp_path):
+        """JSONL 내보내기 테스트"""
+        path = tmp_path / "traces.jsonl"
+        exporter = JsonlSpanExporter(str(path))
+        trace = start_trace("req-3")
+        with span("naver.shop", display=10):
+            pass
+        
+        exporter.export(trace)
+        for _ in range(100):
+            if path.exists() and path.read_text(encoding="utf-8"):
+                break
+            time.sleep(0.01)
+        
+        record = json.loads(path.read_text(encoding="utf-8").splitlines()[0])
+        assert record["request_id"] == "req-3"
+        assert record["name"] == "naver.shop"
+        assert record["attributes"]["display"] == 10